@@ -6,6 +6,7 @@ Partnership: O2 events listed as "Request Interpreter"
 """
 
 import asyncio
+import hashlib
 import json
 from datetime import datetime
 from typing import List, Dict
@@ -22,15 +23,144 @@ except ImportError:
 
 from bs4 import BeautifulSoup
 
+# Check if lxml is available (fast listing parse; falls back to html.parser)
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+from venue_scrapers import VenueScraper, SELECTOR_TIMEOUT_MS
+
 # Configuration
 O2_EVENTS_URL = "https://www.theo2.co.uk/events"
 SPREADSHEET_ID = "1JyyEYBc9iliYw7q4lbNqcLEOHwZV64WUYwce87JaBk8"
 
+# Listing event cards (the lean profile waits on these instead of network idle)
+O2_CARD_SELECTOR = "div[class*='eventItem']"
+
+# Per-URL card digests + extracted events from the previous scrape
+O2_CARD_CACHE_FILE = "o2-card-cache.json"
+# Bump when field extraction changes so cached events are re-extracted
+CARD_PARSER_VERSION = 1
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate: class attribute contains the token name (bs4 class_='name')"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Compiled XPath per card field - mirrors the BeautifulSoup lookups in card_fields_bs4
+# ((...)[1] = first match in document order, like find())
+O2_CARD_XPATH_EXPRESSIONS = {
+    'json_ld': "//script[@type='application/ld+json']",
+    'container': "//div[contains(@class, 'eventItem')]",
+    'link': "(.//a[contains(@href, '/events/detail/')])[1]",
+    'title_link': f"((.//h3[{_has_class('title')}])[1]//a)[1]",
+    'img': "(.//img)[1]",
+    'time': f"(.//span[{_has_class('time')}])[1]",
+    'date_time': f"(.//span[{_has_class('m-date__time')}])[1]",
+    'date_container': "(.//div[contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
+                      "'abcdefghijklmnopqrstuvwxyz'), 'date')])[1]",
+    'single_date': f"(.//span[{_has_class('m-date__singleDate')}])[1]",
+    'range_first': f"(.//span[{_has_class('m-date__rangeFirst')}])[1]",
+    'range_last': f"(.//span[{_has_class('m-date__rangeLast')}])[1]",
+    'day': f"(.//span[{_has_class('m-date__day')}])[1]",
+    'month': f"(.//span[{_has_class('m-date__month')}])[1]",
+    'year': f"(.//span[{_has_class('m-date__year')}])[1]",
+    'location': f"(.//div[{_has_class('location')}])[1]",
+}
+O2_CARD_XPATH = {
+    field: etree.XPath(expression) for field, expression in O2_CARD_XPATH_EXPRESSIONS.items()
+} if LXML_AVAILABLE else {}
+
+_TEXT_NODES = etree.XPath('.//text()') if LXML_AVAILABLE else None
+
+
+def _lxml_text(element) -> str:
+    """Equivalent of bs4 get_text(strip=True) for an lxml element"""
+    return ''.join(text.strip() for text in _TEXT_NODES(element))
+
+
+class O2EnhancedScraper(VenueScraper):
+    """Enhanced scraper using Playwright to handle dynamic content (venue plugin, see venue_scrapers.py)"""
+
+    SCRAPER_ID = 'o2'
+    VENUE_NAME = 'The O2'
+    LISTING_URL = O2_EVENTS_URL
+    READY_SELECTOR = O2_CARD_SELECTOR
+    DETAIL_READY_SELECTOR = 'script[type="application/ld+json"], .m-date__singleDate, .m-date__rangeFirst'
+
+    def __init__(self, progress=None, browser_pool=None, host_limiter=None, http_session=None,
+                 lean=True, card_cache_path=O2_CARD_CACHE_FILE):
+        super().__init__(progress=progress, browser_pool=browser_pool,
+                         host_limiter=host_limiter, http_session=http_session, lean=lean)
+        # Incremental parsing: unchanged cards reuse last scrape's event (None disables)
+        self.card_cache_path = card_cache_path
+        self.card_cache = self.load_card_cache()
+        self.card_digests = {}  # event_url → digest of its JSON-LD item / card HTML (this scrape)
+
+    def load_card_cache(self) -> Dict:
+        """Load {url: {digest, event}} from the previous scrape (empty if missing or stale)"""
+        if not self.card_cache_path:
+            return {}
+        try:
+            with open(self.card_cache_path, 'r') as f:
+                cache = json.load(f)
+            if cache.get('version') == CARD_PARSER_VERSION:
+                return cache.get('cards', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return {}
+
+    def remember_cards(self, events: List[Dict]):
+        """Replace the card cache with this scrape's events (after detail-page date filling)"""
+        self.card_cache = {
+            event['event_url']: {
+                'digest': self.card_digests[event['event_url']],
+                'event': {k: v for k, v in event.items() if k != 'change_status'}
+            }
+            for event in events if event['event_url'] in self.card_digests
+        }
+
+    def save_card_cache(self):
+        """Write the card cache atomically"""
+        if not self.card_cache_path:
+            return
+        tmp_path = f"{self.card_cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': CARD_PARSER_VERSION, 'cards': self.card_cache}, f)
+        os.replace(tmp_path, self.card_cache_path)
+
+    def cached_event(self, event_url: str, digest: str) -> Dict:
+        """
+        Record the digest for event_url and return the previous event if the
+        card is unchanged (None if new or changed)
+        """
+        self.card_digests[event_url] = digest
+        cached = self.card_cache.get(event_url)
+        if cached and cached['digest'] == digest:
+            return {**cached['event'], 'change_status': 'unchanged'}
+        return None
 
-class O2EnhancedScraper:
-    """Enhanced scraper using Playwright to handle dynamic content"""
+    def change_status(self, event_url: str) -> str:
+        """'changed' if the URL was in the previous scrape, else 'new'"""
+        return 'changed' if event_url in self.card_cache else 'new'
 
-    async def fetch_all_events_html(self) -> str:
+    @staticmethod
+    async def wait_for_more_cards(page, cards_before: int):
+        """Wait until Load More has appended cards (or give up after the selector timeout)"""
+        try:
+            await page.wait_for_function(
+                "([selector, before]) => document.querySelectorAll(selector).length > before",
+                arg=[O2_CARD_SELECTOR, cards_before],
+                timeout=SELECTOR_TIMEOUT_MS
+            )
+        except Exception:
+            print(f"⚠️  No new cards after Load More ({cards_before} on page)")
+
+    async def fetch_listing_html(self) -> str:
         """
         Use Playwright to load page and click 'Load More' until all events are loaded
         Returns: Full HTML with all events
@@ -40,16 +170,14 @@ class O2EnhancedScraper:
 
         print(f"🌐 Opening browser to fetch O2 events...")
 
-        async with async_playwright() as p:
-            # Launch browser (headless mode)
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-
+        async with self.polite(O2_EVENTS_URL), self.open_page() as page:
             print(f"📡 Navigating to {O2_EVENTS_URL}...")
-            await page.goto(O2_EVENTS_URL, wait_until="networkidle")
+            await self.goto(page, O2_EVENTS_URL, self.READY_SELECTOR)
 
-            # Wait for events to load
-            await page.wait_for_timeout(2000)
+            # Wait for events to load (lean profile already waited for the first card)
+            if not self.lean:
+                await page.wait_for_timeout(2000)
+            self.progress('page_loaded', url=O2_EVENTS_URL)
 
             # Handle cookie consent dialog if present
             try:
@@ -94,11 +222,16 @@ class O2EnhancedScraper:
 
                         if is_visible and is_enabled:
                             print(f"🔄 Clicking 'Load More' (attempt {load_more_count + 1})...")
+                            cards_before = await page.locator(O2_CARD_SELECTOR).count()
                             await load_more_button.click()
                             load_more_count += 1
+                            self.progress('load_more', click=load_more_count)
 
                             # Wait for new content to load
-                            await page.wait_for_timeout(1500)
+                            if self.lean:
+                                await self.wait_for_more_cards(page, cards_before)
+                            else:
+                                await page.wait_for_timeout(1500)
                         else:
                             print("✅ 'Load More' button no longer active")
                             break
@@ -113,10 +246,9 @@ class O2EnhancedScraper:
             # Get the full HTML
             html = await page.content()
 
-            await browser.close()
-
             print(f"✅ Page loaded successfully ({len(html)} bytes)")
             print(f"📊 Clicked 'Load More' {load_more_count} times")
+            self.progress('listing_loaded', bytes=len(html), load_more_clicks=load_more_count)
 
             # Save HTML for debugging
             with open('o2-page-full.html', 'w', encoding='utf-8') as f:
@@ -243,109 +375,360 @@ class O2EnhancedScraper:
         # Default to Concert for music events at O2
         return 'Concert'
 
-    def extract_events_from_html(self, html: str) -> List[Dict]:
+    def build_event_from_json_ld(self, item: Dict) -> Dict:
         """
-        Extract events from full HTML using both JSON-LD and HTML parsing
+        Build an event dict from one JSON-LD item (None if not an O2 event)
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        events_by_url = {}  # Use dict to dedupe by URL
+        # Look for event types
+        event_type = item.get('@type', '')
+        if event_type not in ['MusicEvent', 'TheaterEvent', 'Event']:
+            return None
 
-        # Method 1: JSON-LD structured data
-        print("🔍 Extracting events from JSON-LD structured data...")
-        json_ld_scripts = soup.find_all('script', type='application/ld+json')
-        print(f"📋 Found {len(json_ld_scripts)} JSON-LD blocks")
+        # Extract details
+        event_name = item.get('name', '')
 
-        for script in json_ld_scripts:
+        # Filter out Strictly Come Dancing
+        if 'strictly come dancing' in event_name.lower():
+            return None
+
+        start_date = item.get('startDate', '')
+
+        # Extract location
+        location = item.get('location', {})
+        venue_name = location.get('name', 'The O2 Arena, London')
+
+        # Only O2 venues
+        if 'O2' not in venue_name and 'o2' not in venue_name:
+            return None
+
+        # Determine venue
+        if 'indigo' in venue_name.lower():
+            full_venue = 'indigo at The O2, London'
+        else:
+            full_venue = 'The O2 Arena, London'
+
+        # Extract URL
+        event_url = item.get('url', '')
+        if event_url and not event_url.startswith('http'):
+            event_url = f"https://www.theo2.co.uk{event_url}"
+
+        # Extract image
+        image_url = item.get('image', '')
+        if isinstance(image_url, list):
+            image_url = image_url[0] if image_url else ''
+
+        # Parse date/time
+        event_date = self.parse_event_date(start_date) if start_date else None
+        event_time = ''
+        if start_date:
             try:
-                data = json.loads(script.string)
+                dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+                event_time = dt.strftime("%H:%M")
+            except Exception:
+                pass
+
+        # Determine category using smarter detection
+        category = self.detect_category(event_name, event_type)
+
+        # Extract performer if available
+        artist_name = ''
+        if 'performer' in item:
+            performer = item['performer']
+            if isinstance(performer, dict):
+                artist_name = performer.get('name', '')
+            elif isinstance(performer, list) and performer:
+                artist_name = performer[0].get('name', '') if isinstance(performer[0], dict) else ''
+
+        # Create event object
+        event = {
+            'event_name': event_name,
+            'artist_name': artist_name,
+            'venue_name': full_venue,
+            'city': 'London',
+            'country': 'UK',
+            'event_date': event_date,
+            'event_time': event_time,
+            'event_url': event_url,
+            'image_url': image_url,
+            'access_status': 'Request Interpreter',
+            'category': category,
+            'source': 'O2 Auto Import',
+            'notes': 'PI has agreement with The O2 – interpreters on request, not automatically booked.',
+            'added_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+        # Only keep if we have essential data
+        if event['event_name'] and event['event_date'] and event['event_url']:
+            return event
+        return None
 
-                # Handle both single objects and lists
-                if isinstance(data, list):
-                    items = data
-                else:
-                    items = [data]
+    def build_event_from_card(self, fields: Dict) -> Dict:
+        """
+        Build an event dict from the raw fields of one HTML event card
 
-                for item in items:
-                    # Look for event types
-                    event_type = item.get('@type', '')
+        Args:
+            fields: Dict from card_fields_lxml / card_fields_bs4 with
+                url, name, image, time, day, month, year, location (raw text)
 
-                    if event_type in ['MusicEvent', 'TheaterEvent', 'Event']:
-                        # Extract details
-                        event_name = item.get('name', '')
+        Returns:
+            Event dict, or None if the card has no name or is filtered out
+        """
+        event_url = fields['url']
+        event_name = fields['name']
 
-                        # Filter out Strictly Come Dancing
-                        if 'strictly come dancing' in event_name.lower():
-                            continue
+        if not event_name:
+            return None
 
-                        start_date = item.get('startDate', '')
+        # Filter out Strictly Come Dancing
+        if 'strictly come dancing' in event_name.lower():
+            return None
 
-                        # Extract location
-                        location = item.get('location', {})
-                        venue_name = location.get('name', 'The O2 Arena, London')
+        # Clean up event name - remove "More Info for" prefix
+        if event_name.startswith('More Info for '):
+            event_name = event_name.replace('More Info for ', '')
+        if event_name.startswith('Book Tickets for '):
+            event_name = event_name.replace('Book Tickets for ', '')
+
+        image_url = fields['image']
+        if image_url and not image_url.startswith('http'):
+            image_url = f"https://www.theo2.co.uk{image_url}"
+
+        # Construct date string and parse (O2 splits day / month / year into spans)
+        event_date = None
+        if fields['day'] is not None and fields['month'] is not None and fields['year'] is not None:
+            event_date = self.parse_event_date(f"{fields['day']} {fields['month']} {fields['year']}")
+
+        # Extract venue from location element
+        full_venue = 'The O2 Arena, London'  # Default
+        if fields['location'] and 'indigo' in fields['location'].lower():
+            full_venue = 'indigo at The O2, London'
+
+        return {
+            'event_name': event_name,
+            'artist_name': '',
+            'venue_name': full_venue,
+            'city': 'London',
+            'country': 'UK',
+            'event_date': event_date,
+            'event_time': fields['time'],
+            'event_url': event_url,
+            'image_url': image_url,
+            'access_status': 'Request Interpreter',
+            'category': self.detect_category(event_name),
+            'source': 'O2 Auto Import',
+            'notes': 'PI has agreement with The O2 – interpreters on request, not automatically booked.',
+            'added_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    @staticmethod
+    def card_url_bs4(container) -> str:
+        """Detail URL of a BeautifulSoup eventItem container (None without a detail link)"""
+        # Extract event URL from any link in the container
+        link = container.find('a', href=lambda h: h and '/events/detail/' in h)
+        if not link:
+            return None
 
-                        # Only O2 venues
-                        if 'O2' not in venue_name and 'o2' not in venue_name:
-                            continue
+        event_url = link.get('href', '')
+        if event_url and not event_url.startswith('http'):
+            event_url = f"https://www.theo2.co.uk{event_url}"
+        return event_url
+
+    @staticmethod
+    def card_fields_bs4(container, event_url: str) -> Dict:
+        """Raw card fields from a BeautifulSoup eventItem container"""
+        # Extract event name from the link inside h3.title
+        event_name = ''
+        title_elem = container.find('h3', class_='title')
+        if title_elem:
+            link_elem = title_elem.find('a')
+            if link_elem:
+                event_name = link_elem.get_text(strip=True)
+
+        image_url = ''
+        img = container.find('img')
+        if img:
+            image_url = img.get('src', '') or img.get('data-src', '')
+
+        event_time = ''
+        time_elem = container.find('span', class_='time')
+        if not time_elem:
+            time_elem = container.find('span', class_='m-date__time')
+        if time_elem:
+            event_time = time_elem.get_text(strip=True)
+
+        day_elem = month_elem = year_elem = None
+        date_container = container.find('div', class_=lambda c: c and 'date' in str(c).lower())
+        if date_container:
+            # O2 uses nested spans - look inside m-date__singleDate or m-date__rangeFirst
+            single_date = date_container.find('span', class_='m-date__singleDate')
+            is_range = False
+            if not single_date:
+                # Try range date (use first date of range)
+                single_date = date_container.find('span', class_='m-date__rangeFirst')
+                is_range = True
 
-                        # Determine venue
-                        if 'indigo' in venue_name.lower():
-                            full_venue = 'indigo at The O2, London'
-                        else:
-                            full_venue = 'The O2 Arena, London'
+            if single_date:
+                day_elem = single_date.find('span', class_='m-date__day')
+                month_elem = single_date.find('span', class_='m-date__month')
+
+                # Year handling differs for single vs range dates
+                year_elem = single_date.find('span', class_='m-date__year')
+                if not year_elem:
+                    if is_range:
+                        # For range dates, year is in m-date__rangeLast
+                        range_last = date_container.find('span', class_='m-date__rangeLast')
+                        if range_last:
+                            year_elem = range_last.find('span', class_='m-date__year')
+                    else:
+                        # For single dates, year might be in parent
+                        year_elem = date_container.find('span', class_='m-date__year')
 
-                        # Extract URL
-                        event_url = item.get('url', '')
-                        if event_url and not event_url.startswith('http'):
-                            event_url = f"https://www.theo2.co.uk{event_url}"
+        location_elem = container.find('div', class_='location')
+
+        return {
+            'url': event_url,
+            'name': event_name,
+            'image': image_url,
+            'time': event_time,
+            'day': day_elem.get_text(strip=True) if day_elem else None,
+            'month': month_elem.get_text(strip=True) if month_elem else None,
+            'year': year_elem.get_text(strip=True) if year_elem else None,
+            'location': location_elem.get_text(strip=True) if location_elem else ''
+        }
+
+    @staticmethod
+    def card_url_lxml(container) -> str:
+        """Detail URL of an lxml eventItem container (same rules as card_url_bs4)"""
+        links = O2_CARD_XPATH['link'](container)
+        if not links:
+            return None
 
-                        # Extract image
-                        image_url = item.get('image', '')
-                        if isinstance(image_url, list):
-                            image_url = image_url[0] if image_url else ''
+        event_url = links[0].get('href', '')
+        if event_url and not event_url.startswith('http'):
+            event_url = f"https://www.theo2.co.uk{event_url}"
+        return event_url
+
+    @staticmethod
+    def card_fields_lxml(container, event_url: str) -> Dict:
+        """Raw card fields from an lxml eventItem container (same rules as card_fields_bs4)"""
+        xp = O2_CARD_XPATH
+
+        event_name = ''
+        titles = xp['title_link'](container)
+        if titles:
+            event_name = _lxml_text(titles[0])
+
+        image_url = ''
+        imgs = xp['img'](container)
+        if imgs:
+            image_url = imgs[0].get('src', '') or imgs[0].get('data-src', '')
+
+        event_time = ''
+        times = xp['time'](container) or xp['date_time'](container)
+        if times:
+            event_time = _lxml_text(times[0])
+
+        day = month = year = None
+        date_containers = xp['date_container'](container)
+        if date_containers:
+            date_container = date_containers[0]
+            single_dates = xp['single_date'](date_container)
+            is_range = False
+            if not single_dates:
+                single_dates = xp['range_first'](date_container)
+                is_range = True
 
-                        # Parse date/time
-                        event_date = self.parse_event_date(start_date) if start_date else None
-                        event_time = ''
-                        if start_date:
-                            try:
-                                dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                                event_time = dt.strftime("%H:%M")
-                            except Exception:
-                                pass
-
-                        # Determine category using smarter detection
-                        category = self.detect_category(event_name, event_type)
-
-                        # Extract performer if available
-                        artist_name = ''
-                        if 'performer' in item:
-                            performer = item['performer']
-                            if isinstance(performer, dict):
-                                artist_name = performer.get('name', '')
-                            elif isinstance(performer, list) and performer:
-                                artist_name = performer[0].get('name', '') if isinstance(performer[0], dict) else ''
-
-                        # Create event object
-                        event = {
-                            'event_name': event_name,
-                            'artist_name': artist_name,
-                            'venue_name': full_venue,
-                            'city': 'London',
-                            'country': 'UK',
-                            'event_date': event_date,
-                            'event_time': event_time,
-                            'event_url': event_url,
-                            'image_url': image_url,
-                            'access_status': 'Request Interpreter',
-                            'category': category,
-                            'source': 'O2 Auto Import',
-                            'notes': 'PI has agreement with The O2 – interpreters on request, not automatically booked.',
-                            'added_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-
-                        # Only add if we have essential data and add to dict by URL
-                        if event['event_name'] and event['event_date'] and event['event_url']:
-                            events_by_url[event['event_url']] = event
+            if single_dates:
+                single_date = single_dates[0]
+                days = xp['day'](single_date)
+                months = xp['month'](single_date)
+                years = xp['year'](single_date)
+                if not years:
+                    if is_range:
+                        range_lasts = xp['range_last'](date_container)
+                        if range_lasts:
+                            years = xp['year'](range_lasts[0])
+                    else:
+                        years = xp['year'](date_container)
+
+                day = _lxml_text(days[0]) if days else None
+                month = _lxml_text(months[0]) if months else None
+                year = _lxml_text(years[0]) if years else None
+
+        locations = xp['location'](container)
+
+        return {
+            'url': event_url,
+            'name': event_name,
+            'image': image_url,
+            'time': event_time,
+            'day': day,
+            'month': month,
+            'year': year,
+            'location': _lxml_text(locations[0]) if locations else ''
+        }
+
+    def extract_events_from_html(self, html: str, parser: str = None) -> List[Dict]:
+        """
+        Extract events from full HTML using both JSON-LD and HTML parsing
+
+        Args:
+            html: Rendered listing page
+            parser: 'lxml' (compiled XPath over the JSON-LD scripts and eventItem
+                cards only) or 'bs4' (BeautifulSoup html.parser); default lxml
+                when installed
+
+        Cards whose JSON-LD item / card HTML digest matches the previous
+        scrape reuse the cached event instead of being re-extracted. Every
+        event gets change_status: 'new', 'changed' or 'unchanged'.
+        """
+        parser = parser or ('lxml' if LXML_AVAILABLE else 'bs4')
+
+        if parser == 'lxml':
+            root = lxml_html.document_fromstring(html)
+            json_ld_texts = [script.text for script in O2_CARD_XPATH['json_ld'](root)]
+            event_containers = O2_CARD_XPATH['container'](root)
+            card_url, card_fields = self.card_url_lxml, self.card_fields_lxml
+            card_markup = lambda container: etree.tostring(container, encoding='unicode')
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+            json_ld_texts = [script.string for script in soup.find_all('script', type='application/ld+json')]
+            event_containers = soup.find_all('div', class_=lambda c: c and 'eventItem' in str(c))
+            card_url, card_fields = self.card_url_bs4, self.card_fields_bs4
+            card_markup = str
+
+        events_by_url = {}  # Use dict to dedupe by URL
+        self.card_digests = {}
+        reused = 0
+
+        # Method 1: JSON-LD structured data
+        print("🔍 Extracting events from JSON-LD structured data...")
+        print(f"📋 Found {len(json_ld_texts)} JSON-LD blocks")
+
+        for json_ld_text in json_ld_texts:
+            try:
+                data = json.loads(json_ld_text)
+
+                # Handle both single objects and lists
+                items = data if isinstance(data, list) else [data]
+
+                for item in items:
+                    item_json = json.dumps(item, sort_keys=True, ensure_ascii=False)
+                    digest = 'ld:' + hashlib.sha1(item_json.encode('utf-8')).hexdigest()
+                    item_url = item.get('url', '') if isinstance(item, dict) else ''
+                    if item_url and not item_url.startswith('http'):
+                        item_url = f"https://www.theo2.co.uk{item_url}"
+
+                    event = self.cached_event(item_url, digest) if item_url else None
+                    if event:
+                        reused += 1
+                    else:
+                        event = self.build_event_from_json_ld(item)
+                        if not event:
+                            continue
+                        self.card_digests[event['event_url']] = digest
+                        event['change_status'] = self.change_status(event['event_url'])
+                    events_by_url[event['event_url']] = event
 
             except json.JSONDecodeError as e:
                 print(f"⚠️  Could not parse JSON-LD: {e}")
@@ -355,148 +738,42 @@ class O2EnhancedScraper:
                 continue
 
         print(f"✅ JSON-LD: Found {len(events_by_url)} unique events")
+        json_ld_count = len(events_by_url)
 
         # Method 2: HTML event cards (to catch dynamically loaded events)
         print("🔍 Extracting events from HTML event cards...")
-
-        # Find event containers (the div that wraps each event)
-        event_containers = soup.find_all('div', class_=lambda c: c and 'eventItem' in str(c))
         print(f"📋 Found {len(event_containers)} event containers")
 
         html_dates_found = 0
-        for idx, container in enumerate(event_containers):
+        for container in event_containers:
             try:
-                # Extract event URL from any link in the container
-                link = container.find('a', href=lambda h: h and '/events/detail/' in h)
-                if not link:
-                    continue
-
-                event_url = link.get('href', '')
-                if event_url and not event_url.startswith('http'):
-                    event_url = f"https://www.theo2.co.uk{event_url}"
+                event_url = card_url(container)
 
-                # Skip if already captured from JSON-LD
-                if event_url in events_by_url:
+                # Skip cards without a detail link, or already captured (JSON-LD or an earlier card)
+                if not event_url or event_url in events_by_url:
                     continue
 
-                # Extract event name from h3.title
-                event_name = ''
-                title_elem = container.find('h3', class_='title')
-                if title_elem:
-                    # Get the link text inside the h3
-                    link_elem = title_elem.find('a')
-                    if link_elem:
-                        event_name = link_elem.get_text(strip=True)
-
-                if not event_name:
+                digest = 'card:' + hashlib.sha1(card_markup(container).encode('utf-8')).hexdigest()
+                event = self.cached_event(event_url, digest)
+                if event:
+                    reused += 1
+                    events_by_url[event_url] = event
                     continue
 
-                # Filter out Strictly Come Dancing
-                if 'strictly come dancing' in event_name.lower():
+                event = self.build_event_from_card(card_fields(container, event_url))
+                if not event:
                     continue
+                event['change_status'] = self.change_status(event_url)
 
-                # Clean up event name - remove "More Info for" prefix
-                if event_name.startswith('More Info for '):
-                    event_name = event_name.replace('More Info for ', '')
-                if event_name.startswith('Book Tickets for '):
-                    event_name = event_name.replace('Book Tickets for ', '')
-
-                # Extract image
-                image_url = ''
-                img = container.find('img')
-                if img:
-                    image_url = img.get('src', '') or img.get('data-src', '')
-                    if image_url and not image_url.startswith('http'):
-                        image_url = f"https://www.theo2.co.uk{image_url}"
-
-                # Extract date and time using O2's specific structure
-                event_date = None
-                event_time = ''
-
-                # Look for time element
-                time_elem = container.find('span', class_='time')
-                if not time_elem:
-                    time_elem = container.find('span', class_='m-date__time')
-                if time_elem:
-                    event_time = time_elem.get_text(strip=True)
-
-                date_container = container.find('div', class_=lambda c: c and 'date' in str(c).lower())
-                if date_container:
-                    # O2 uses nested spans - look inside m-date__singleDate or m-date__rangeFirst
-                    single_date = date_container.find('span', class_='m-date__singleDate')
-                    is_range = False
-                    if not single_date:
-                        # Try range date (use first date of range)
-                        single_date = date_container.find('span', class_='m-date__rangeFirst')
-                        is_range = True
-
-                    if single_date:
-                        # Extract day, month from the nested structure
-                        day_elem = single_date.find('span', class_='m-date__day')
-                        month_elem = single_date.find('span', class_='m-date__month')
-
-                        # Year handling differs for single vs range dates
-                        year_elem = single_date.find('span', class_='m-date__year')
-                        if not year_elem:
-                            if is_range:
-                                # For range dates, year is in m-date__rangeLast
-                                range_last = date_container.find('span', class_='m-date__rangeLast')
-                                if range_last:
-                                    year_elem = range_last.find('span', class_='m-date__year')
-                            else:
-                                # For single dates, year might be in parent
-                                year_elem = date_container.find('span', class_='m-date__year')
-
-                        if day_elem and month_elem and year_elem:
-                            day = day_elem.get_text(strip=True)
-                            month = month_elem.get_text(strip=True)
-                            year = year_elem.get_text(strip=True)
-
-                            # Construct date string and parse
-                            date_str = f"{day} {month} {year}"
-                            event_date = self.parse_event_date(date_str)
-
-                            if event_date:
-                                html_dates_found += 1
-
-                # Extract venue from location element
-                full_venue = 'The O2 Arena, London'  # Default
-                location_elem = container.find('div', class_='location')
-                if location_elem:
-                    venue_text = location_elem.get_text(strip=True).lower()
-                    if 'indigo' in venue_text:
-                        full_venue = 'indigo at The O2, London'
-
-                # Only add if we have at least name and URL
-                if event_name and event_url:
-
-                    # Determine category using smarter detection
-                    category = self.detect_category(event_name)
-
-                    event = {
-                        'event_name': event_name,
-                        'artist_name': '',
-                        'venue_name': full_venue,
-                        'city': 'London',
-                        'country': 'UK',
-                        'event_date': event_date,
-                        'event_time': event_time,
-                        'event_url': event_url,
-                        'image_url': image_url,
-                        'access_status': 'Request Interpreter',
-                        'category': category,
-                        'source': 'O2 Auto Import',
-                        'notes': 'PI has agreement with The O2 – interpreters on request, not automatically booked.',
-                        'added_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-
-                    events_by_url[event_url] = event
+                if event['event_date']:
+                    html_dates_found += 1
+                events_by_url[event['event_url']] = event
 
             except Exception as e:
                 print(f"⚠️  Error parsing HTML card: {e}")
                 continue
 
-        print(f"✅ HTML cards: Added {len(events_by_url) - 5} new events ({html_dates_found} with dates from HTML)")
+        print(f"✅ HTML cards: Added {len(events_by_url) - json_ld_count} new events ({html_dates_found} with dates from HTML)")
 
         # Convert dict to list
         events = list(events_by_url.values())
@@ -504,27 +781,23 @@ class O2EnhancedScraper:
         # Sort by date (put events without dates at the end)
         events.sort(key=lambda x: x['event_date'] if x['event_date'] else '9999-99-99')
 
+        counts = {status: sum(1 for e in events if e['change_status'] == status)
+                  for status in ('new', 'changed', 'unchanged')}
         print(f"✅ Total extracted: {len(events)} unique events")
+        print(f"   ♻️  {counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged "
+              f"({reused} reused from the previous scrape)")
+        self.progress(
+            'cards_parsed',
+            json_ld=json_ld_count,
+            html_cards=len(event_containers),
+            html_dates=html_dates_found,
+            total=len(events),
+            missing_dates=sum(1 for e in events if not e['event_date']),
+            **counts
+        )
 
         return events
 
-    async def fetch_event_detail_page(self, event_url: str) -> str:
-        """Fetch individual event detail page"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-
-            try:
-                await page.goto(event_url, wait_until="networkidle", timeout=30000)
-                await page.wait_for_timeout(1000)
-                html = await page.content()
-                await browser.close()
-                return html
-            except Exception as e:
-                print(f"⚠️  Failed to fetch {event_url}: {e}")
-                await browser.close()
-                return ""
-
     def extract_date_from_detail_page(self, html: str) -> str:
         """Extract date from individual event detail page"""
         if not html:
@@ -581,57 +854,10 @@ class O2EnhancedScraper:
 
         return None
 
-    async def fill_missing_dates(self, events: List[Dict]) -> tuple:
-        """
-        Fetch individual event pages for events missing dates
-        Returns: (events_with_dates, events_without_dates, filled_count)
-        """
-        events_without_dates = [e for e in events if not e['event_date']]
-
-        if not events_without_dates:
-            return events, [], 0
-
-        print(f"\n🔍 Fetching detail pages for {len(events_without_dates)} event(s) with missing dates...")
-
-        filled_count = 0
-        still_missing = []
-
-        for event in events_without_dates:
-            print(f"   Fetching: {event['event_name'][:50]}...")
-
-            # Fetch detail page
-            html = await self.fetch_event_detail_page(event['event_url'])
-
-            # Try to extract date
-            date = self.extract_date_from_detail_page(html)
-
-            if date:
-                event['event_date'] = date
-                filled_count += 1
-                print(f"   ✅ Found date: {date}")
-            else:
-                still_missing.append(event)
-                print(f"   ❌ No date found")
-
-            # Small delay to be polite
-            await asyncio.sleep(0.5)
-
-        print(f"\n✅ Fallback complete: {filled_count} date(s) found, {len(still_missing)} still missing")
-
-        return events, still_missing, filled_count
-
-    async def scrape_all_events(self) -> tuple:
-        """
-        Main async scraping method
-        Returns: (events, events_without_dates, fallback_count)
-        """
-        html = await self.fetch_all_events_html()
-        events = self.extract_events_from_html(html)
-
-        # Try to fill missing dates via fallback
-        events, events_without_dates, fallback_count = await self.fill_missing_dates(events)
-
-        return events, events_without_dates, fallback_count
+    def finish_scrape(self, events: List[Dict]):
+        """Next scrape reuses these cards (including dates found on detail pages)"""
+        self.remember_cards(events)
+        self.save_card_cache()
 
 
 async def main():
@@ -647,7 +873,8 @@ async def main():
         print("  playwright install chromium")
         sys.exit(1)
 
-    scraper = O2EnhancedScraper()
+    # --full-profile: load every image/font/third-party script and wait for network idle
+    scraper = O2EnhancedScraper(lean='--full-profile' not in sys.argv)
 
     try:
         events, events_without_dates, fallback_count = await scraper.scrape_all_events()
@@ -671,6 +898,11 @@ async def main():
             for e in events_without_dates:
                 print(f"     - {e['event_name']}")
 
+        metrics = scraper.metrics_summary()
+        print(f"\n📶 {'Lean' if scraper.lean else 'Full'} profile: {metrics['pages']} page(s), "
+              f"{metrics['requests']} requests ({metrics['blocked']} blocked), "
+              f"{metrics['bytes'] / 1024:.0f} KB in {metrics['page_seconds']}s")
+
         # Display sample events
         print(f"\n📋 Sample events:")
         for i, event in enumerate(with_dates[:5], 1):
@@ -697,5 +929,72 @@ async def main():
         raise
 
 
+def benchmark_parse(html_path: str = 'o2-page-full.html', repeat: int = 5):
+    """
+    Time the bs4 and lxml listing parsers on a saved page and check both
+    extract identical events
+
+    Usage:
+        python3 o2-scraper-enhanced.py --benchmark [o2-page-full.html]
+    """
+    import contextlib
+    import io
+    import time
+
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    print("=" * 70)
+    print(f"⏱️  O2 LISTING PARSE BENCHMARK ({html_path}, {len(html):,} chars, best of {repeat})")
+    print("=" * 70)
+
+    scraper = O2EnhancedScraper(card_cache_path=None)
+    parsers = ['bs4', 'lxml'] if LXML_AVAILABLE else ['bs4']
+    timings, results = {}, {}
+
+    for parser in parsers:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                events = scraper.extract_events_from_html(html, parser=parser)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[parser] = best
+        results[parser] = [{k: v for k, v in e.items() if k not in ('added_date', 'change_status')} for e in events]
+        print(f"   {parser:5s} {best * 1000:8.1f}ms  ({len(events)} events)")
+
+    # Repeat scrape of the same page: every card should be reused from the cache
+    parser = parsers[-1]
+    scraper.remember_cards(events)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cached_events = scraper.extract_events_from_html(html, parser=parser)
+    elapsed = time.perf_counter() - start
+    unchanged = sum(1 for e in cached_events if e['change_status'] == 'unchanged')
+    print(f"   {parser}+card cache {elapsed * 1000:8.1f}ms  ({unchanged}/{len(cached_events)} unchanged)")
+    cached_results = [{k: v for k, v in e.items() if k not in ('added_date', 'change_status')} for e in cached_events]
+    if cached_results != results[parser]:
+        print("   ❌ Cached events differ from a full parse")
+        sys.exit(1)
+
+    if not LXML_AVAILABLE:
+        print("   ⚠️  lxml not installed (pip install lxml) - only the bs4 path was timed")
+        return
+
+    print(f"   Speedup: {timings['bs4'] / timings['lxml']:.1f}x")
+    if results['bs4'] == results['lxml']:
+        print("   ✅ Identical events from both parsers")
+    else:
+        differing = sum(1 for a, b in zip(results['bs4'], results['lxml']) if a != b)
+        print(f"   ❌ Parsers disagree ({differing} differing events, "
+              f"{len(results['bs4'])} vs {len(results['lxml'])} total)")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    if '--benchmark' in sys.argv:
+        args = sys.argv[sys.argv.index('--benchmark') + 1:]
+        benchmark_parse(args[0] if args else 'o2-page-full.html')
+    else:
+        asyncio.run(main())
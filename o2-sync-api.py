@@ -4,143 +4,177 @@ O2 Events Sync API Server
 Lightweight Flask API for triggering O2 scraper pipeline from admin UI
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
-import subprocess
+import atexit
+import importlib.util
 import json
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
 
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from o2_browser_pool import BrowserPool
+from o2_progress import ProgressBroker, TERMINAL_PHASES, format_sse
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for local development
 
-# Get the directory where this script is located
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Seconds between SSE heartbeats while no phase event arrives
+HEARTBEAT_SECONDS = 10
+
+# Progress events for the current scrape + sync run
+progress_broker = ProgressBroker()
+
+# Warm Chromium instances shared by every scrape (started on first sync)
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
+
+_script_modules = {}
 
-def run_python_script(script_name):
+
+def load_script_module(script_name):
     """
-    Execute a Python script and capture output
-    Returns: (success, stdout, stderr)
+    Import a hyphenated pipeline script (e.g. o2-sync-complete.py) as a module
+    Modules are cached so repeat syncs reuse them
     """
-    script_path = os.path.join(SCRIPT_DIR, script_name)
+    if script_name in _script_modules:
+        return _script_modules[script_name]
 
+    script_path = os.path.join(SCRIPT_DIR, script_name)
     if not os.path.exists(script_path):
-        return False, "", f"Script not found: {script_path}"
+        raise FileNotFoundError(f"Script not found: {script_path}")
 
-    try:
-        result = subprocess.run(
-            [sys.executable, script_path],
-            cwd=SCRIPT_DIR,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+    module_name = os.path.splitext(script_name)[0].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
 
-        return result.returncode == 0, result.stdout, result.stderr
-
-    except subprocess.TimeoutExpired:
-        return False, "", "Script execution timeout (5 minutes)"
-    except Exception as e:
-        return False, "", str(e)
+    _script_modules[script_name] = module
+    return module
 
 
-def parse_scraper_output(stdout):
+def run_sync_pipeline(progress):
     """
-    Parse o2-scraper-enhanced.py output to extract event count
+    Run scraper + sync in-process, publishing phase events via progress(phase, **data)
+
+    Returns: (response_dict, http_status)
     """
-    total_events = 0
-
-    for line in stdout.split('\n'):
-        if 'events extracted' in line.lower() or 'total events:' in line.lower():
-            # Try to extract number from line
-            import re
-            numbers = re.findall(r'\d+', line)
-            if numbers:
-                total_events = int(numbers[0])
-                break
-
-    # Fallback: try to load from o2-events-all.json
-    if total_events == 0:
-        json_path = os.path.join(SCRIPT_DIR, 'o2-events-all.json')
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r') as f:
-                    events = json.load(f)
-                    total_events = len(events)
-            except:
-                pass
-
-    return total_events
-
-
-def parse_sync_output(stdout):
+    timestamp = lambda: datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    # Step 1: Run scraper
+    print(f"[{datetime.now()}] Starting O2 scraper...")
+    progress('scrape_started')
+    try:
+        scraper_module = load_script_module('o2-scraper-enhanced.py')
+        scraper = scraper_module.O2EnhancedScraper(
+            progress=progress, browser_pool=browser_pool,
+            card_cache_path=os.path.join(SCRIPT_DIR, scraper_module.O2_CARD_CACHE_FILE)
+        )
+        events, events_without_dates, fallback_count = browser_pool.run(scraper.scrape_all_events())
+
+        with open(os.path.join(SCRIPT_DIR, 'o2-events-all.json'), 'w') as f:
+            json.dump(events, f, indent=2)
+    except Exception as e:
+        print(f"[{datetime.now()}] Scraper failed: {e}")
+        return {
+            'success': False,
+            'error': f'Scraper failed: {e}',
+            'step': 'scrape',
+            'timestamp': timestamp()
+        }, 500
+
+    total_scraped = len(events)
+    print(f"[{datetime.now()}] Scraped {total_scraped} events")
+    progress('scrape_complete', scraped=total_scraped, without_dates=len(events_without_dates),
+             filled_from_detail=fallback_count, **scraper.metrics_summary())
+
+    # Step 2: Run sync with de-duplication
+    print(f"[{datetime.now()}] Starting sync with de-duplication...")
+    progress('sync_started')
+    try:
+        sync_module = load_script_module('o2-sync-complete.py')
+        output = sync_module.run_sync(base_dir=SCRIPT_DIR, progress=progress)
+    except Exception as e:
+        print(f"[{datetime.now()}] Sync failed: {e}")
+        return {
+            'success': False,
+            'error': f'Sync failed: {e}',
+            'step': 'sync',
+            'scraped': total_scraped,
+            'timestamp': timestamp()
+        }, 500
+
+    stats = output['stats']
+    already_public_approved = stats.get('skipped_public_approved', 0)
+    already_pre_approved = stats.get('skipped_pre_approved', 0)
+    new_events_added = stats.get('new_events', 0)
+    deleted_pre_count = stats.get('deleted_pre_count', 0)
+    deleted_pub_count = stats.get('deleted_pub_count', 0)
+
+    print(f"[{datetime.now()}] Sync complete:")
+    print(f"  - Scraped: {total_scraped}")
+    print(f"  - New events added: {new_events_added}")
+    print(f"  - Already in PUBLIC_APPROVED: {already_public_approved}")
+    print(f"  - Already in PRE_APPROVED EVENTS: {already_pre_approved}")
+    print(f"  - Outdated O2 events deleted from PRE_APPROVED: {deleted_pre_count}")
+    print(f"  - Outdated events deleted from PUBLIC_APPROVED: {deleted_pub_count}")
+
+    return {
+        'success': True,
+        'scraped': total_scraped,
+        'newEvents': new_events_added,
+        'alreadyPublicApproved': already_public_approved,
+        'alreadyPreApproved': already_pre_approved,
+        'deletedPreCount': deleted_pre_count,
+        'deletedPubCount': deleted_pub_count,
+        'range': '',
+        'added': new_events_added,
+        'skipped': already_public_approved + already_pre_approved,
+        'timestamp': timestamp()
+    }, 200
+
+
+def run_tracked_sync():
     """
-    Parse o2-sync-complete.py output to extract sync statistics including deletion counts
+    Run the pipeline as the broker's current run and publish the terminal event
+    Returns: (response_dict, http_status)
     """
-    stats = {
-        'total_scraped': 0,
-        'already_public_approved': 0,
-        'already_pre_approved': 0,
-        'new_events_added': 0,
-        'deleted_pre_count': 0,
-        'deleted_pub_count': 0,
-        'range_written': ''
-    }
+    try:
+        result, status = run_sync_pipeline(progress_broker.publish)
+    except Exception as e:
+        print(f"[{datetime.now()}] Unexpected error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        result, status = {
+            'success': False,
+            'error': f'Unexpected error: {str(e)}',
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }, 500
+
+    progress_broker.publish('complete' if result['success'] else 'failed', result=result)
+    return result, status
+
 
-    for line in stdout.split('\n'):
-        line_lower = line.lower()
-
-        if 'scraped:' in line_lower:
-            import re
-            numbers = re.findall(r'\d+', line)
-            if numbers:
-                stats['total_scraped'] = int(numbers[0])
-
-        elif 'skipped (in public_approved)' in line_lower or 'in public_approved:' in line_lower:
-            import re
-            numbers = re.findall(r'\d+', line)
-            if numbers:
-                stats['already_public_approved'] = int(numbers[0])
-
-        elif 'skipped (in pre' in line_lower or 'in pre_approved:' in line_lower:
-            import re
-            numbers = re.findall(r'\d+', line)
-            if numbers:
-                stats['already_pre_approved'] = int(numbers[0])
-
-        elif 'new events to add:' in line_lower or 'new events:' in line_lower:
-            import re
-            numbers = re.findall(r'\d+', line)
-            if numbers:
-                stats['new_events_added'] = int(numbers[0])
-
-        elif 'deleted from pre_approved:' in line_lower or 'o2 events deleted from pre_approved:' in line_lower:
-            import re
-            numbers = re.findall(r'\d+', line)
-            if numbers:
-                stats['deleted_pre_count'] = int(numbers[0])
-
-        elif 'deleted from public_approved:' in line_lower or 'events deleted from public_approved:' in line_lower:
-            import re
-            numbers = re.findall(r'\d+', line)
-            if numbers:
-                stats['deleted_pub_count'] = int(numbers[0])
-
-        elif 'range' in line_lower and ':' in line:
-            # Extract range like "A2:N134"
-            import re
-            range_match = re.search(r'[A-Z]\d+:[A-Z]\d+', line)
-            if range_match:
-                stats['range_written'] = range_match.group(0)
-
-    return stats
+def sync_already_running():
+    """Response for a sync request that arrives while another run is active"""
+    return jsonify({
+        'success': False,
+        'error': 'A sync is already running',
+        'run': progress_broker.snapshot(),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }), 409
 
 
 @app.route('/api/sync-o2-events', methods=['POST', 'GET'])
 def sync_o2_events():
     """
-    Main endpoint to trigger O2 events sync pipeline
+    Main endpoint to trigger O2 events sync pipeline (blocks until finished)
 
     Returns JSON:
     {
@@ -156,89 +190,68 @@ def sync_o2_events():
         "error": "error message if failed"
     }
     """
+    if not progress_broker.start_run():
+        return sync_already_running()
 
-    try:
-        # Step 1: Run scraper
-        print(f"[{datetime.now()}] Starting O2 scraper...")
-        scrape_success, scrape_stdout, scrape_stderr = run_python_script('o2-scraper-enhanced.py')
-
-        if not scrape_success:
-            print(f"[{datetime.now()}] Scraper failed")
-            print(f"STDERR: {scrape_stderr}")
-            return jsonify({
-                'success': False,
-                'error': f'Scraper failed: {scrape_stderr}',
-                'step': 'scrape',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }), 500
-
-        # Parse scraper output
-        total_scraped = parse_scraper_output(scrape_stdout)
-        print(f"[{datetime.now()}] Scraped {total_scraped} events")
-
-        # Step 2: Run sync with de-duplication
-        print(f"[{datetime.now()}] Starting sync with de-duplication...")
-        sync_success, sync_stdout, sync_stderr = run_python_script('o2-sync-complete.py')
-
-        if not sync_success:
-            print(f"[{datetime.now()}] Sync failed")
-            print(f"STDERR: {sync_stderr}")
-            return jsonify({
-                'success': False,
-                'error': f'Sync failed: {sync_stderr}',
-                'step': 'sync',
-                'scraped': total_scraped,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }), 500
-
-        # Parse sync output
-        stats = parse_sync_output(sync_stdout)
-
-        # If total_scraped wasn't captured from scraper, use sync stats
-        if total_scraped == 0:
-            total_scraped = stats.get('total_scraped', 0)
-
-        # Calculate final statistics
-        already_public_approved = stats.get('already_public_approved', 0)
-        already_pre_approved = stats.get('already_pre_approved', 0)
-        new_events_added = stats.get('new_events_added', 0)
-        deleted_pre_count = stats.get('deleted_pre_count', 0)
-        deleted_pub_count = stats.get('deleted_pub_count', 0)
-        total_skipped = already_public_approved + already_pre_approved
-
-        print(f"[{datetime.now()}] Sync complete:")
-        print(f"  - Scraped: {total_scraped}")
-        print(f"  - New events added: {new_events_added}")
-        print(f"  - Already in PUBLIC_APPROVED: {already_public_approved}")
-        print(f"  - Already in PRE_APPROVED EVENTS: {already_pre_approved}")
-        print(f"  - Outdated O2 events deleted from PRE_APPROVED: {deleted_pre_count}")
-        print(f"  - Outdated events deleted from PUBLIC_APPROVED: {deleted_pub_count}")
-
-        # Success response
-        return jsonify({
-            'success': True,
-            'scraped': total_scraped,
-            'newEvents': new_events_added,
-            'alreadyPublicApproved': already_public_approved,
-            'alreadyPreApproved': already_pre_approved,
-            'deletedPreCount': deleted_pre_count,
-            'deletedPubCount': deleted_pub_count,
-            'range': stats.get('range_written', ''),
-            'added': new_events_added,
-            'skipped': total_skipped,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        })
+    result, status = run_tracked_sync()
+    return jsonify(result), status
 
-    except Exception as e:
-        print(f"[{datetime.now()}] Unexpected error: {str(e)}")
-        import traceback
-        traceback.print_exc()
 
-        return jsonify({
-            'success': False,
-            'error': f'Unexpected error: {str(e)}',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }), 500
+@app.route('/api/sync-o2-events/start', methods=['POST'])
+def start_sync_o2_events():
+    """
+    Start the sync pipeline in the background and return immediately
+    Follow progress via GET /api/sync-o2-events/stream
+    """
+    run_id = progress_broker.start_run()
+    if not run_id:
+        return sync_already_running()
+
+    threading.Thread(target=run_tracked_sync, daemon=True).start()
+
+    return jsonify({
+        'success': True,
+        'runId': run_id,
+        'stream': '/api/sync-o2-events/stream',
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }), 202
+
+
+@app.route('/api/sync-o2-events/stream', methods=['GET'])
+def stream_sync_o2_events():
+    """
+    Server-Sent Events stream of the current (or most recent) sync run
+
+    Each phase is sent as its own SSE event (page_loaded, load_more, cards_parsed,
+    detail_page, detail_pages_filled, dedupe, rows_pruned, complete, failed...).
+    A heartbeat event carries idle_seconds so stalls are visible immediately.
+    """
+    subscriber = progress_broker.subscribe()
+
+    def generate():
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield format_sse('heartbeat', {
+                        'idle_seconds': progress_broker.idle_seconds(),
+                        'run': progress_broker.snapshot()
+                    })
+                    continue
+
+                yield format_sse(event['phase'], event, event_id=event['seq'])
+
+                if event['phase'] in TERMINAL_PHASES:
+                    break
+        finally:
+            progress_broker.unsubscribe(subscriber)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 @app.route('/api/health', methods=['GET'])
@@ -251,6 +264,21 @@ def health_check():
     })
 
 
+@app.route('/api/browser-pool', methods=['GET'])
+def browser_pool_status():
+    """
+    Browser pool state (browsers, ages, pages served, launches/retirements)
+    Pass ?check=1 to run a health check that replaces unresponsive browsers
+    """
+    health = browser_pool.health_check() if request.args.get('check') else None
+
+    return jsonify({
+        'pool': browser_pool.snapshot(),
+        'health': health,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    })
+
+
 @app.route('/api/status', methods=['GET'])
 def get_status():
     """
@@ -264,6 +292,7 @@ def get_status():
         'scraper_exists': scraper_exists,
         'sync_exists': sync_exists,
         'working_directory': SCRIPT_DIR,
+        'run': progress_broker.snapshot(),
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
 
@@ -277,4 +306,4 @@ if __name__ == '__main__':
     print("=" * 60)
 
     # Run on port 5001 to avoid conflicts with other services
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    app.run(host='0.0.0.0', port=5001, debug=True, threaded=True)
@@ -5,161 +5,112 @@ Orchestrates the complete sync pipeline with Claude Code MCP tools
 """
 
 import json
+import os
 import sys
 from datetime import datetime, timedelta
 from typing import List, Dict, Set, Tuple, Optional
 import pytz
 
+from o2_key_index import KeyIndex, key_hash, dump_fingerprint
+from pipeline.event_keys import event_key, event_key_for, canonical_date
+from o2_progress import noop_progress
+
 SPREADSHEET_ID = "1NiiWMcEEwjiU_DeVuUre_Qxyf5DGqEwG8Z8mYIRMuGU"
 LONDON_TZ = pytz.timezone('Europe/London')
 
+# Persistent dedupe key index (see o2_key_index.py)
+KEY_INDEX_FILE = "o2-key-index.bin"
+# Bump when pipeline/event_keys.py normalization changes so the index is rebuilt
+KEY_NORMALIZATION_VERSION = 3
+PUBLIC_APPROVED_SHEET = 1
+PRE_APPROVED_SHEET = 2
+
 
-def normalize_date(date_str: str) -> str:
+def public_approved_columns(headers: List[str]) -> Optional[Tuple[int, int, int, int]]:
     """
-    Normalize date to YYYY-MM-DD format for comparison
-    Handles: "06.12.25", "2025-12-06", "06/12/25", etc.
+    (name, date, venue, url) column indices for PUBLIC_APPROVED (url -1 if absent)
+    Accepts both column naming conventions; None if the columns are missing
     """
-    if not date_str:
-        return ""
-
-    # Already in YYYY-MM-DD format
-    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
-        return date_str
-
-    # Try DD.MM.YY format (from CURATED sheet)
-    if '.' in date_str:
-        parts = date_str.split('.')
-        if len(parts) == 3:
-            day, month, year = parts
-            # Handle 2-digit year
-            if len(year) == 2:
-                year = '20' + year
-            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-
-    # Try DD/MM/YY format
-    if '/' in date_str:
-        parts = date_str.split('/')
-        if len(parts) == 3:
-            day, month, year = parts
-            if len(year) == 2:
-                year = '20' + year
-            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-
-    return date_str
-
+    try:
+        # Try PI Work Flow style first (EVENT_NAME, EVENT_DATE, VENUE_NAME, EVENT_URL)
+        if "EVENT_NAME" in headers:
+            return (headers.index("EVENT_NAME"), headers.index("EVENT_DATE"), headers.index("VENUE_NAME"),
+                    headers.index("EVENT_URL") if "EVENT_URL" in headers else -1)
+        # Fallback to Public Events Feed style (EVENT, DATE, VENUE)
+        return (headers.index("EVENT"), headers.index("DATE"), headers.index("VENUE"),
+                headers.index("URL") if "URL" in headers else -1)
+    except ValueError:
+        return None
 
-def normalize_venue(venue_str: str) -> str:
-    """Normalize venue names for comparison"""
-    if not venue_str:
-        return ""
 
-    venue = venue_str.lower().strip()
+def pre_approved_columns(headers: List[str]) -> Optional[Tuple[int, int, int, int]]:
+    """(name, date, venue, url) column indices for PRE_APPROVED EVENTS; None if missing"""
+    try:
+        return (headers.index("EVENT_NAME"), headers.index("EVENT_DATE"), headers.index("VENUE_NAME"),
+                headers.index("EVENT_URL") if "EVENT_URL" in headers else -1)
+    except ValueError:
+        return None
 
-    # Remove common suffixes
-    venue = venue.replace(', london', '').replace(' london', '')
-    venue = venue.replace('the o2 arena', 'the o2').replace('o2 arena', 'the o2')
 
-    return venue
+def row_key_cells(row: List[str], columns: Tuple[int, int, int, int]) -> Tuple[str, ...]:
+    """Raw (name, date, venue, url) cells of a row ("" for short rows)"""
+    name_idx, date_idx, venue_idx, url_idx = columns
+    if len(row) > max(columns) and url_idx >= 0:
+        return row[name_idx], row[date_idx], row[venue_idx], row[url_idx]
+    return tuple(row[idx] if 0 <= idx < len(row) else "" for idx in columns)
 
 
-def normalize_url(url: str) -> str:
+def row_keys(row: List[str], columns: Tuple[int, int, int, int], o2_only: bool = False) -> Tuple[str, str]:
     """
-    Normalize URL for deduplication
-    Strips tracking params, protocol, trailing slashes
+    (normalized URL, name|date|venue key) of a sheet row; "" where not keyable
+    o2_only: rows whose venue doesn't mention O2 get no keys (PUBLIC_APPROVED)
     """
-    if not url:
-        return ""
-
-    # Convert to lowercase
-    url = url.lower().strip()
-
-    # Remove protocol
-    url = url.replace('https://', '').replace('http://', '')
-
-    # Remove common tracking parameters
-    if '?' in url:
-        base_url, params = url.split('?', 1)
-        # Keep only essential params, strip tracking ones
-        # For O2 events, we usually don't need query params
-        url = base_url
+    name_idx, date_idx, venue_idx, _ = columns
+    if len(row) <= max(name_idx, date_idx, venue_idx):
+        return "", ""
 
-    # Remove trailing slash
-    url = url.rstrip('/')
+    event_name, event_date, venue, event_url = row_key_cells(row, columns)
 
-    # Remove www.
-    url = url.replace('www.', '')
+    # Only include O2 events
+    if o2_only and 'o2' not in venue.lower():
+        return "", ""
 
-    return url
+    key = event_key(event_name, event_date, venue, event_url)
 
+    # name|date|venue key only when the row has a name and date
+    return key.url_key, (key.event_key if event_name and event_date else "")
 
-def create_event_key(event_name: str, event_date: str, venue_name: str) -> str:
-    """Create a unique key for event matching"""
-    name = event_name.lower().strip()
-    date = normalize_date(event_date)
-    venue = normalize_venue(venue_name)
 
-    return f"{name}|{date}|{venue}"
-
-
-def extract_o2_events_from_public_approved(public_approved_data: List[List[str]]) -> Tuple[Set[str], Set[str]]:
-    """
-    Extract O2 events from PUBLIC_APPROVED sheet data
-    Returns (url_keys, name_date_venue_keys)
-    """
+def _extract_keys(sheet_data: List[List[str]], columns_fn, o2_only: bool,
+                  sheet_name: str) -> Tuple[Set[str], Set[str]]:
     url_keys = set()
     name_keys = set()
 
     # Skip header row
-    if not public_approved_data or len(public_approved_data) <= 1:
+    if not sheet_data or len(sheet_data) <= 1:
         return url_keys, name_keys
 
-    headers = public_approved_data[0]
-    # Find column indices - try both column naming conventions
-    try:
-        # Try PI Work Flow style first (EVENT_NAME, EVENT_DATE, VENUE_NAME, EVENT_URL)
-        if "EVENT_NAME" in headers:
-            name_idx = headers.index("EVENT_NAME")
-            date_idx = headers.index("EVENT_DATE")
-            venue_idx = headers.index("VENUE_NAME")
-            url_idx = headers.index("EVENT_URL") if "EVENT_URL" in headers else -1
-        else:
-            # Fallback to Public Events Feed style (EVENT, DATE, VENUE)
-            event_idx = headers.index("EVENT")
-            date_idx = headers.index("DATE")
-            venue_idx = headers.index("VENUE")
-            name_idx = event_idx
-            url_idx = headers.index("URL") if "URL" in headers else -1
-    except ValueError:
-        print("⚠️  Warning: Could not find expected columns in PUBLIC_APPROVED sheet")
+    columns = columns_fn(sheet_data[0])
+    if columns is None:
+        print(f"⚠️  Warning: Could not find expected columns in {sheet_name} sheet")
         return url_keys, name_keys
 
-    # Process each row
-    for row in public_approved_data[1:]:
-        if len(row) <= max(name_idx, date_idx, venue_idx):
-            continue
-
-        venue = row[venue_idx] if venue_idx < len(row) else ""
-
-        # Only include O2 events
-        if 'o2' not in venue.lower():
-            continue
+    for row in sheet_data[1:]:
+        url_key, name_key = row_keys(row, columns, o2_only)
+        if url_key:
+            url_keys.add(url_key)
+        if name_key:
+            name_keys.add(name_key)
 
-        event_name = row[name_idx] if name_idx < len(row) else ""
-        event_date = row[date_idx] if date_idx < len(row) else ""
-        event_url = row[url_idx] if url_idx >= 0 and url_idx < len(row) else ""
-
-        # Add URL-based key if URL exists
-        if event_url:
-            normalized_url = normalize_url(event_url)
-            if normalized_url:
-                url_keys.add(normalized_url)
+    return url_keys, name_keys
 
-        # Add name|date|venue key
-        if event_name and event_date:
-            key = create_event_key(event_name, event_date, venue)
-            name_keys.add(key)
 
-    return url_keys, name_keys
+def extract_o2_events_from_public_approved(public_approved_data: List[List[str]]) -> Tuple[Set[str], Set[str]]:
+    """
+    Extract O2 events from PUBLIC_APPROVED sheet data
+    Returns (url_keys, name_date_venue_keys)
+    """
+    return _extract_keys(public_approved_data, public_approved_columns, True, 'PUBLIC_APPROVED')
 
 
 def extract_events_from_pre_approved(pre_approved_data: List[List[str]]) -> Tuple[Set[str], Set[str]]:
@@ -167,72 +118,94 @@ def extract_events_from_pre_approved(pre_approved_data: List[List[str]]) -> Tupl
     Extract events from PRE_APPROVED EVENTS sheet
     Returns (url_keys, name_date_venue_keys)
     """
-    url_keys = set()
-    name_keys = set()
+    return _extract_keys(pre_approved_data, pre_approved_columns, False, 'PRE_APPROVED EVENTS')
 
-    # Skip header row
-    if not pre_approved_data or len(pre_approved_data) <= 1:
-        return url_keys, name_keys
-
-    headers = pre_approved_data[0]
-    # Find column indices
-    try:
-        name_idx = headers.index("EVENT_NAME")
-        date_idx = headers.index("EVENT_DATE")
-        venue_idx = headers.index("VENUE_NAME")
-        url_idx = headers.index("EVENT_URL") if "EVENT_URL" in headers else -1
-    except ValueError:
-        print("⚠️  Warning: Could not find expected columns in PRE_APPROVED EVENTS sheet")
-        return url_keys, name_keys
 
-    # Process each row
-    for row in pre_approved_data[1:]:
-        if len(row) <= max(name_idx, date_idx, venue_idx):
-            continue
-
-        event_name = row[name_idx] if name_idx < len(row) else ""
-        event_date = row[date_idx] if date_idx < len(row) else ""
-        venue_name = row[venue_idx] if venue_idx < len(row) else ""
-        event_url = row[url_idx] if url_idx >= 0 and url_idx < len(row) else ""
-
-        # Add URL-based key if URL exists
-        if event_url:
-            normalized_url = normalize_url(event_url)
-            if normalized_url:
-                url_keys.add(normalized_url)
-
-        # Add name|date|venue key
-        if event_name and event_date:
-            key = create_event_key(event_name, event_date, venue_name)
-            name_keys.add(key)
+def sync_key_index(
+    key_index: KeyIndex,
+    public_approved_data: List[List[str]],
+    pre_approved_data: List[List[str]],
+    fingerprints: Optional[Dict[str, int]] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Update the persistent key index from the sheet dumps
+    A sheet whose dump fingerprint matches the last sync is skipped outright;
+    otherwise only rows whose raw name/date/venue/URL cells are new since the
+    last sync are normalized, and rows gone from the sheet (pruned) drop their keys
+    Returns: {sheet: {rows, added, removed, unchanged, skipped}}
+    """
+    fingerprints = fingerprints or {}
+    stats = {}
+    for sheet_id, sheet_name, sheet_data, columns_fn, o2_only in (
+        (PUBLIC_APPROVED_SHEET, 'PUBLIC_APPROVED', public_approved_data, public_approved_columns, True),
+        (PRE_APPROVED_SHEET, 'PRE_APPROVED', pre_approved_data, pre_approved_columns, False),
+    ):
+        has_rows = bool(sheet_data) and len(sheet_data) > 1
+        columns = columns_fn(sheet_data[0]) if has_rows else None
+        if has_rows and columns is None:
+            print(f"⚠️  Warning: Could not find expected columns in {sheet_name} sheet")
+
+        def keys_fn(row, columns=columns, o2_only=o2_only):
+            url_key, name_key = row_keys(row, columns, o2_only)
+            return key_hash('url', url_key), key_hash('name', name_key)
+
+        stats[sheet_name] = key_index.sync_sheet(
+            sheet_id,
+            sheet_data[1:] if columns is not None else [],
+            cells_fn=lambda row, columns=columns: row_key_cells(row, columns),
+            keys_fn=keys_fn,
+            fingerprint=fingerprints.get(sheet_name, 0)
+        )
 
-    return url_keys, name_keys
+    key_index.save()
+    return stats
 
 
 def dedupe_events(
     scraped_events: List[Dict],
     public_approved_data: List[List[str]],
-    pre_approved_data: List[List[str]]
+    pre_approved_data: List[List[str]],
+    progress=noop_progress,
+    key_index_path: str = KEY_INDEX_FILE,
+    sheet_fingerprints: Optional[Dict[str, int]] = None
 ) -> Tuple[List[Dict], Dict[str, int]]:
     """
     De-duplicate scraped events against existing sheets
     Uses URL-first matching: if EVENT_URL exists, use normalized URL as key
     Otherwise fallback to (EVENT_NAME | EVENT_DATE | VENUE_NAME)
+    Sheet keys come from the persistent key index (o2_key_index.py), updated
+    incrementally from the dumps; its Bloom filter settles "definitely new"
+    events without a lookup. sheet_fingerprints ({'PUBLIC_APPROVED': ...,
+    'PRE_APPROVED': ...} from dump_fingerprint) let unchanged dumps skip the
+    index update entirely
+    Events the scraper marked change_status='unchanged' are checked like any
+    other: the card cache is written by every scrape, not by a successful
+    sync, so an unchanged card may never have reached PRE_APPROVED (failed
+    sync, unwritten sync-output.json, two scrapes before a sync). Those
+    cases are counted as unchanged_new
     Returns: (new_events, stats_dict)
     """
     print("\n🔍 De-duplicating events (URL-first strategy)...")
+    progress('dedupe_started', scraped=len(scraped_events))
 
-    # Extract existing events from both sheets (returns url_keys, name_keys)
-    public_url_keys, public_name_keys = extract_o2_events_from_public_approved(public_approved_data)
-    pre_url_keys, pre_name_keys = extract_events_from_pre_approved(pre_approved_data)
+    # Bring the key index in line with both sheets (only new/removed rows are normalized)
+    key_index = KeyIndex(key_index_path, key_version=KEY_NORMALIZATION_VERSION)
+    index_stats = sync_key_index(key_index, public_approved_data, pre_approved_data, sheet_fingerprints)
 
-    print(f"   PUBLIC_APPROVED: {len(public_url_keys)} URL keys, {len(public_name_keys)} name|date|venue keys")
-    print(f"   PRE_APPROVED EVENTS: {len(pre_url_keys)} URL keys, {len(pre_name_keys)} name|date|venue keys")
+    for sheet_name, sheet_stats in index_stats.items():
+        if sheet_stats['skipped']:
+            print(f"   {sheet_name}: {sheet_stats['rows']} rows (dump unchanged since last sync)")
+        else:
+            print(f"   {sheet_name}: {sheet_stats['rows']} rows "
+                  f"({sheet_stats['added']} new, {sheet_stats['removed']} removed since last sync)")
+    print(f"   Key index: {key_index.n_keys} keys, {key_index.n_rows} rows")
 
     new_events = []
     skipped_public_approved = 0
     skipped_pre_approved = 0
     skipped_no_date = 0
+    unchanged_new = 0
+    bloom_new = 0
     url_matches = 0
     name_matches = 0
 
@@ -242,29 +215,34 @@ def dedupe_events(
             skipped_no_date += 1
             continue
 
-        # Get event URL and create normalized URL key
-        event_url = event.get('event_url', '')
-        normalized_url = normalize_url(event_url) if event_url else ""
+        # Normalized URL key, with the name|date|venue key as fallback
+        key = event_key_for(event)
+        normalized_url = key.url_key
+        name_key = key.event_key
 
-        # Create name|date|venue key as fallback
-        name_key = create_event_key(
-            event['event_name'],
-            event['event_date'],
-            event['venue_name']
-        )
+        url_hash = key_hash('url', normalized_url)
+        name_hash = key_hash('name', name_key)
+
+        # Bloom filter: neither key in any sheet → new without touching the index
+        if not key_index.might_contain(url_hash) and not key_index.might_contain(name_hash):
+            bloom_new += 1
+            unchanged_new += event.get('change_status') == 'unchanged'
+            new_events.append(event)
+            continue
 
         is_duplicate = False
         duplicate_source = ""
 
         # PRIORITY 1: Check URL match if URL exists
         if normalized_url:
-            if normalized_url in public_url_keys:
+            url_sheets = key_index.sheets_for(url_hash)
+            if PUBLIC_APPROVED_SHEET in url_sheets:
                 print(f"   ⏭️  Skipping (URL in PUBLIC_APPROVED): {event['event_name']}")
                 skipped_public_approved += 1
                 url_matches += 1
                 is_duplicate = True
                 duplicate_source = "PUBLIC_APPROVED (URL)"
-            elif normalized_url in pre_url_keys:
+            elif PRE_APPROVED_SHEET in url_sheets:
                 print(f"   ⏭️  Skipping (URL in PRE_APPROVED): {event['event_name']}")
                 skipped_pre_approved += 1
                 url_matches += 1
@@ -273,13 +251,14 @@ def dedupe_events(
 
         # PRIORITY 2: Check name|date|venue match if no URL match found
         if not is_duplicate:
-            if name_key in public_name_keys:
+            name_sheets = key_index.sheets_for(name_hash)
+            if PUBLIC_APPROVED_SHEET in name_sheets:
                 print(f"   ⏭️  Skipping (name|date|venue in PUBLIC_APPROVED): {event['event_name']} on {event['event_date']}")
                 skipped_public_approved += 1
                 name_matches += 1
                 is_duplicate = True
                 duplicate_source = "PUBLIC_APPROVED (name|date|venue)"
-            elif name_key in pre_name_keys:
+            elif PRE_APPROVED_SHEET in name_sheets:
                 print(f"   ⏭️  Skipping (name|date|venue in PRE_APPROVED): {event['event_name']} on {event['event_date']}")
                 skipped_pre_approved += 1
                 name_matches += 1
@@ -288,6 +267,7 @@ def dedupe_events(
 
         # If not a duplicate, this is a new event
         if not is_duplicate:
+            unchanged_new += event.get('change_status') == 'unchanged'
             new_events.append(event)
 
     stats = {
@@ -296,8 +276,12 @@ def dedupe_events(
         'skipped_public_approved': skipped_public_approved,
         'skipped_pre_approved': skipped_pre_approved,
         'skipped_no_date': skipped_no_date,
+        'unchanged_new': unchanged_new,
         'url_matches': url_matches,
-        'name_matches': name_matches
+        'name_matches': name_matches,
+        'bloom_definitely_new': bloom_new,
+        'index_rows_added': sum(st['added'] for st in index_stats.values()),
+        'index_rows_removed': sum(st['removed'] for st in index_stats.values())
     }
 
     print(f"\n✅ De-dupe complete:")
@@ -306,8 +290,12 @@ def dedupe_events(
     print(f"   Skipped (in PUBLIC_APPROVED): {stats['skipped_public_approved']}")
     print(f"   Skipped (in PRE_APPROVED): {stats['skipped_pre_approved']}")
     print(f"   Match method: {url_matches} by URL, {name_matches} by name|date|venue")
+    print(f"   Settled by Bloom filter (definitely new): {bloom_new}")
     if stats['skipped_no_date'] > 0:
         print(f"   Skipped (no date): {stats['skipped_no_date']}")
+    if stats['unchanged_new'] > 0:
+        print(f"   New despite an unchanged card (not in either sheet yet): {stats['unchanged_new']}")
+    progress('dedupe', **stats)
 
     return new_events, stats
 
@@ -354,7 +342,7 @@ def parse_event_datetime(date_str: str, time_str: str = "") -> Optional[datetime
         return None
 
     # Normalize date to YYYY-MM-DD
-    normalized_date = normalize_date(date_str)
+    normalized_date = canonical_date(date_str)
 
     # Parse date
     try:
@@ -444,7 +432,8 @@ def is_event_outdated(row: List[str], headers: List[str]) -> bool:
 
 
 def prune_pre_approved_events(
-    pre_approved_data: List[List[str]]
+    pre_approved_data: List[List[str]],
+    progress=noop_progress
 ) -> Tuple[List[List[str]], int]:
     """
     Delete outdated O2-sourced events from PRE_APPROVED EVENTS
@@ -480,12 +469,14 @@ def prune_pre_approved_events(
             print(f"   {i}. {name}")
         if deleted_count > len(deleted_samples):
             print(f"   ... and {deleted_count - len(deleted_samples)} more")
+    progress('rows_pruned', sheet='PRE_APPROVED', deleted=deleted_count, kept=len(cleaned_rows) - 1)
 
     return cleaned_rows, deleted_count
 
 
 def prune_public_approved_events(
-    public_approved_data: List[List[str]]
+    public_approved_data: List[List[str]],
+    progress=noop_progress
 ) -> Tuple[List[List[str]], int]:
     """
     Delete ALL outdated events from PUBLIC_APPROVED (regardless of source)
@@ -526,6 +517,7 @@ def prune_public_approved_events(
             print(f"   {i}. {name}")
         if deleted_count > len(deleted_samples):
             print(f"   ... and {deleted_count - len(deleted_samples)} more")
+    progress('rows_pruned', sheet='PUBLIC_APPROVED', deleted=deleted_count, kept=len(cleaned_rows) - 1)
 
     return cleaned_rows, deleted_count
 
@@ -561,46 +553,49 @@ def format_events_for_sheet(events: List[Dict]) -> List[List[str]]:
     return rows
 
 
-def main():
-    """Main orchestration with pruning"""
-    print("=" * 70)
-    print("🔄 O2 EVENTS → GOOGLE SHEETS COMPLETE SYNC + PRUNE")
-    print("=" * 70)
-
+def run_sync(base_dir: str = '.', progress=noop_progress) -> Dict:
+    """
+    Run de-dupe + prune against the JSON dumps in base_dir
+    Writes sync-output.json to base_dir and returns the same output dict
+    Raises FileNotFoundError if o2-events-all.json is missing
+    """
     # Load scraped events from JSON
-    try:
-        with open('o2-events-all.json', 'r') as f:
-            scraped_events = json.load(f)
-        print(f"\n✅ Loaded {len(scraped_events)} scraped events")
-    except FileNotFoundError:
-        print("❌ Error: o2-events-all.json not found")
-        sys.exit(1)
+    with open(os.path.join(base_dir, 'o2-events-all.json'), 'r') as f:
+        scraped_events = json.load(f)
+    print(f"\n✅ Loaded {len(scraped_events)} scraped events")
 
     # Load existing sheet data from JSON files (passed from Claude Code)
+    # The raw bytes are fingerprinted so an unchanged dump skips the key index update
+    fingerprints = {}
     try:
-        with open('public-approved-data.json', 'r') as f:
-            public_approved_data = json.load(f)
+        with open(os.path.join(base_dir, 'public-approved-data.json'), 'rb') as f:
+            raw = f.read()
+        public_approved_data = json.loads(raw)
+        fingerprints['PUBLIC_APPROVED'] = dump_fingerprint(raw)
         print(f"✅ Loaded PUBLIC_APPROVED sheet data")
     except FileNotFoundError:
         print("⚠️  Warning: public-approved-data.json not found, using empty data")
         public_approved_data = [[]]
 
     try:
-        with open('pre-approved-data.json', 'r') as f:
-            pre_approved_data = json.load(f)
+        with open(os.path.join(base_dir, 'pre-approved-data.json'), 'rb') as f:
+            raw = f.read()
+        pre_approved_data = json.loads(raw)
+        fingerprints['PRE_APPROVED'] = dump_fingerprint(raw)
         print(f"✅ Loaded PRE_APPROVED EVENTS sheet data")
     except FileNotFoundError:
         print("⚠️  Warning: pre-approved-data.json not found, using empty data")
         pre_approved_data = [[]]
 
     # STEP 1: De-duplicate scraped events
-    new_events, dedupe_stats = dedupe_events(scraped_events, public_approved_data, pre_approved_data)
+    new_events, dedupe_stats = dedupe_events(scraped_events, public_approved_data, pre_approved_data, progress,
+                                             os.path.join(base_dir, KEY_INDEX_FILE), fingerprints)
 
     # STEP 2: Delete outdated O2 events from PRE_APPROVED EVENTS
-    cleaned_pre_approved, deleted_pre_count = prune_pre_approved_events(pre_approved_data)
+    cleaned_pre_approved, deleted_pre_count = prune_pre_approved_events(pre_approved_data, progress)
 
     # STEP 3: Delete ALL outdated events from PUBLIC_APPROVED
-    cleaned_public_approved, deleted_pub_count = prune_public_approved_events(public_approved_data)
+    cleaned_public_approved, deleted_pub_count = prune_public_approved_events(public_approved_data, progress)
 
     # Format new events for sheets
     rows = format_events_for_sheet(new_events) if new_events else []
@@ -638,9 +633,26 @@ def main():
         'cleaned_public_approved': cleaned_public_approved
     }
 
-    with open('sync-output.json', 'w') as f:
+    with open(os.path.join(base_dir, 'sync-output.json'), 'w') as f:
         json.dump(output, f, indent=2)
 
+    progress('sync_output_written', new_rows=len(rows))
+
+    return output
+
+
+def main():
+    """Main orchestration with pruning"""
+    print("=" * 70)
+    print("🔄 O2 EVENTS → GOOGLE SHEETS COMPLETE SYNC + PRUNE")
+    print("=" * 70)
+
+    try:
+        run_sync()
+    except FileNotFoundError:
+        print("❌ Error: o2-events-all.json not found")
+        sys.exit(1)
+
     print(f"\n💾 Output saved to sync-output.json")
     print(f"   Ready to write to Google Sheets")
     print(f"   Spreadsheet ID: {SPREADSHEET_ID}")
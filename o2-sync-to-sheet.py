@@ -9,6 +9,8 @@ import sys
 from datetime import datetime
 from typing import List, Dict, Set, Tuple
 
+from pipeline.event_keys import event_key, event_key_for
+
 # Check for Google Sheets MCP
 try:
     # This will be called via subprocess, so we'll use the MCP tools via CLI
@@ -20,63 +22,6 @@ except:
 SPREADSHEET_ID = "1JyyEYBc9iliYw7q4lbNqcLEOHwZV64WUYwce87JaBk8"
 
 
-def normalize_date(date_str: str) -> str:
-    """
-    Normalize date to YYYY-MM-DD format for comparison
-    Handles: "06.12.25", "2025-12-06", "06/12/25", etc.
-    """
-    if not date_str:
-        return ""
-
-    # Already in YYYY-MM-DD format
-    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
-        return date_str
-
-    # Try DD.MM.YY format (from CURATED sheet)
-    if '.' in date_str:
-        parts = date_str.split('.')
-        if len(parts) == 3:
-            day, month, year = parts
-            # Handle 2-digit year
-            if len(year) == 2:
-                year = '20' + year
-            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-
-    # Try DD/MM/YY format
-    if '/' in date_str:
-        parts = date_str.split('/')
-        if len(parts) == 3:
-            day, month, year = parts
-            if len(year) == 2:
-                year = '20' + year
-            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-
-    return date_str
-
-
-def normalize_venue(venue_str: str) -> str:
-    """Normalize venue names for comparison"""
-    if not venue_str:
-        return ""
-
-    venue = venue_str.lower().strip()
-
-    # Remove common suffixes
-    venue = venue.replace(', london', '').replace(' london', '')
-    venue = venue.replace('the o2 arena', 'the o2').replace('o2 arena', 'the o2')
-
-    return venue
-
-
-def create_event_key(event_name: str, event_date: str, venue_name: str) -> str:
-    """Create a unique key for event matching"""
-    name = event_name.lower().strip()
-    date = normalize_date(event_date)
-    venue = normalize_venue(venue_name)
-
-    return f"{name}|{date}|{venue}"
-
-
 def load_scraped_events(json_file: str = "o2-events-all.json") -> List[Dict]:
     """Load events from the scraper output JSON"""
     try:
@@ -114,7 +59,7 @@ def get_existing_events_from_curated() -> Set[str]:
     ]
 
     for event in curated_o2_events:
-        key = create_event_key(event['name'], event['date'], event['venue'])
+        key = event_key(event['name'], event['date'], event['venue']).event_key
         existing_keys.add(key)
 
     print(f"   Found {len(existing_keys)} O2 events in CURATED")
@@ -157,7 +102,7 @@ def dedupe_events(scraped_events: List[Dict]) -> Tuple[List[Dict], int, int]:
             continue
 
         # Create key for this event
-        key = create_event_key(event['event_name'], event['event_date'], event['venue_name'])
+        key = event_key_for(event).event_key
 
         # Also check by URL if present
         url = event.get('event_url', '')
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Warm Playwright Browser Pool
+Long-lived Chromium instances owned by the O2 Sync API process
+
+Playwright objects are bound to the event loop that created them, so the
+pool runs its own loop on a background thread. Callers on any thread submit
+coroutines with run(); scraper code leases pages with `async with pool.page()`.
+
+Policy:
+- Every lease gets a fresh browser context (cookies/storage never leak)
+- A browser is retired after MAX_AGE_SECONDS or MAX_PAGES_PER_BROWSER leases
+- A browser that disconnects or fails its health check is replaced; health
+  checks probe idle browsers only and never retire one with active leases
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+# Check if playwright is available
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+# Pool defaults
+MAX_BROWSERS = 2
+MAX_AGE_SECONDS = 30 * 60
+MAX_PAGES_PER_BROWSER = 200
+HEALTH_CHECK_TIMEOUT_MS = 5000
+
+
+class PooledBrowser:
+    """A launched browser plus the bookkeeping the recycling policy needs"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.launched_at = time.monotonic()
+        self.pages_served = 0
+        self.active_leases = 0
+        self.failed_health_check = False  # Retired once its leases end
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.launched_at
+
+    def is_expired(self, max_age_seconds: float, max_pages: int) -> bool:
+        return self.age_seconds >= max_age_seconds or self.pages_served >= max_pages
+
+    def is_connected(self) -> bool:
+        try:
+            return self.browser.is_connected()
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """Health-checked, self-recycling pool of headless Chromium browsers"""
+
+    def __init__(
+        self,
+        max_browsers: int = MAX_BROWSERS,
+        max_age_seconds: float = MAX_AGE_SECONDS,
+        max_pages_per_browser: int = MAX_PAGES_PER_BROWSER,
+        launch_options: Optional[Dict] = None
+    ):
+        self.max_browsers = max_browsers
+        self.max_age_seconds = max_age_seconds
+        self.max_pages_per_browser = max_pages_per_browser
+        self.launch_options = launch_options or {'headless': True}
+
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._browsers: List[PooledBrowser] = []
+        self._lease_slots = None
+        self._browsers_lock = None
+
+        self.stats = {
+            'launches': 0,
+            'retired_expired': 0,
+            'retired_unhealthy': 0,
+            'leases': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Loop thread
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self):
+        """Start the pool's event loop thread on first use"""
+        with self._start_lock:
+            if self._loop and self._loop.is_running():
+                return
+
+            if not PLAYWRIGHT_AVAILABLE:
+                raise ImportError("Playwright is required for the browser pool")
+
+            ready = threading.Event()
+
+            def run_loop():
+                self._loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self._loop)
+                self._lease_slots = asyncio.Semaphore(self.max_browsers)
+                self._browsers_lock = asyncio.Lock()
+                ready.set()
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run_loop, name='browser-pool', daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the pool's loop from any thread and return its result
+
+        Example:
+            events = pool.run(scraper.scrape_all_events())
+        """
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result(timeout)
+
+    # ------------------------------------------------------------------
+    # Browser lifecycle (pool loop only)
+    # ------------------------------------------------------------------
+
+    async def _launch(self) -> PooledBrowser:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        browser = await self._playwright.chromium.launch(**self.launch_options)
+        self.stats['launches'] += 1
+        print(f"🌐 Browser pool: launched Chromium ({len(self._browsers) + 1}/{self.max_browsers})")
+        return PooledBrowser(browser)
+
+    async def _retire(self, pooled: PooledBrowser, reason: str):
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        self.stats[f'retired_{reason}'] += 1
+        try:
+            await pooled.browser.close()
+        except Exception:
+            pass
+
+    async def _checkout(self) -> PooledBrowser:
+        """Pick a healthy, unexpired browser (launching one if needed)"""
+        async with self._browsers_lock:
+            for pooled in list(self._browsers):
+                if not pooled.is_connected():
+                    await self._retire(pooled, 'unhealthy')
+                elif pooled.failed_health_check and pooled.active_leases == 0:
+                    await self._retire(pooled, 'unhealthy')
+                elif pooled.is_expired(self.max_age_seconds, self.max_pages_per_browser) and pooled.active_leases == 0:
+                    await self._retire(pooled, 'expired')
+
+            candidates = [
+                b for b in self._browsers
+                if not b.is_expired(self.max_age_seconds, self.max_pages_per_browser) and not b.failed_health_check
+            ]
+            idle = [b for b in candidates if b.active_leases == 0]
+            # Grow the pool while every candidate is busy and there is room
+            if idle or (candidates and len(self._browsers) >= self.max_browsers):
+                pooled = min(idle or candidates, key=lambda b: b.active_leases)
+            else:
+                pooled = await self._launch()
+                self._browsers.append(pooled)
+
+            pooled.active_leases += 1
+            pooled.pages_served += 1
+            self.stats['leases'] += 1
+            return pooled
+
+    async def _checkin(self, pooled: PooledBrowser):
+        async with self._browsers_lock:
+            pooled.active_leases -= 1
+            if pooled.active_leases == 0 and pooled.failed_health_check:
+                await self._retire(pooled, 'unhealthy')
+            elif pooled.active_leases == 0 and pooled.is_expired(self.max_age_seconds, self.max_pages_per_browser):
+                await self._retire(pooled, 'expired')
+
+    @asynccontextmanager
+    async def page(self, **context_options):
+        """
+        Lease a page in a fresh browser context (must be used on the pool's loop)
+
+        Example:
+            async with pool.page() as page:
+                await page.goto(url)
+        """
+        async with self._lease_slots:
+            pooled = await self._checkout()
+            context = None
+            try:
+                context = await pooled.browser.new_context(**context_options)
+                page = await context.new_page()
+                yield page
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+                await self._checkin(pooled)
+
+    async def _probe(self, pooled: PooledBrowser) -> bool:
+        """Open a blank page in a fresh context; False if anything fails"""
+        context = None
+        try:
+            context = await pooled.browser.new_context()
+            page = await context.new_page()
+            await page.set_content('<p>ok</p>', timeout=HEALTH_CHECK_TIMEOUT_MS)
+            return True
+        except Exception:
+            return False
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+
+    async def _health_check(self) -> Dict:
+        # Busy browsers are skipped: a slow answer mid-scrape is not a failure
+        async with self._browsers_lock:
+            idle = [b for b in self._browsers if b.active_leases == 0]
+            busy = len(self._browsers) - len(idle)
+
+        # Probed outside the lock so checkouts are not held up by slow browsers
+        results = [(pooled, await self._probe(pooled)) for pooled in idle]
+
+        healthy = 0
+        async with self._browsers_lock:
+            for pooled, passed in results:
+                if passed:
+                    healthy += 1
+                elif pooled in self._browsers:
+                    # Leased while being probed → retired when its leases end
+                    if pooled.active_leases == 0:
+                        await self._retire(pooled, 'unhealthy')
+                    else:
+                        pooled.failed_health_check = True
+        return {'healthy_browsers': healthy, 'busy_browsers': busy}
+
+    async def _close(self):
+        async with self._browsers_lock:
+            for pooled in list(self._browsers):
+                await self._retire(pooled, 'expired')
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    # ------------------------------------------------------------------
+    # Thread-safe public API
+    # ------------------------------------------------------------------
+
+    def health_check(self) -> Dict:
+        """Open a blank page in every idle pooled browser; replace any that fail"""
+        if not (self._loop and self._loop.is_running()):
+            return {'healthy_browsers': 0, 'busy_browsers': 0}
+        return self.run(self._health_check(), timeout=30)
+
+    def snapshot(self) -> Dict:
+        """Pool state for status endpoints"""
+        return {
+            'running': bool(self._loop and self._loop.is_running()),
+            'browsers': [
+                {
+                    'age_seconds': round(b.age_seconds, 1),
+                    'pages_served': b.pages_served,
+                    'active_leases': b.active_leases
+                }
+                for b in self._browsers
+            ],
+            'max_browsers': self.max_browsers,
+            'max_age_seconds': self.max_age_seconds,
+            'max_pages_per_browser': self.max_pages_per_browser,
+            **self.stats
+        }
+
+    def close(self):
+        """Close every browser and stop the loop thread"""
+        if not (self._loop and self._loop.is_running()):
+            return
+        try:
+            self.run(self._close(), timeout=30)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
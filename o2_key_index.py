@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Persistent Dedupe Key Index
+On-disk, memory-mapped index of the URL and name|date|venue keys of every
+sheet row, used by o2-sync-complete.py so de-dupe doesn't re-normalize the
+full PUBLIC_APPROVED / PRE_APPROVED dumps on every run
+
+Keys are 64-bit hashes. The index knows nothing about normalization: callers
+hash their own normalized keys with key_hash(kind, key).
+
+File layout (little-endian, keys and rows sorted for binary search/merging):
+    header   magic, format, key_version, bloom_hashes, n_sheets, bloom_bytes, n_keys, n_rows
+    sheets   (sheet u32, reserved u32, fingerprint u64)     dump fingerprint per sheet
+    keys     (key_hash u64, sheet u32, count u32)           sorted by (key_hash, sheet)
+    rows     (digest u64, sheet u32, count u32, url u64, name u64)   sorted by digest
+    bloom    Bloom filter over every key hash with count > 0
+
+Updates are incremental. A sheet whose dump fingerprint (hash of the dump
+file bytes) is unchanged is skipped without reading a row. Otherwise
+sync_sheet() digests each row's raw cells, merges
+the sorted digests against the stored rows section and only normalizes rows
+whose digest is new. Rows that disappeared (pruned) decrement their keys.
+Only the Bloom filter and pending changes are held in memory; the keys and
+rows sections are read through the memory map and rewritten by streaming
+merges on save(). The Bloom filter answers "definitely new" before any
+binary search.
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+INDEX_MAGIC = b'O2KI'
+INDEX_FORMAT = 1
+
+_HEADER = struct.Struct('<4sIIIIQQQ')
+_SHEET = struct.Struct('<IIQ')
+_KEY = struct.Struct('<QII')
+_ROW = struct.Struct('<QIIQQ')
+
+# ~0.8% false positives at 10 bits per key with 7 hash functions
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7
+BLOOM_MIN_BYTES = 1024
+
+# Records unpacked per read when streaming a section
+_CHUNK_RECORDS = 4096
+
+
+def key_hash(kind: str, key: str) -> int:
+    """
+    64-bit hash of a normalized key (0 is reserved for "no key")
+
+    Example:
+        key_hash('url', 'theo2.co.uk/events/detail/coldplay')
+    """
+    if not key:
+        return 0
+    digest = hashlib.blake2b(f"{kind}\x1f{key}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+def row_digest(sheet_id: int, cells: Iterable[str]) -> int:
+    """64-bit digest of a row's raw key cells (no normalization)"""
+    raw = '\x1f'.join(map(str, cells)).encode('utf-8')
+    digest = hashlib.blake2b(raw, digest_size=8, person=b'sheet%d' % sheet_id).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def dump_fingerprint(data: bytes) -> int:
+    """64-bit fingerprint of a sheet dump's raw bytes"""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little') or 1
+
+
+def _bloom_positions(h: int, n_bits: int, n_hashes: int) -> Iterator[int]:
+    """Kirsch-Mitzenmacher double hashing from one 64-bit key hash"""
+    h1 = h & 0xFFFFFFFF
+    h2 = (h >> 32) | 1
+    for i in range(n_hashes):
+        yield (h1 + i * h2) % n_bits
+
+
+class KeyIndex:
+    """
+    Row-digest → key-hash index with per-sheet reference counts
+
+    Example:
+        index = KeyIndex('o2-key-index.bin', key_version=1)
+        index.sync_sheet(PUBLIC, rows, cells_fn, keys_fn)
+        if index.might_contain(h) and PUBLIC in index.sheets_for(h): ...
+        index.save()
+    """
+
+    def __init__(self, path: str, key_version: int = 1):
+        self.path = path
+        self.key_version = key_version
+        self._file = None
+        self._map = None
+        self.n_keys = 0
+        self.n_rows = 0
+        self.bloom_hashes = BLOOM_HASHES
+        self.bloom = bytearray(BLOOM_MIN_BYTES)
+        self.fingerprints: Dict[int, int] = {}  # sheet → fingerprint of the dump last synced
+        self._keys_offset = 0
+        self._rows_offset = 0
+        # Pending changes since load: key_hash → {sheet: count delta}, digest → row record
+        self._key_deltas: Dict[int, Counter] = {}
+        self._row_changes: Dict[int, Optional[Tuple[int, int, int, int]]] = {}
+        self._pending_hashes: Set[int] = set()  # Key hashes gained since load (not in the Bloom yet)
+        self._synced_sheets: Set[int] = set()
+        self.dirty = False
+        self.load()
+
+    # --- Loading ----------------------------------------------------------
+
+    def load(self):
+        """Map the index file (missing, corrupt or other key_version → empty index)"""
+        self.close()
+        try:
+            self._file = open(self.path, 'rb')
+            if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+                raise ValueError('truncated')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, fmt, key_version, bloom_hashes, n_sheets, bloom_bytes, n_keys, n_rows = \
+                _HEADER.unpack_from(self._map, 0)
+            expected = (_HEADER.size + n_sheets * _SHEET.size + n_keys * _KEY.size + n_rows * _ROW.size
+                        + bloom_bytes)
+            if magic != INDEX_MAGIC or fmt != INDEX_FORMAT or key_version != self.key_version \
+                    or len(self._map) != expected:
+                raise ValueError('stale or corrupt index')
+        except (FileNotFoundError, ValueError):
+            self.close()
+            self.dirty = True
+            return
+
+        self.n_keys = n_keys
+        self.n_rows = n_rows
+        self.fingerprints = {
+            sheet: fingerprint
+            for sheet, _, fingerprint in _SHEET.iter_unpack(self._map[_HEADER.size:_HEADER.size + n_sheets * _SHEET.size])
+        }
+        self._keys_offset = _HEADER.size + n_sheets * _SHEET.size
+        self._rows_offset = self._keys_offset + n_keys * _KEY.size
+        bloom_offset = self._rows_offset + n_rows * _ROW.size
+        self.bloom_hashes = bloom_hashes
+        self.bloom = bytearray(self._map[bloom_offset:bloom_offset + bloom_bytes])
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = None
+        self._file = None
+        self.n_keys = 0
+        self.n_rows = 0
+        self.fingerprints = {}
+        self.bloom = bytearray(BLOOM_MIN_BYTES)
+
+    # --- Stored sections (memory-mapped) --------------------------------------
+
+    def _stored_key(self, i: int) -> Tuple[int, int, int]:
+        return _KEY.unpack_from(self._map, self._keys_offset + i * _KEY.size)
+
+    def _iter_section(self, record: struct.Struct, offset: int, count: int) -> Iterator[tuple]:
+        """Stream records from the map in bounded chunks"""
+        if self._map is None:
+            return
+        end = offset + count * record.size
+        step = _CHUNK_RECORDS * record.size
+        for start in range(offset, end, step):
+            yield from record.iter_unpack(self._map[start:min(start + step, end)])
+
+    def _iter_stored_keys(self) -> Iterator[Tuple[int, int, int]]:
+        return self._iter_section(_KEY, self._keys_offset, self.n_keys)
+
+    def _iter_stored_rows(self) -> Iterator[Tuple[int, int, int, int, int]]:
+        return self._iter_section(_ROW, self._rows_offset, self.n_rows)
+
+    def _stored_sheets(self, h: int) -> Dict[int, int]:
+        """{sheet: count} for a key hash, by binary search over the keys section"""
+        lo, hi = 0, self.n_keys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._stored_key(mid)[0] < h:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = {}
+        while lo < self.n_keys:
+            key, sheet, count = self._stored_key(lo)
+            if key != h:
+                break
+            found[sheet] = count
+            lo += 1
+        return found
+
+    # --- Lookups --------------------------------------------------------------
+
+    def might_contain(self, h: int) -> bool:
+        """False means the key is definitely in no sheet (Bloom filter, no binary search)"""
+        if not h:
+            return False
+        if h in self._pending_hashes:
+            return True
+        n_bits = len(self.bloom) * 8
+        return all(self.bloom[p >> 3] & (1 << (p & 7)) for p in _bloom_positions(h, n_bits, self.bloom_hashes))
+
+    def sheets_for(self, h: int) -> Set[int]:
+        """Sheets with at least one row carrying this key hash"""
+        if not h:
+            return set()
+        counts = self._stored_sheets(h)
+        for sheet, delta in self._key_deltas.get(h, {}).items():
+            counts[sheet] = counts.get(sheet, 0) + delta
+        return {sheet for sheet, count in counts.items() if count > 0}
+
+    # --- Incremental updates ----------------------------------------------------
+
+    def sync_sheet(self, sheet_id: int, rows: List[list],
+                   cells_fn: Callable[[list], Tuple], keys_fn: Callable[[list], Tuple[int, int]],
+                   fingerprint: int = 0) -> Dict[str, int]:
+        """
+        Bring one sheet's rows in line with the current dump
+
+        Args:
+            sheet_id: Small integer identifying the sheet
+            rows: Data rows (no header)
+            cells_fn: row → raw cells that determine its keys (digested, never normalized)
+            keys_fn: row → (url key hash, name key hash), called only for new digests
+            fingerprint: Hash of the whole dump (e.g. dump_fingerprint of the
+                file bytes); equal to the last sync's → nothing to do
+
+        Returns:
+            Stats: rows, added, removed, unchanged (row digests), skipped
+        """
+        if fingerprint and self.fingerprints.get(sheet_id) == fingerprint and sheet_id not in self._synced_sheets:
+            self._synced_sheets.add(sheet_id)
+            return {'rows': len(rows), 'added': 0, 'removed': 0, 'unchanged': len(rows), 'skipped': True}
+
+        # Merging assumes the stored rows are current: a second sync of a sheet saves first
+        if sheet_id in self._synced_sheets:
+            self.save()
+        self._synced_sheets.add(sheet_id)
+
+        current = Counter()
+        samples = {}
+        for row in rows:
+            digest = row_digest(sheet_id, cells_fn(row))
+            current[digest] += 1
+            samples.setdefault(digest, row)
+
+        stats = {'rows': len(rows), 'added': 0, 'removed': 0, 'unchanged': 0, 'skipped': False}
+
+        # Sorted merge of the current digests with this sheet's stored rows
+        stored = (r for r in self._iter_stored_rows() if r[1] == sheet_id)
+        previous = next(stored, None)
+        for digest, count in sorted(current.items()):
+            while previous is not None and previous[0] < digest:
+                self._remove_row(previous, stats)
+                previous = next(stored, None)
+
+            if previous is not None and previous[0] == digest:
+                _, _, old_count, url_h, name_h = previous
+                previous = next(stored, None)
+            else:
+                old_count = 0
+                url_h, name_h = keys_fn(samples[digest])
+
+            stats['unchanged'] += min(count, old_count)
+            if count == old_count:
+                continue
+            delta = count - old_count
+            stats['added' if delta > 0 else 'removed'] += abs(delta)
+            self._apply(sheet_id, url_h, name_h, delta)
+            self._row_changes[digest] = (sheet_id, count, url_h, name_h)
+
+        while previous is not None:
+            self._remove_row(previous, stats)
+            previous = next(stored, None)
+
+        if stats['added'] or stats['removed'] or self.fingerprints.get(sheet_id) != fingerprint:
+            self.dirty = True
+        self.fingerprints[sheet_id] = fingerprint
+        return stats
+
+    def _remove_row(self, stored_row: Tuple[int, int, int, int, int], stats: Dict[str, int]):
+        digest, sheet_id, old_count, url_h, name_h = stored_row
+        stats['removed'] += old_count
+        self._apply(sheet_id, url_h, name_h, -old_count)
+        self._row_changes[digest] = None
+
+    def _apply(self, sheet_id: int, url_h: int, name_h: int, delta: int):
+        for h in (url_h, name_h):
+            if h:
+                self._key_deltas.setdefault(h, Counter())[sheet_id] += delta
+                if delta > 0:
+                    self._pending_hashes.add(h)
+
+    # --- Saving -------------------------------------------------------------------
+
+    def save(self):
+        """Stream-merge pending changes into a new file (atomic rename) and re-map it"""
+        if not self.dirty:
+            return
+
+        pending_keys = sorted(
+            (h, sheet, d) for h, deltas in self._key_deltas.items() for sheet, d in deltas.items() if d
+        )
+        pending_rows = sorted((d, *r) for d, r in self._row_changes.items() if r is not None)
+
+        # Upper bound on keys after the merge sizes the Bloom filter
+        max_keys = self.n_keys + sum(1 for _, _, d in pending_keys if d > 0)
+        bloom_bytes = max(BLOOM_MIN_BYTES, (max_keys * BLOOM_BITS_PER_KEY + 7) // 8)
+        bloom = bytearray(bloom_bytes)
+        n_bits = bloom_bytes * 8
+
+        n_keys = n_rows = 0
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(bytes(_HEADER.size))
+            fingerprints = dict(self.fingerprints)
+            for sheet in sorted(fingerprints):
+                f.write(_SHEET.pack(sheet, 0, fingerprints[sheet]))
+
+            for key in _merge_counts(self._iter_stored_keys(), pending_keys):
+                f.write(_KEY.pack(*key))
+                for p in _bloom_positions(key[0], n_bits, BLOOM_HASHES):
+                    bloom[p >> 3] |= 1 << (p & 7)
+                n_keys += 1
+
+            kept_rows = (r for r in self._iter_stored_rows() if r[0] not in self._row_changes)
+            for row in heapq.merge(kept_rows, pending_rows):
+                f.write(_ROW.pack(*row))
+                n_rows += 1
+
+            f.write(bloom)
+            f.seek(0)
+            f.write(_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT, self.key_version, BLOOM_HASHES,
+                                 len(fingerprints), bloom_bytes, n_keys, n_rows))
+
+        self.close()
+        os.replace(tmp_path, self.path)
+        self._key_deltas.clear()
+        self._row_changes.clear()
+        self._pending_hashes.clear()
+        self._synced_sheets.clear()
+        self.dirty = False
+        self.load()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'keys': self.n_keys,
+            'rows': self.n_rows,
+            'bloom_bytes': len(self.bloom),
+            'file_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        }
+
+
+def _merge_counts(stored: Iterator[Tuple[int, int, int]],
+                  pending: List[Tuple[int, int, int]]) -> Iterator[Tuple[int, int, int]]:
+    """Merge sorted (hash, sheet, count) with sorted (hash, sheet, delta); drop counts ≤ 0"""
+    pending = iter(pending)
+    p = next(pending, None)
+    for key, sheet, count in stored:
+        while p is not None and (p[0], p[1]) < (key, sheet):
+            if p[2] > 0:
+                yield p
+            p = next(pending, None)
+        if p is not None and (p[0], p[1]) == (key, sheet):
+            count += p[2]
+            p = next(pending, None)
+        if count > 0:
+            yield key, sheet, count
+    while p is not None:
+        if p[2] > 0:
+            yield p
+        p = next(pending, None)
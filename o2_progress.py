@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+O2 Sync Progress Events
+Structured phase events published by the scraper and sync code paths,
+fanned out to Server-Sent Events subscribers in o2-sync-api.py
+"""
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Phases after which a run is finished and streams can close
+TERMINAL_PHASES = ('complete', 'failed')
+
+# Signature shared by every progress hook: progress(phase, **data)
+ProgressCallback = Callable[..., None]
+
+
+def noop_progress(phase: str, **data) -> None:
+    """Default progress hook when nothing is listening"""
+    return None
+
+
+class ProgressBroker:
+    """
+    Thread-safe fan-out of progress events for the current sync run
+
+    Events from the current run are kept in memory so a subscriber that
+    connects mid-run replays everything it missed before going live.
+    """
+
+    def __init__(self, max_history: int = 500):
+        self.max_history = max_history
+        self._lock = threading.Lock()
+        self._subscribers: List[queue.Queue] = []
+        self._history: List[Dict] = []
+        self._seq = 0
+        self._run_id = None
+        self._run_started = 0.0
+        self._last_event = 0.0
+        self.running = False
+
+    def start_run(self) -> Optional[str]:
+        """
+        Begin a new run (clears history)
+
+        Returns:
+            run_id, or None if a run is already in progress
+        """
+        with self._lock:
+            if self.running:
+                return None
+            self.running = True
+            self._run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+            self._run_started = time.monotonic()
+            self._last_event = self._run_started
+            self._history = []
+            self._seq = 0
+            run_id = self._run_id
+
+        self.publish('run_started', run_id=run_id)
+        return run_id
+
+    def publish(self, phase: str, **data) -> None:
+        """Publish a phase event to every subscriber (usable as a progress hook)"""
+        with self._lock:
+            now = time.monotonic()
+            self._seq += 1
+            event = {
+                'seq': self._seq,
+                'run_id': self._run_id,
+                'phase': phase,
+                'elapsed': round(now - self._run_started, 2) if self._run_started else 0.0,
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'data': data
+            }
+            self._last_event = now
+            self._history.append(event)
+            if len(self._history) > self.max_history:
+                # Always keep run_started so late subscribers see the run_id
+                self._history = self._history[:1] + self._history[-(self.max_history - 1):]
+            if phase in TERMINAL_PHASES:
+                self.running = False
+            subscribers = list(self._subscribers)
+
+        for q in subscribers:
+            q.put(event)
+
+    def subscribe(self) -> queue.Queue:
+        """Register a subscriber queue pre-loaded with the current run's history"""
+        q = queue.Queue()
+        with self._lock:
+            for event in self._history:
+                q.put(event)
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        """Remove a subscriber queue"""
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def idle_seconds(self) -> float:
+        """Seconds since the last published event (stall indicator)"""
+        with self._lock:
+            if not self._last_event:
+                return 0.0
+            return round(time.monotonic() - self._last_event, 1)
+
+    def snapshot(self) -> Dict:
+        """Current run state for status endpoints"""
+        with self._lock:
+            return {
+                'run_id': self._run_id,
+                'running': self.running,
+                'events': len(self._history),
+                'last_phase': self._history[-1]['phase'] if self._history else None
+            }
+
+
+def format_sse(event_name: str, payload: Dict, event_id: Optional[int] = None) -> str:
+    """
+    Format a payload as a Server-Sent Events message
+
+    Example:
+        format_sse('load_more', {'click': 3})
+        Returns: 'event: load_more\\ndata: {"click": 3}\\n\\n'
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_name}")
+    lines.append(f"data: {json.dumps(payload)}")
+    return '\n'.join(lines) + '\n\n'
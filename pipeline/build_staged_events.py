@@ -21,10 +21,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from pipeline.config import STAGED_EVENTS_COLUMNS
-from pipeline.utils import (
-    normalize_url, normalize_event_name, normalize_venue_name,
-    generate_event_id, create_event_key
-)
+from pipeline.event_keys import event_key_for
 
 
 def extract_pre_approved_events(data: list) -> list:
@@ -131,7 +128,7 @@ def deduplicate_events(events: list) -> list:
 
     Deduplication keys:
     1. Primary: Normalized EVENT_URL (if exists)
-    2. Fallback: date|normalized_name|normalized_venue
+    2. Fallback: date|normalized_name|normalized_venue (date in YYYY-MM-DD)
 
     Args:
         events: List of event dicts
@@ -147,10 +144,10 @@ def deduplicate_events(events: list) -> list:
     event_keys = {}
 
     for event in events_sorted:
-        # Generate keys
-        url_key = normalize_url(event['event_url']) if event['event_url'] else None
-        venue_normalized = normalize_venue_name(event['venue_name'])
-        event_key = create_event_key(event['event_date'], event['event_name'], venue_normalized)
+        # Canonical keys (normalized once per distinct event)
+        key = event_key_for(event)
+        url_key = key.url_key
+        event_key = key.event_key
 
         # Check URL key first (higher priority)
         if url_key and url_key in url_keys:
@@ -205,8 +202,7 @@ def preserve_approval_status(new_events: list, existing_staged_data: list) -> li
 
     # Merge approvals into new events
     for event in new_events:
-        venue_normalized = normalize_venue_name(event['venue_name'])
-        event_id = generate_event_id(event['event_date'], event['event_name'], venue_normalized)
+        event_id = event_key_for(event).event_id
 
         if event_id in existing_approvals:
             event['_approval_data'] = existing_approvals[event_id]
@@ -238,8 +234,7 @@ def format_for_staged_events(events: list) -> list:
     rows = []
 
     for event in events:
-        venue_normalized = normalize_venue_name(event['venue_name'])
-        event_id = generate_event_id(event['event_date'], event['event_name'], venue_normalized)
+        event_id = event_key_for(event).event_id
 
         approval_data = event.get('_approval_data', {
             'approve': "FALSE",
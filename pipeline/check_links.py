@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Job 3b: Check EVENT_URL / IMAGE_URL liveness in STAGED_EVENTS
+
+Probes every distinct ticket and image URL before validation:
+- One pooled aiohttp session, LINK_CHECK_TOTAL_CONCURRENCY requests in flight,
+  at most LINK_CHECK_PER_HOST_CONCURRENCY per host (taken per redirect hop,
+  by the host that hop actually fetches)
+- HEAD first, falling back to a body-less GET for servers that reject HEAD
+- Redirects followed hop by hop so the full chain is recorded
+- Results cached per URL in LINK_CHECK_CACHE_FILE (shorter TTL for failures)
+
+Writes EVENT_URL_STATUS / IMAGE_URL_STATUS per row; Job 4 turns BROKEN and
+ERROR statuses into warnings.
+
+Status values:
+- OK                         2xx without redirects
+- REDIRECT 301 → <final url> 2xx after redirects
+- BROKEN 404                 4xx/5xx (final hop)
+- ERROR <reason>             timeout, DNS, too many redirects, ...
+
+Requires the optional `aiohttp` package; without it the status columns are
+left unchanged.
+
+A cold run is bounded by the busiest host: about
+URLs on that host / LINK_CHECK_PER_HOST_CONCURRENCY × its latency. Measure
+with local servers:
+    python3 pipeline/check_links.py --benchmark [ROWS] [LATENCY_MS]   (default 5000 100)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, Tuple
+from urllib.parse import urljoin, urlsplit
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.config import (
+    LINK_CHECK_CACHE_FILE, LINK_CHECK_TTL_HOURS, LINK_CHECK_FAILURE_TTL_HOURS,
+    LINK_CHECK_TOTAL_CONCURRENCY, LINK_CHECK_PER_HOST_CONCURRENCY, LINK_CHECK_MAX_REDIRECTS,
+    HTTP_TIMEOUT_SECONDS, HTTP_USER_AGENT
+)
+from pipeline.http_cache import JsonCache
+
+# Check if aiohttp is available
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Staged column → status column (EVENT_URL is TICKET_URL in older sheets)
+LINK_COLUMNS = {
+    ('EVENT_URL', 'TICKET_URL'): 'EVENT_URL_STATUS',
+    ('IMAGE_URL',): 'IMAGE_URL_STATUS'
+}
+
+# Servers that answer these to HEAD are retried with GET
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+
+def format_status(result: Dict) -> str:
+    """
+    Status column value for a check result
+
+    Example:
+        format_status({"status": 200, "chain": [[301, "https://a/x"], [200, "https://a/y"]]})
+        Returns: "REDIRECT 301 → https://a/y"
+    """
+    if result.get('error'):
+        return f"ERROR {result['error']}"
+
+    status = result.get('status', 0)
+    chain = result.get('chain', [])
+    if status >= 400 or status < 200:
+        return f"BROKEN {status}"
+    if len(chain) > 1:
+        return f"REDIRECT {chain[0][0]} → {chain[-1][1]}"
+    return "OK"
+
+
+def is_problem_status(value: str) -> bool:
+    """True for statuses validation should warn about"""
+    return str(value).startswith(('BROKEN', 'ERROR'))
+
+
+async def _request(session, method: str, url: str, host_limits: Dict,
+                   total_limit: asyncio.Semaphore) -> Tuple[int, str]:
+    """
+    One hop without following redirects; returns (status, Location header)
+
+    The per-host and total slots are taken for this hop only, keyed by the
+    hop's own host, so redirects to another host count against that host.
+    The host slot is taken first: waiting for a busy host must not hold one
+    of the total slots other hosts could use.
+    """
+    host = urlsplit(url).netloc.lower()
+    host_limit = host_limits.setdefault(host, asyncio.Semaphore(LINK_CHECK_PER_HOST_CONCURRENCY))
+    async with host_limit, total_limit:
+        async with session.request(method, url, allow_redirects=False) as response:
+            return response.status, response.headers.get('Location', '')
+
+
+async def _probe(session, url: str, host_limits: Dict, total_limit: asyncio.Semaphore) -> Dict:
+    """Follow redirects hop by hop, recording [status, url] per hop"""
+    chain = []
+    current = url
+    method = 'HEAD'
+
+    for _ in range(LINK_CHECK_MAX_REDIRECTS + 1):
+        status, location = await _request(session, method, current, host_limits, total_limit)
+        if method == 'HEAD' and status in HEAD_UNSUPPORTED:
+            method = 'GET'
+            status, location = await _request(session, method, current, host_limits, total_limit)
+
+        chain.append([status, current])
+        if status in (301, 302, 303, 307, 308) and location:
+            current = urljoin(current, location)
+            continue
+
+        return {'status': status, 'chain': chain}
+
+    return {'status': 0, 'chain': chain, 'error': 'too many redirects'}
+
+
+async def _check_one(session, url: str, cache: JsonCache, host_limits: Dict,
+                     total_limit: asyncio.Semaphore, stats: Dict) -> Tuple[str, Dict]:
+    """Check one URL, using the cache when fresh"""
+    fresh = cache.get_fresh(url)
+    if fresh is not None:
+        stats['cache_hits'] += 1
+        return url, fresh
+
+    try:
+        result = await _probe(session, url, host_limits, total_limit)
+    except asyncio.TimeoutError:
+        result = {'status': 0, 'chain': [], 'error': 'timeout'}
+    except Exception as e:
+        result = {'status': 0, 'chain': [], 'error': (type(e).__name__ + ' ' + str(e))[:120].strip()}
+
+    stats['checked'] += 1
+    ok = not result.get('error') and 200 <= result['status'] < 400
+    ttl_hours = LINK_CHECK_TTL_HOURS if ok else LINK_CHECK_FAILURE_TTL_HOURS
+    cache.put(url, result, ttl_hours * 3600)
+    return url, result
+
+
+async def check_links_async(urls: Iterable[str], cache: JsonCache) -> Tuple[Dict[str, Dict], Dict]:
+    """
+    Check many URLs concurrently over one pooled session
+
+    Args:
+        urls: URLs to check (duplicates checked once)
+        cache: JsonCache of previous results
+
+    Returns:
+        Tuple of ({url: result}, stats)
+    """
+    stats = {'cache_hits': 0, 'checked': 0}
+    unique_urls = sorted({u for u in urls if u and u.startswith(('http://', 'https://'))})
+    if not unique_urls:
+        return {}, stats
+
+    connector = aiohttp.TCPConnector(limit=LINK_CHECK_TOTAL_CONCURRENCY,
+                                     limit_per_host=LINK_CHECK_PER_HOST_CONCURRENCY, ttl_dns_cache=600)
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+    total_limit = asyncio.Semaphore(LINK_CHECK_TOTAL_CONCURRENCY)
+    host_limits = {}
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={'User-Agent': HTTP_USER_AGENT}) as session:
+        results = await asyncio.gather(*[
+            _check_one(session, url, cache, host_limits, total_limit, stats)
+            for url in unique_urls
+        ])
+
+    return dict(results), stats
+
+
+def check_staged_links(staged_events_data: list, cache_path: str = LINK_CHECK_CACHE_FILE) -> Tuple[list, Dict]:
+    """
+    Check every row's ticket and image URL and fill the status columns
+
+    Args:
+        staged_events_data: STAGED_EVENTS sheet data (headers + rows, updated in place)
+        cache_path: Result cache file
+
+    Returns:
+        Tuple of (rows, summary) where summary has stats, problem counts and
+        the redirect chains of problem URLs
+    """
+    if not staged_events_data or len(staged_events_data) < 2:
+        return staged_events_data, {}
+
+    if not AIOHTTP_AVAILABLE:
+        return staged_events_data, {'skipped': 'aiohttp not installed'}
+
+    headers = staged_events_data[0]
+    for status_column in LINK_COLUMNS.values():
+        if status_column not in headers:
+            headers.append(status_column)
+    col_map = {h: i for i, h in enumerate(headers)}
+
+    # (url column index, status column index) pairs present in this sheet
+    column_pairs = []
+    for url_columns, status_column in LINK_COLUMNS.items():
+        url_idx = next((col_map[c] for c in url_columns if c in col_map), -1)
+        if url_idx >= 0:
+            column_pairs.append((url_idx, col_map[status_column]))
+
+    def cell(row, idx):
+        return str(row[idx]).strip() if idx < len(row) else ""
+
+    urls = [cell(row, url_idx) for row in staged_events_data[1:] for url_idx, _ in column_pairs]
+
+    cache = JsonCache(cache_path, LINK_CHECK_TTL_HOURS * 3600)
+    start = time.perf_counter()
+    results, stats = asyncio.run(check_links_async(urls, cache))
+    stats['seconds'] = round(time.perf_counter() - start, 2)
+    cache.save()
+
+    problems = {}
+    for row in staged_events_data[1:]:
+        while len(row) < len(headers):
+            row.append("")
+        for url_idx, status_idx in column_pairs:
+            url = cell(row, url_idx)
+            if not url:
+                row[status_idx] = ""
+                continue
+            result = results.get(url)
+            row[status_idx] = format_status(result) if result else "ERROR invalid URL"
+            if is_problem_status(row[status_idx]):
+                problems[url] = {'status': row[status_idx], 'chain': result.get('chain', []) if result else []}
+
+    summary = {
+        'stats': stats,
+        'unique_urls': len(results),
+        'problem_urls': len(problems),
+        'problems': problems
+    }
+    return staged_events_data, summary
+
+
+def main():
+    """
+    Main orchestration
+
+    Expects:
+        - staged-events-data.json (from STAGED_EVENTS sheet)
+
+    Outputs:
+        - link-checked-staged-events-output.json (rows with EVENT_URL_STATUS /
+          IMAGE_URL_STATUS filled, plus a summary of broken links)
+    """
+    print("=" * 70)
+    print("🔗 JOB 3b: CHECK LINKS")
+    print("=" * 70)
+
+    try:
+        with open('staged-events-data.json', 'r') as f:
+            staged_events_data = json.load(f)
+        print("✅ Loaded STAGED_EVENTS data")
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    rows, summary = check_staged_links(staged_events_data)
+
+    print(f"\n" + "=" * 70)
+    print(f"📊 SUMMARY")
+    print(f"=" * 70)
+    if 'skipped' in summary:
+        print(f"   ⚠️  Link check skipped ({summary['skipped']})")
+    elif summary:
+        stats = summary['stats']
+        print(f"   Unique URLs: {summary['unique_urls']} "
+              f"({stats['checked']} checked, {stats['cache_hits']} cached) in {stats['seconds']}s")
+        print(f"   Broken/erroring URLs: {summary['problem_urls']}")
+        for url, problem in list(summary['problems'].items())[:10]:
+            print(f"      {problem['status']}: {url}")
+
+    with open('link-checked-staged-events-output.json', 'w') as f:
+        json.dump({'rows': rows, 'summary': summary}, f, indent=2)
+
+    print(f"\n💾 Output saved to: link-checked-staged-events-output.json")
+    print(f"   Ready to update STAGED_EVENTS sheet")
+
+
+def benchmark(row_count: int = 5000, latency_ms: int = 100):
+    """
+    Cold-cache check of a synthetic STAGED_EVENTS sheet against local servers
+
+    Ticket URLs are spread over 3 hosts (one distinct URL per row) and image
+    URLs over 2 hosts (one per 5 rows); every request waits latency_ms.
+    """
+    import tempfile
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    print("=" * 70)
+    print(f"⏱️  LINK CHECK BENCHMARK ({row_count:,} rows, {latency_ms}ms per request)")
+    print("=" * 70)
+
+    if not AIOHTTP_AVAILABLE:
+        print("   ⚠️  aiohttp not installed")
+        return
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_HEAD(self):
+            time.sleep(latency_ms / 1000)
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    servers = []
+    for _ in range(5):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(f"http://127.0.0.1:{server.server_address[1]}")
+    ticket_hosts, image_hosts = servers[:3], servers[3:]
+
+    rows = [['EVENT_URL', 'IMAGE_URL']]
+    for i in range(row_count):
+        rows.append([f"{ticket_hosts[i % 3]}/event/{i}", f"{image_hosts[i % 2]}/img/{i // 5}.jpg"])
+    unique_urls = len({url for row in rows[1:] for url in row})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        _, summary = check_staged_links(rows, os.path.join(tmp, 'cache.json'))
+        seconds = time.perf_counter() - start
+
+    busiest = -(-row_count // 3)
+    bound = busiest / LINK_CHECK_PER_HOST_CONCURRENCY * latency_ms / 1000
+    print(f"   Unique URLs:  {unique_urls:,} ({summary['stats']['checked']:,} checked)")
+    print(f"   Elapsed:      {seconds:.1f}s")
+    print(f"   Lower bound:  {bound:.1f}s ({busiest:,} URLs on the busiest host, "
+          f"{LINK_CHECK_PER_HOST_CONCURRENCY} per host)")
+
+
+if __name__ == "__main__":
+    if '--benchmark' in sys.argv:
+        args = sys.argv[sys.argv.index('--benchmark') + 1:]
+        benchmark(int(args[0]) if args else 5000, int(args[1]) if len(args) > 1 else 100)
+    else:
+        main()
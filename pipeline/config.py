@@ -40,7 +40,8 @@ STAGED_EVENTS_COLUMNS = [
     'VENUE_ID', 'VENUE_NAME', 'CITY', 'COUNTRY', 'LANGUAGE',
     'EVENT_URL', 'IMAGE_URL', 'CATEGORY_ID', 'CATEGORY_SUGGESTION',
     'VENUE_ID_OVERRIDE', 'CATEGORY_OVERRIDE', 'EVENT_URL_OVERRIDE', 'IMAGE_URL_OVERRIDE',
-    'ACCESS_STATUS', 'NOTES', 'VALIDATION_STATUS', 'APPROVE', 'INTERPRETERS'
+    'ACCESS_STATUS', 'NOTES', 'VALIDATION_STATUS', 'APPROVE', 'INTERPRETERS',
+    'EVENT_URL_STATUS', 'IMAGE_URL_STATUS'
 ]
 
 # IMPORTANT: These column names MUST match what the frontend (app.js) reads from the CSV.
@@ -53,6 +54,63 @@ READY_TO_PUBLISH_COLUMNS = [
     'IMAGE URL', 'EVENT URL', 'STATUS', 'SOURCE'
 ]
 
+# Compact JSON feed (pipeline/publish_feed.py)
+# Short key → STAGED_EVENTS column (tuple = fallbacks, first non-empty wins)
+FEED_KEYS = {
+    'i': 'EVENT_ID',
+    'd': 'EVENT_DATE',
+    't': 'EVENT_TIME',
+    'n': 'EVENT_NAME',
+    'a': 'ARTIST_NAME',
+    'v': 'VENUE_NAME',
+    'c': 'CITY',
+    'k': 'COUNTRY',
+    'l': 'LANGUAGE',
+    'g': 'CATEGORY_ID',
+    'p': 'INTERPRETERS',
+    'u': ('EVENT_URL', 'TICKET_URL'),
+    'm': 'IMAGE_URL',
+    's': 'ACCESS_STATUS',
+    'o': 'SOURCE'
+}
+
+# Short keys stored once in a shared table and referenced by index
+FEED_DICT_KEYS = ('v', 'c', 'k', 'g')
+
+# Image metadata keys added by pipeline/image_cache.py (not sheet columns)
+FEED_IMAGE_KEYS = {
+    'mt': 'IMAGE_THUMB',        # Thumbnail hash → {FEED_IMAGE_DIR}/{mt}-{width}.webp
+    'mw': 'IMAGE_WIDTH',
+    'mh': 'IMAGE_HEIGHT',
+    'mb': 'IMAGE_PLACEHOLDER'   # Tiny blurred WebP data URI
+}
+
+# Bump when the feed layout changes incompatibly
+FEED_FORMAT_VERSION = 1
+
+# Static-host directory for feed artifacts (relative to the working directory)
+FEED_OUTPUT_DIR = 'feed'
+
+# Image cache + thumbnails (pipeline/image_cache.py) - needs optional aiohttp + Pillow
+IMAGE_CACHE_DIR = 'image-cache'                 # Content-hashed originals (not served)
+IMAGE_CACHE_INDEX_FILE = 'image-cache-index.json'
+IMAGE_CACHE_TTL_HOURS = 24 * 30                 # Then revalidated with ETag/Last-Modified
+IMAGE_MAX_BYTES = 20 * 1024 * 1024
+IMAGE_THUMB_WIDTHS = (320, 640)
+IMAGE_THUMB_QUALITY = 75
+IMAGE_PLACEHOLDER_SIZE = 16                     # Max side of the blur placeholder in pixels
+FEED_IMAGE_DIR = 'img'                          # Thumbnails inside FEED_OUTPUT_DIR
+
+# Delta changelog (pipeline/feed_changelog.py)
+# State holds the last published events keyed by EVENT_ID - kept outside FEED_OUTPUT_DIR
+CHANGELOG_STATE_FILE = 'feed-changelog-state.json'
+CHANGELOG_RETAIN_VERSIONS = 48      # ~2 days of hourly exports
+CHANGELOG_SNAPSHOT_INTERVAL = 24    # Full snapshot every N versions (must be <= retained)
+
+# Search index (pipeline/search_index.py)
+SEARCH_PREFIX_MAX_LENGTH = 3        # Prefix table covers 1-3 characters; longer prefixes use the sorted terms
+SEARCH_PREFIX_TOP_TERMS = 8         # Suggestions kept per prefix (most frequent first)
+
 VENUES_COLUMNS = [
     'VENUE_ID', 'VENUE_NAME', 'VENUE_ALIASES', 'CITY', 'COUNTRY',
     'LANGUAGE', 'INTERPRETER_STATUS', 'ACCESS_EMAIL', 'ACCESS_PHONE',
@@ -77,6 +135,68 @@ MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
 
 # Fuzzy matching threshold
 VENUE_MATCH_THRESHOLD = 0.85
+# Fuzzy tier scorer (pipeline/similarity.py): 'sequence_matcher' keeps the
+# difflib ratio decisions, 'levenshtein' scores 1 - edit distance / length
+VENUE_FUZZY_SCORER = 'sequence_matcher'
+
+# Venue-resolution memo (pipeline/venue_memo.py)
+VENUE_MEMO_FILE = 'venue-resolution-memo.json'
+VENUE_MATCHER_VERSION = 1           # Bump when match_venue / typo correction change results
+VENUE_OVERRIDE_MIN_CONFIRMATIONS = 2  # Events agreeing on a VENUE_ID_OVERRIDE before it applies to the venue string
+
+# Typo correction before venue matching / category suggestion (pipeline/typo_correction.py)
+TYPO_MAX_EDIT_DISTANCE = 2          # Words under 8 characters tolerate 1
+TYPO_PREFIX_LENGTH = 7              # Deletes are indexed over this many leading characters
+TYPO_MIN_WORD_LENGTH = 4            # Shorter words ("o2", "uk") are never corrected
+TYPO_MIN_CONFIDENCE = 0.6
+TYPO_EVENT_TOKEN_MIN_COUNT = 3      # Event-name words seen this often are trusted spellings
+
+# Revision-aware Sheets read cache (pipeline/sheets_cache.py)
+SHEETS_CACHE_DIR = '.sheets-cache'
+# Job input file → SHEETS key exported by sheets_cache.py --export (monthly tabs → monthly-tabs-data.json)
+SHEETS_CACHE_EXPORTS = {
+    'pre-approved-events-data.json': 'PRE_APPROVED_EVENTS',
+    'ingest-from-monthly-data.json': 'INGEST_FROM_MONTHLY',
+    'staged-events-existing.json': 'STAGED_EVENTS',   # Job 2
+    'staged-events-data.json': 'STAGED_EVENTS',       # Jobs 3, 3b, 4, 5 (same range, fetched once)
+    'venues-data.json': 'VENUES',
+    'categories-data.json': 'EVENT_CATEGORIES',
+}
+
+# Compiled VENUES / EVENT_CATEGORIES snapshot (pipeline/reference_snapshot.py)
+REFERENCE_SNAPSHOT_FILE = 'reference-snapshot.bin'
+
+# Parallel enrichment (enrich_staged_events.enrich_rows_parallel) - needs fork()
+ENRICH_WORKERS = 0                  # Worker processes for Job 3; 0 = one per CPU
+ENRICH_PARALLEL_MIN_ROWS = 2000     # Smaller sheets are enriched in-process (fork overhead)
+ENRICH_CHUNKS_PER_WORKER = 4
+
+# Outbound HTTP (og:image resolver, link checker)
+HTTP_TOTAL_CONCURRENCY = 32
+HTTP_PER_HOST_CONCURRENCY = 4
+HTTP_TIMEOUT_SECONDS = 15
+HTTP_USER_AGENT = 'PI-Events-Pipeline/1.0 (+https://performanceinterpreting.co.uk)'
+
+# Link checker (pipeline/check_links.py) - needs the optional aiohttp package
+LINK_CHECK_CACHE_FILE = 'link-check-cache.json'
+LINK_CHECK_TTL_HOURS = 24
+LINK_CHECK_FAILURE_TTL_HOURS = 2    # Broken links are re-checked sooner
+LINK_CHECK_TOTAL_CONCURRENCY = 64   # HEAD requests are cheap; higher than HTTP_TOTAL_CONCURRENCY
+LINK_CHECK_PER_HOST_CONCURRENCY = 8
+LINK_CHECK_MAX_REDIRECTS = 10
+
+# og:image enrichment (pipeline/og_image.py) - needs the optional aiohttp package
+OG_IMAGE_ENABLED = True
+OG_IMAGE_CACHE_FILE = 'og-image-cache.json'
+OG_IMAGE_CACHE_TTL_HOURS = 24 * 7
+OG_IMAGE_MAX_HEAD_BYTES = 256 * 1024
+
+# Run checkpoints (pipeline/run_full_pipeline.py)
+PIPELINE_RUN_MANIFEST_FILE = 'pipeline-run-manifest.json'
+
+# Artist image bank (pipeline/image_bank.py)
+IMAGE_BANK_FILE = 'image-bank.json'
+PUBLISHED_EVENTS_DATA_FILE = 'published-events-data.json'  # PUBLISHED sheet export (optional)
 
 # Event categories — aligned with AutoPublish.gs CATEGORY_KEYWORDS
 # AutoPublish uses: Concert, Comedy, Theatre, Sports, Family, Festival, Cultural, Dance,
@@ -150,3 +270,8 @@ VALIDATION_COLORS = {
     'WARNING': '#fff2cc',   # Amber
     'OK': '#d9ead3'         # Green
 }
+VALIDATION_CLEAR_COLOR = '#ffffff'  # Rows without a status color
+
+# Validation formatting requests (pipeline/sheet_formatting.py)
+STAGED_EVENTS_SHEET_GID = 0         # Numeric sheetId of STAGED_EVENTS (#gid= in the sheet URL)
+VALIDATION_FORMAT_STATE_FILE = 'validation-format-state.json'  # Ranges formatted by the last run
@@ -3,30 +3,97 @@
 Job 3: Enrich STAGED_EVENTS
 
 Enriches events with:
-- Venue matching (exact → alias → fuzzy) with override support
+- Typo correction of venue and event names before matching (symmetric-delete
+  index over VENUES words and frequent event words - see typo_correction.py;
+  used for matching only, the cells are not rewritten)
+- Venue matching (exact → alias → fuzzy) with override support, memoized
+  across runs per raw venue string (venue_memo.py)
 - Derived fields (CITY, COUNTRY, LANGUAGE) - always recomputed from VENUE_ID
 - Ticket URL enrichment with override support
-- Image URL enrichment with override support
+- Image URL enrichment with override support (same artist at the same venue
+  from the image bank, then og:image from ticket pages resolved concurrently
+  and cached on disk - see image_bank.py / og_image.py)
 - Category suggestion with override support
 
+Large sheets (ENRICH_PARALLEL_MIN_ROWS rows and up) are enriched by forked
+worker processes over row chunks, sharing the venue/category indexes, typo
+correctors and memo built once in the parent (enrich_rows_parallel).
+
 Key behaviors:
 - Override columns take precedence
 - Derived fields are ALWAYS recomputed (never cached)
 - Venue matching uses tiered approach: exact → alias → fuzzy
 """
 
+import gc
 import json
+import multiprocessing
 import sys
 import os
+from collections import ChainMap, Counter
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from pipeline.utils import fuzzy_match_venue
-from pipeline.config import VENUE_MATCH_THRESHOLD
+from pipeline.utils import match_venue, build_venue_index, build_category_index
+from pipeline.config import (
+    VENUE_MATCH_THRESHOLD, VENUE_FUZZY_SCORER, OG_IMAGE_ENABLED,
+    ENRICH_WORKERS, ENRICH_PARALLEL_MIN_ROWS, ENRICH_CHUNKS_PER_WORKER
+)
+from pipeline.og_image import resolve_og_images
+from pipeline.typo_correction import build_venue_corrector, build_event_corrector
+from pipeline.reference_snapshot import load_reference_snapshot
+from pipeline.venue_memo import load_venue_memo, save_venue_memo, lookup_venue, remember_venue, remember_override
+from pipeline.image_bank import (
+    load_image_bank, save_image_bank, add_rows_to_bank, lookup_image, load_published_rows
+)
+
+# Event page URL column (EVENT_URL is TICKET_URL in older sheets)
+EVENT_URL_COLUMNS = ('EVENT_URL', 'TICKET_URL')
+
+
+def resolve_venue(venue_name: str, venues_data: list, venue_corrector=None, venue_memo: dict = None,
+                  snapshot=None) -> tuple:
+    """
+    Resolve a raw venue name to (VENUE_ID, tier, score)
+
+    The memo (venue_memo.py) answers repeated venue strings without matching.
+    Otherwise the typo-corrected name is matched first, then the raw name, and
+    the result is remembered.
 
+    Args:
+        venue_name: Raw venue name from event
+        venues_data: VENUES sheet data
+        venue_corrector: Optional TypoCorrector over VENUES words
+        venue_memo: Optional memo from venue_memo.load_venue_memo (updated in place)
+        snapshot: Optional ReferenceSnapshot of venues_data (see match_venue)
 
-def get_effective_venue_id(venue_name: str, venue_id_override: str, venues_data: list) -> str:
+    Returns:
+        Tuple of (VENUE_ID or "", tier, score); tier is exact, alias, fuzzy,
+        override (memo) or none
+    """
+    if venue_memo is not None:
+        cached = lookup_venue(venue_memo, venue_name)
+        if cached is not None:
+            return cached
+
+    venue_id, tier, score = None, 'none', 0.0
+    if venue_corrector is not None:
+        corrected_venue_name, _ = venue_corrector.correct(venue_name)
+        if corrected_venue_name != venue_name:
+            venue_id, tier, score = match_venue(corrected_venue_name, venues_data, threshold=VENUE_MATCH_THRESHOLD,
+                                                scorer=VENUE_FUZZY_SCORER, snapshot=snapshot)
+    if not venue_id:
+        venue_id, tier, score = match_venue(venue_name, venues_data, threshold=VENUE_MATCH_THRESHOLD,
+                                            scorer=VENUE_FUZZY_SCORER, snapshot=snapshot)
+
+    if venue_memo is not None:
+        remember_venue(venue_memo, venue_name, venue_id, tier, score)
+    return venue_id or "", tier, score
+
+
+def get_effective_venue_id(venue_name: str, venue_id_override: str, venues_data: list,
+                           venue_corrector=None, venue_memo: dict = None) -> str:
     """
     Get effective VENUE_ID (use override if present, else match)
 
@@ -34,6 +101,8 @@ def get_effective_venue_id(venue_name: str, venue_id_override: str, venues_data:
         venue_name: Raw venue name from event
         venue_id_override: Manual override (if set)
         venues_data: VENUES sheet data
+        venue_corrector: Optional TypoCorrector (see resolve_venue)
+        venue_memo: Optional venue-resolution memo (see resolve_venue)
 
     Returns:
         VENUE_ID or empty string
@@ -41,8 +110,8 @@ def get_effective_venue_id(venue_name: str, venue_id_override: str, venues_data:
     if venue_id_override:
         return venue_id_override
 
-    # Match venue using tiered approach (exact → alias → fuzzy)
-    return fuzzy_match_venue(venue_name, venues_data, threshold=VENUE_MATCH_THRESHOLD) or ""
+    # Match venue using tiered approach (memo → exact → alias → fuzzy)
+    return resolve_venue(venue_name, venues_data, venue_corrector, venue_memo)[0]
 
 
 def get_venue_details(venue_id: str, venues_data: list) -> dict:
@@ -56,27 +125,9 @@ def get_venue_details(venue_id: str, venues_data: list) -> dict:
     Returns:
         Dict with venue details (city, country, language, default_ticket_url, default_image_url, access_status)
     """
-    if not venue_id or not venues_data or len(venues_data) < 2:
+    if not venue_id:
         return {}
-
-    headers = venues_data[0]
-    col_map = {h: i for i, h in enumerate(headers)}
-
-    for row in venues_data[1:]:
-        if len(row) <= col_map.get('VENUE_ID', 0):
-            continue
-
-        if row[col_map['VENUE_ID']] == venue_id:
-            return {
-                'city': row[col_map.get('CITY', -1)] if col_map.get('CITY', -1) >= 0 and col_map.get('CITY', -1) < len(row) else "",
-                'country': row[col_map.get('COUNTRY', -1)] if col_map.get('COUNTRY', -1) >= 0 and col_map.get('COUNTRY', -1) < len(row) else "",
-                'language': row[col_map.get('LANGUAGE', -1)] if col_map.get('LANGUAGE', -1) >= 0 and col_map.get('LANGUAGE', -1) < len(row) else "",
-                'default_ticket_url': row[col_map.get('DEFAULT_TICKET_URL', -1)] if col_map.get('DEFAULT_TICKET_URL', -1) >= 0 and col_map.get('DEFAULT_TICKET_URL', -1) < len(row) else "",
-                'default_image_url': row[col_map.get('DEFAULT_IMAGE_URL', -1)] if col_map.get('DEFAULT_IMAGE_URL', -1) >= 0 and col_map.get('DEFAULT_IMAGE_URL', -1) < len(row) else "",
-                'access_status': row[col_map.get('INTERPRETER_STATUS', -1)] if col_map.get('INTERPRETER_STATUS', -1) >= 0 and col_map.get('INTERPRETER_STATUS', -1) < len(row) else ""
-            }
-
-    return {}
+    return build_venue_index(venues_data).get(venue_id, {})
 
 
 def enrich_ticket_url(event_ticket_url: str, ticket_url_override: str, venue_details: dict) -> str:
@@ -107,25 +158,25 @@ def enrich_ticket_url(event_ticket_url: str, ticket_url_override: str, venue_det
     return ""
 
 
-def enrich_image_url(event_image_url: str, image_url_override: str, ticket_url: str, venue_details: dict, category_details: dict) -> str:
+def enrich_image_url(event_image_url: str, image_url_override: str, ticket_url: str, venue_details: dict, category_details: dict, og_image: str = "", bank_image: str = "") -> str:
     """
     Enrich IMAGE_URL using hierarchy:
     1. Override (if set)
     2. Existing event image
-    3. og:image from ticket URL (future: requires HTTP fetch)
-    4. Venue default image
-    5. Category default image
-    6. Empty (flag for manual review)
-
-    Note: og:image extraction is commented out for now (requires requests/BeautifulSoup)
-    Can be enabled later if needed
+    3. Image bank (same artist at the same venue family)
+    4. og:image from ticket URL (resolved in batch by enrich_events)
+    5. Venue default image
+    6. Category default image
+    7. Empty (flag for manual review)
 
     Args:
         event_image_url: Original event image
         image_url_override: Manual override
-        ticket_url: Event ticket URL (for og:image extraction)
+        ticket_url: Event ticket URL (the page og_image was read from)
         venue_details: Venue details dict
         category_details: Category details dict
+        og_image: og:image resolved from ticket_url (empty if none)
+        bank_image: Image bank match for the event (empty if none)
 
     Returns:
         Enriched image URL
@@ -136,11 +187,11 @@ def enrich_image_url(event_image_url: str, image_url_override: str, ticket_url:
     if event_image_url:
         return event_image_url
 
-    # Future enhancement: Extract og:image from ticket_url
-    # if ticket_url:
-    #     og_image = fetch_og_image(ticket_url)
-    #     if og_image:
-    #         return og_image
+    if bank_image:
+        return bank_image
+
+    if og_image:
+        return og_image
 
     if venue_details.get('default_image_url'):
         return venue_details['default_image_url']
@@ -151,46 +202,34 @@ def enrich_image_url(event_image_url: str, image_url_override: str, ticket_url:
     return ""
 
 
-def suggest_category(event_name: str, categories_data: list) -> str:
+def suggest_category(event_name: str, categories_data: list, category_index: list = None) -> str:
     """
     Suggest CATEGORY_ID using keyword matching
 
     Args:
         event_name: Event name
         categories_data: EVENT_CATEGORIES sheet data
+        category_index: Optional build_category_index(categories_data) result
+            (saves re-parsing the keywords for every event)
 
     Returns:
         Suggested CATEGORY_ID or empty string
     """
-    if not categories_data or len(categories_data) < 2:
-        return ""
+    if category_index is None:
+        category_index = build_category_index(categories_data)
 
-    headers = categories_data[0]
-    col_map = {h: i for i, h in enumerate(headers)}
     event_lower = event_name.lower()
 
     best_match = None
     best_score = 0
 
-    for row in categories_data[1:]:
-        if len(row) <= col_map.get('CATEGORY_ID', 0):
-            continue
-
-        category_id = row[col_map['CATEGORY_ID']]
-        keywords_str = row[col_map.get('KEYWORDS', -1)] if col_map.get('KEYWORDS', -1) >= 0 and col_map.get('KEYWORDS', -1) < len(row) else "[]"
-
-        # Parse keywords (JSON array)
-        try:
-            keywords = json.loads(keywords_str)
-        except:
-            keywords = [k.strip() for k in keywords_str.strip('[]').replace('"', '').split(',')]
-
+    for category in category_index:
         # Count keyword matches
-        matches = sum(1 for kw in keywords if kw.lower() in event_lower)
+        matches = sum(1 for kw in category['keywords'] if kw in event_lower)
 
         if matches > best_score:
             best_score = matches
-            best_match = category_id
+            best_match = category['category_id']
 
     return best_match if best_score > 0 else ""
 
@@ -209,36 +248,52 @@ def get_effective_category_id(category_suggestion: str, category_override: str)
     return category_override if category_override else category_suggestion
 
 
-def get_category_details(category_id: str, categories_data: list) -> dict:
+def get_category_details(category_id: str, categories_data: list, category_index: list = None) -> dict:
     """
     Lookup category details by CATEGORY_ID
 
     Args:
         category_id: CATEGORY_ID to lookup
         categories_data: EVENT_CATEGORIES sheet data
+        category_index: Optional build_category_index(categories_data) result
 
     Returns:
         Dict with category details
     """
-    if not category_id or not categories_data or len(categories_data) < 2:
+    if not category_id:
         return {}
+    if category_index is None:
+        category_index = build_category_index(categories_data)
 
-    headers = categories_data[0]
-    col_map = {h: i for i, h in enumerate(headers)}
+    for category in category_index:
+        if category['category_id'] == category_id:
+            return category['details']
 
-    for row in categories_data[1:]:
-        if len(row) <= col_map.get('CATEGORY_ID', 0):
-            continue
+    return {}
 
-        if row[col_map['CATEGORY_ID']] == category_id:
-            return {
-                'default_image_url': row[col_map.get('DEFAULT_IMAGE_URL', -1)] if col_map.get('DEFAULT_IMAGE_URL', -1) >= 0 and col_map.get('DEFAULT_IMAGE_URL', -1) < len(row) else ""
-            }
 
-    return {}
+def get_default_image_urls(*sheets_data: list) -> set:
+    """
+    Collect DEFAULT_IMAGE_URL values from VENUES / EVENT_CATEGORIES data
 
+    Rows re-read from STAGED_EVENTS may carry a default image from an earlier
+    run; those must not be banked as the artist's image.
+    """
+    defaults = set()
+    for sheet_data in sheets_data:
+        if not sheet_data:
+            continue
+        idx = {h: i for i, h in enumerate(sheet_data[0])}.get('DEFAULT_IMAGE_URL', -1)
+        if idx < 0:
+            continue
+        for row in sheet_data[1:]:
+            if idx < len(row) and str(row[idx]).strip():
+                defaults.add(str(row[idx]).strip())
+    return defaults
 
-def enrich_events(staged_events_data: list, venues_data: list, categories_data: list) -> list:
+
+def enrich_events(staged_events_data: list, venues_data: list, categories_data: list, image_bank: dict = None,
+                  venue_memo: dict = None, workers: int = 1, snapshot=None) -> list:
     """
     Enrich all events in STAGED_EVENTS
 
@@ -251,6 +306,18 @@ def enrich_events(staged_events_data: list, venues_data: list, categories_data:
         staged_events_data: STAGED_EVENTS sheet data
         venues_data: VENUES sheet data
         categories_data: EVENT_CATEGORIES sheet data
+        image_bank: Image bank from image_bank.load_image_bank (updated in place
+            with the staged rows' own images; None disables the bank)
+        venue_memo: Venue-resolution memo from venue_memo.load_venue_memo
+            (updated in place with new matches and VENUE_ID_OVERRIDEs; None
+            matches every row)
+        workers: Worker processes for the per-row enrichment (see
+            enrich_rows_parallel; 0 = one per CPU). Inputs under
+            ENRICH_PARALLEL_MIN_ROWS rows are always enriched in-process.
+        snapshot: Optional ReferenceSnapshot of venues_data / categories_data
+            (reference_snapshot.load_reference_snapshot); venue matching,
+            indexes and the venue typo vocabulary come from it instead of
+            being re-derived
 
     Returns:
         Enriched rows
@@ -260,14 +327,139 @@ def enrich_events(staged_events_data: list, venues_data: list, categories_data:
 
     headers = staged_events_data[0]
     col_map = {h: i for i, h in enumerate(headers)}
-    enriched_rows = [headers]
+    event_url_idx = next((col_map[c] for c in EVENT_URL_COLUMNS if c in col_map), -1)
+
+    # Bank the staged rows' own images first so every row can use them in one pass
+    if image_bank is not None:
+        added = add_rows_to_bank(image_bank, staged_events_data,
+                                 ignore_images=get_default_image_urls(venues_data, categories_data))
+        print(f"\n🏦 Image bank: {len(image_bank['entries'])} keys ({added} new from staged rows)")
+
+    # Typo-correct event names once per distinct value (venue names are
+    # corrected on demand, only for venue strings the memo doesn't know)
+    event_names = [row[col_map['EVENT_NAME']] if col_map.get('EVENT_NAME', -1) >= 0 and col_map['EVENT_NAME'] < len(row) else "" for row in staged_events_data[1:]]
+    corrected_events = build_event_corrector(event_names, categories_data).correct_column(event_names)
+    event_typos = sum(1 for name, (corrected, _) in zip(event_names, corrected_events) if corrected != name)
+
+    # Confirmed overrides first, so rows with the same venue string benefit this run
+    if venue_memo is not None and col_map.get('VENUE_ID_OVERRIDE', -1) >= 0 and col_map.get('EVENT_ID', -1) >= 0:
+        for row in staged_events_data[1:]:
+            override = row[col_map['VENUE_ID_OVERRIDE']] if col_map['VENUE_ID_OVERRIDE'] < len(row) else ""
+            if override:
+                remember_override(venue_memo, row[col_map['VENUE_NAME']] if col_map['VENUE_NAME'] < len(row) else "",
+                                  override, row[col_map['EVENT_ID']] if col_map['EVENT_ID'] < len(row) else "")
+
+    # Everything the per-row loop reads, built once (and shared by forked workers)
+    context = {
+        'headers': headers,
+        'col_map': col_map,
+        'event_url_idx': event_url_idx,
+        'rows': staged_events_data[1:],
+        'corrected_events': corrected_events,
+        'venues_data': venues_data,
+        'venue_memo': venue_memo,
+        'categories_data': categories_data,
+        'image_bank': image_bank,
+        'snapshot': snapshot
+    }
+    if snapshot is not None:
+        context['venue_index'] = snapshot.venue_index()
+        context['venue_corrector'] = build_venue_corrector(venues_data, vocabulary=snapshot.vocabulary())
+        context['category_index'] = snapshot.category_index()
+        snapshot.fuzzy_candidates()  # Decoded once here rather than in every worker
+    else:
+        context['venue_index'] = build_venue_index(venues_data)
+        context['venue_corrector'] = build_venue_corrector(venues_data)
+        context['category_index'] = build_category_index(categories_data)
 
     print(f"\n🔧 Enriching events...")
 
-    matched_count = 0
-    unmatched_count = 0
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(context['rows']) >= ENRICH_PARALLEL_MIN_ROWS:
+        rows, og_pending, stats = enrich_rows_parallel(context, workers)
+    else:
+        rows, og_pending, stats = enrich_rows(context, 0, len(context['rows']))
+
+    for i, venue_name in stats['unmatched_rows']:
+        print(f"   ⚠️  Row {i}: Could not match venue: {venue_name}")
+
+    # Resolve og:images for all pending rows at once (pooled, concurrent, cached)
+    if og_pending:
+        og_image_rows = [(rows[offset], venue_details, category_details)
+                         for offset, venue_details, category_details in og_pending]
+        ticket_urls = [row[event_url_idx] for row, _, _ in og_image_rows]
+        og_images, og_stats = resolve_og_images(ticket_urls)
+
+        found = 0
+        for row, venue_details, category_details in og_image_rows:
+            ticket_url = row[event_url_idx]
+            og_image = og_images.get(ticket_url, "")
+            if og_image:
+                found += 1
+            row[col_map['IMAGE_URL']] = enrich_image_url("", "", ticket_url, venue_details, category_details, og_image)
+
+        print(f"\n🖼️  og:image lookup for {len(og_image_rows)} events: {found} found")
+        if 'skipped' in og_stats:
+            print(f"   ⚠️  Skipped ({og_stats['skipped']}) - using default images")
+        else:
+            print(f"   Cache hits: {og_stats['cache_hits']}, revalidated: {og_stats['revalidated']}, "
+                  f"fetched: {og_stats['fetched']}, failed: {og_stats['failed']}")
+
+    print(f"\n✅ Enrichment complete:")
+    if stats['workers'] > 1:
+        print(f"   Worker processes: {stats['workers']}")
+    print(f"   Venues matched: {stats['matched']}")
+    print(f"   Venues unmatched: {stats['unmatched']}")
+    print(f"   Venue match tiers: " + ", ".join(f"{tier} {count}" for tier, count in stats['tiers'].most_common()))
+    print(f"   Typo-corrected event names (category suggestion): {event_typos}")
+    if venue_memo is not None:
+        memo_stats = venue_memo['stats']
+        print(f"   Venue memo: {memo_stats['hits']} hits, {memo_stats['misses']} matched"
+              + (" (VENUES or matcher changed - memo rebuilt)" if memo_stats['invalidated'] else ""))
+    if image_bank is not None:
+        print(f"   Images filled from bank: {stats['bank_filled']}")
+
+    return [headers] + rows
+
+
+def enrich_rows(context: dict, start: int, end: int) -> tuple:
+    """
+    Enrich data rows start..end-1 of context['rows'] in place
+
+    Args:
+        context: Shared lookup state built by enrich_events
+        start: First data row (0-based, header excluded)
+        end: End of the range (exclusive)
+
+    Returns:
+        Tuple of (rows, og_pending, stats):
+        - rows: The enriched rows
+        - og_pending: (offset into rows, venue_details, category_details) of
+          rows awaiting an og:image
+        - stats: matched / unmatched / bank_filled counts, tiers (Counter of
+          venue match tiers, "manual" = VENUE_ID_OVERRIDE), unmatched_rows
+          [(sheet row, venue name)] and workers
+    """
+    headers = context['headers']
+    col_map = context['col_map']
+    event_url_idx = context['event_url_idx']
+    venues_data = context['venues_data']
+    venue_index = context['venue_index']
+    venue_corrector = context['venue_corrector']
+    venue_memo = context['venue_memo']
+    categories_data = context['categories_data']
+    category_index = context['category_index']
+    image_bank = context['image_bank']
+    corrected_events = context['corrected_events']
+    snapshot = context['snapshot']
+
+    stats = {'matched': 0, 'unmatched': 0, 'bank_filled': 0, 'tiers': Counter(), 'unmatched_rows': [], 'workers': 1}
+    rows = context['rows'][start:end]
+    og_pending = []
+
+    for offset, row in enumerate(rows):
+        i = start + offset + 2  # Sheet row number
 
-    for i, row in enumerate(staged_events_data[1:], start=2):
         # Pad row to match header length so column assignments don't fail
         while len(row) < len(headers):
             row.append("")
@@ -276,11 +468,15 @@ def enrich_events(staged_events_data: list, venues_data: list, categories_data:
         venue_name = row[col_map.get('VENUE_NAME', -1)]
         venue_id_override = row[col_map.get('VENUE_ID_OVERRIDE', -1)] if col_map.get('VENUE_ID_OVERRIDE', -1) >= 0 and col_map.get('VENUE_ID_OVERRIDE', -1) < len(row) else ""
 
-        effective_venue_id = get_effective_venue_id(venue_name, venue_id_override, venues_data)
+        if venue_id_override:
+            effective_venue_id, tier = venue_id_override, 'manual'
+        else:
+            effective_venue_id, tier, _ = resolve_venue(venue_name, venues_data, venue_corrector, venue_memo, snapshot)
+        stats['tiers'][tier] += 1
 
         if effective_venue_id:
-            matched_count += 1
-            venue_details = get_venue_details(effective_venue_id, venues_data)
+            stats['matched'] += 1
+            venue_details = venue_index.get(effective_venue_id, {})
 
             # ALWAYS recompute derived fields from VENUE_ID
             row[col_map['VENUE_ID']] = effective_venue_id
@@ -292,8 +488,8 @@ def enrich_events(staged_events_data: list, venues_data: list, categories_data:
             if not row[col_map.get('ACCESS_STATUS', -1)]:
                 row[col_map['ACCESS_STATUS']] = venue_details.get('access_status', "")
         else:
-            unmatched_count += 1
-            print(f"   ⚠️  Row {i}: Could not match venue: {venue_name}")
+            stats['unmatched'] += 1
+            stats['unmatched_rows'].append((i, venue_name))
             venue_details = {}
 
         # Suggest category if not already set
@@ -301,7 +497,7 @@ def enrich_events(staged_events_data: list, venues_data: list, categories_data:
         existing_category_suggestion = row[col_map.get('CATEGORY_SUGGESTION', -1)]
 
         if not existing_category_suggestion:
-            suggested_category = suggest_category(event_name, categories_data)
+            suggested_category = suggest_category(corrected_events[i - 2][0], categories_data, category_index)
             row[col_map['CATEGORY_SUGGESTION']] = suggested_category
         else:
             suggested_category = existing_category_suggestion
@@ -313,29 +509,113 @@ def enrich_events(staged_events_data: list, venues_data: list, categories_data:
         row[col_map['CATEGORY_ID']] = effective_category_id
 
         # Get category details for image fallback
-        category_details = get_category_details(effective_category_id, categories_data)
+        category_details = get_category_details(effective_category_id, categories_data, category_index)
 
-        # Enrich TICKET_URL
-        event_ticket_url = row[col_map.get('TICKET_URL', -1)]
+        # Enrich EVENT_URL (TICKET_URL in older sheets)
+        event_ticket_url = row[event_url_idx] if event_url_idx >= 0 else ""
         ticket_url_override = row[col_map.get('TICKET_URL_OVERRIDE', -1)] if col_map.get('TICKET_URL_OVERRIDE', -1) >= 0 and col_map.get('TICKET_URL_OVERRIDE', -1) < len(row) else ""
         enriched_ticket_url = enrich_ticket_url(event_ticket_url, ticket_url_override, venue_details)
 
-        row[col_map['TICKET_URL']] = enriched_ticket_url
+        if event_url_idx >= 0:
+            row[event_url_idx] = enriched_ticket_url
 
         # Enrich IMAGE_URL
         event_image_url = row[col_map.get('IMAGE_URL', -1)]
         image_url_override = row[col_map.get('IMAGE_URL_OVERRIDE', -1)] if col_map.get('IMAGE_URL_OVERRIDE', -1) >= 0 and col_map.get('IMAGE_URL_OVERRIDE', -1) < len(row) else ""
-        enriched_image_url = enrich_image_url(event_image_url, image_url_override, enriched_ticket_url, venue_details, category_details)
 
-        row[col_map['IMAGE_URL']] = enriched_image_url
+        bank_image = ""
+        if image_bank is not None and not image_url_override and not event_image_url:
+            bank_image = lookup_image(image_bank, event_name, venue_name)
+            if bank_image:
+                stats['bank_filled'] += 1
+
+        # Rows that would fall back to a default image try the ticket page's og:image first.
+        # The venue's generic ticket URL is skipped (its og:image is not event-specific).
+        if (OG_IMAGE_ENABLED and event_url_idx >= 0 and not image_url_override and not event_image_url
+                and not bank_image and enriched_ticket_url and enriched_ticket_url != venue_details.get('default_ticket_url')):
+            og_pending.append((offset, venue_details, category_details))
+        else:
+            enriched_image_url = enrich_image_url(event_image_url, image_url_override, enriched_ticket_url, venue_details, category_details, bank_image=bank_image)
+            row[col_map['IMAGE_URL']] = enriched_image_url
 
-        enriched_rows.append(row)
+    return rows, og_pending, stats
+
+
+# Set in the parent just before forking; workers inherit it copy-on-write
+_worker_context = None
 
-    print(f"\n✅ Enrichment complete:")
-    print(f"   Venues matched: {matched_count}")
-    print(f"   Venues unmatched: {unmatched_count}")
 
-    return enriched_rows
+def _enrich_chunk(bounds: tuple) -> tuple:
+    """Worker: enrich one chunk, returning its rows, og:image rows, stats and new memo entries"""
+    start, end = bounds
+    context = dict(_worker_context)
+    memo = context['venue_memo']
+    if memo is not None:
+        # Lookups fall through to the inherited entries; new matches land in the first map
+        memo = dict(memo, entries=ChainMap({}, memo['entries']), stats={'hits': 0, 'misses': 0})
+        context['venue_memo'] = memo
+
+    rows, og_pending, stats = enrich_rows(context, start, end)
+
+    if memo is not None:
+        return rows, og_pending, stats, memo['entries'].maps[0], memo['stats']
+    return rows, og_pending, stats, {}, None
+
+
+def enrich_rows_parallel(context: dict, workers: int) -> tuple:
+    """
+    enrich_rows() over all rows, split into chunks across forked worker processes
+
+    The lookup state in context (venue/category indexes, typo correctors,
+    memo, image bank) is built once in the parent; fork()ed workers share it
+    copy-on-write instead of receiving pickled copies. Only chunk bounds go
+    to the workers and only enriched rows, og:image bookkeeping, stats and
+    new memo entries come back. Chunks are reassembled in row order and
+    their stats and memo entries merged into context['venue_memo'].
+
+    Falls back to enrich_rows() in-process where fork() isn't available.
+
+    Returns:
+        Same as enrich_rows() for the whole sheet
+    """
+    rows = context['rows']
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        print("   ⚠️  fork() not available - enriching in one process")
+        return enrich_rows(context, 0, len(rows))
+
+    # Several chunks per worker so one slow chunk doesn't idle the others
+    chunk_size = max(1, -(-len(rows) // (workers * ENRICH_CHUNKS_PER_WORKER)))
+    chunks = [(start, min(start + chunk_size, len(rows))) for start in range(0, len(rows), chunk_size)]
+
+    global _worker_context
+    _worker_context = context
+    # Keep the cyclic GC from touching (and so copying) the shared objects' pages
+    gc.freeze()
+    try:
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            results = pool.map(_enrich_chunk, chunks)
+    finally:
+        gc.unfreeze()
+        _worker_context = None
+
+    all_rows, og_pending = [], []
+    stats = {'matched': 0, 'unmatched': 0, 'bank_filled': 0, 'tiers': Counter(), 'unmatched_rows': [],
+             'workers': workers}
+    memo = context['venue_memo']
+    for chunk_rows, chunk_og, chunk_stats, memo_entries, memo_stats in results:
+        og_pending.extend((len(all_rows) + offset, venue_details, category_details)
+                          for offset, venue_details, category_details in chunk_og)
+        all_rows.extend(chunk_rows)
+        for key in ('matched', 'unmatched', 'bank_filled'):
+            stats[key] += chunk_stats[key]
+        stats['tiers'].update(chunk_stats['tiers'])
+        stats['unmatched_rows'].extend(chunk_stats['unmatched_rows'])
+        if memo is not None:
+            memo['entries'].update(memo_entries)
+            memo['stats']['hits'] += memo_stats['hits']
+            memo['stats']['misses'] += memo_stats['misses']
+
+    return all_rows, og_pending, stats
 
 
 def main():
@@ -347,6 +627,10 @@ def main():
         - venues-data.json (from VENUES sheet)
         - categories-data.json (from EVENT_CATEGORIES sheet)
 
+    Options:
+        --workers N   Worker processes for large sheets (default ENRICH_WORKERS,
+                      0 = one per CPU; 1 = single process)
+
     Outputs:
         - enriched-staged-events-output.json (ready to update STAGED_EVENTS sheet)
     """
@@ -367,8 +651,24 @@ def main():
         print(f"❌ Error: {e}")
         sys.exit(1)
 
+    # Image bank: persisted index, topped up with the PUBLISHED history when exported
+    image_bank = load_image_bank()
+    published_rows = load_published_rows()
+    if published_rows:
+        added = add_rows_to_bank(image_bank, published_rows)
+        print(f"✅ Indexed {len(published_rows) - 1} published rows into image bank ({added} new keys)")
+
+    workers = ENRICH_WORKERS
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+
     # Enrich
-    enriched_rows = enrich_events(staged_events_data, venues_data, categories_data)
+    snapshot = load_reference_snapshot(venues_data=venues_data, categories_data=categories_data)
+    venue_memo = load_venue_memo(venues_data)
+    enriched_rows = enrich_events(staged_events_data, venues_data, categories_data, image_bank, venue_memo,
+                                  workers=workers, snapshot=snapshot)
+    save_image_bank(image_bank)
+    save_venue_memo(venue_memo)
 
     print(f"\n" + "=" * 70)
     print(f"📊 SUMMARY")
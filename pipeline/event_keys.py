@@ -0,0 +1,266 @@
+"""
+Canonical event keys shared by the build, sync and prune paths
+
+Every stage that asks "is this the same event?" uses the keys defined here:
+- url_key:   normalized EVENT_URL ("" when the event has no URL)
+- event_key: date|name|venue with the date in YYYY-MM-DD and name/venue
+             normalized by normalize_event_name / normalize_venue_name (the
+             venue also loses a trailing " london" without a comma)
+- event_id:  EVENT_ID written to STAGED_EVENTS (first 16 hex chars of a
+             SHA-256, see EventKey.event_id)
+
+event_key() normalizes an event's raw fields once and returns an interned
+EventKey: the same raw fields always give the same object, and its key
+strings are sys.intern'ed, so repeated lookups in dicts and sets compare by
+identity instead of rebuilding and hashing fresh f-strings.
+
+This module has no third-party dependencies so the root O2 sync scripts can
+import it without the rest of the pipeline.
+"""
+
+import hashlib
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Interned EventKeys kept per process (one per distinct raw name/date/venue/URL)
+EVENT_KEY_CACHE_SIZE = 65536
+
+# Name suffixes/prefixes dropped before comparing event names
+_NAME_PATTERNS = [re.compile(p) for p in (
+    r'\s*-\s*live$',
+    r'^the\s+',
+    r'\s+tour$',
+    r'\s+\d{4}$',  # Year suffixes
+    r'\s*\(.*\)$',  # Parenthetical notes
+)]
+_WHITESPACE = re.compile(r'\s+')
+
+# Location suffixes dropped from venue names
+_VENUE_SUFFIX = re.compile(r',\s*(?:london|uk|ireland)$')
+# Dedupe keys also drop a comma-less " london" ("The O2 London" = "The O2, London").
+# Scoped to EventKey.venue: venue matching must keep "Museum of London" whole
+_EVENT_KEY_VENUE_SUFFIX = re.compile(r'(?:,\s*|\s+)london$|,\s*(?:uk|ireland)$')
+
+# Common venue name variations (applied in order)
+_VENUE_REPLACEMENTS = {
+    'the o2 arena': 'the o2',
+    'o2 arena': 'the o2',
+    'indigo at the o2': 'indigo',
+}
+
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATE_RANGE = re.compile(r'\s*[-&]\s*')
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize URL for deduplication (strips protocol, www, params, trailing slashes)
+
+    Example:
+        normalize_url("https://www.theo2.co.uk/events/detail/event?ref=123")
+        Returns: "theo2.co.uk/events/detail/event"
+    """
+    if not url:
+        return ""
+
+    url = url.lower().strip()
+    url = url.replace('https://', '').replace('http://', '')
+
+    if '?' in url:
+        url = url.split('?', 1)[0]
+
+    url = url.rstrip('/')
+    url = url.replace('www.', '')
+
+    return url
+
+
+@lru_cache(maxsize=EVENT_KEY_CACHE_SIZE)
+def normalize_event_name(name: str) -> str:
+    """
+    Normalize event name for deduplication
+
+    Example:
+        normalize_event_name("The Beatles - Live Tour 2026")
+        Returns: "beatles - live tour"
+    """
+    if not name:
+        return ""
+
+    # Convert to lowercase, strip whitespace
+    name = name.lower().strip()
+
+    # Remove common suffixes/prefixes
+    for pattern in _NAME_PATTERNS:
+        name = pattern.sub('', name)
+
+    # Normalize whitespace
+    name = _WHITESPACE.sub(' ', name)
+
+    return name.strip()
+
+
+@lru_cache(maxsize=4096)
+def normalize_venue_name(venue: str) -> str:
+    """
+    Normalize venue name for matching
+
+    Example:
+        normalize_venue_name("The O2 Arena, London")
+        Returns: "the o2"
+    """
+    return _normalize_venue(venue, _VENUE_SUFFIX)
+
+
+@lru_cache(maxsize=4096)
+def _event_key_venue(venue: str) -> str:
+    """normalize_venue_name plus the comma-less " london" rule (EventKey.venue only)"""
+    return _normalize_venue(venue, _EVENT_KEY_VENUE_SUFFIX)
+
+
+def _normalize_venue(venue: str, suffix: re.Pattern) -> str:
+    if not venue:
+        return ""
+
+    venue = venue.lower().strip()
+
+    # Remove common location suffixes
+    venue = suffix.sub('', venue)
+
+    for old, new in _VENUE_REPLACEMENTS.items():
+        if old in venue:
+            venue = venue.replace(old, new)
+
+    return venue.strip()
+
+
+def parse_date(date_str: str) -> Optional[str]:
+    """
+    Parse various date formats to YYYY-MM-DD
+
+    Supported formats:
+        - YYYY-MM-DD (already normalized)
+        - DD.MM.YY or DD.MM.YYYY
+        - DD/MM/YY or DD/MM/YYYY
+
+    Example:
+        parse_date("15.06.26") Returns: "2026-06-15"
+        parse_date("15/06/2026") Returns: "2026-06-15"
+        parse_date("2026-06-15") Returns: "2026-06-15"
+    """
+    if not date_str:
+        return None
+
+    date_str = str(date_str).strip()
+
+    # Already in YYYY-MM-DD format
+    if _ISO_DATE.match(date_str):
+        return date_str
+
+    # Handle date ranges: "DD.MM.YY - DD.MM.YY" -> extract first date
+    if ' - ' in date_str or ' & ' in date_str:
+        date_str = _DATE_RANGE.split(date_str)[0].strip()
+
+    # DD.MM.YY or DD.MM.YYYY, DD/MM/YY or DD/MM/YYYY
+    for separator in ('.', '/'):
+        if separator in date_str:
+            parts = date_str.split(separator)
+            if len(parts) == 3:
+                day, month, year = parts
+                if len(year) == 2:
+                    year = '20' + year
+                return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+
+    return None
+
+
+def canonical_date(date_str: str) -> str:
+    """YYYY-MM-DD for any supported format; the stripped input if unparseable"""
+    return parse_date(date_str) or str(date_str or "").strip()
+
+
+class EventKey:
+    """
+    Interned, hashable identity of one event (build with event_key())
+
+    Attributes:
+        url_key: Normalized EVENT_URL ("" if none)
+        event_key: "date|name|venue" with canonical date, name and venue
+        event_id: STAGED_EVENTS EVENT_ID (computed on first access)
+
+    Two EventKeys are equal when both url_key and event_key match.
+    """
+
+    __slots__ = ('url_key', 'event_key', 'date', 'name', 'venue', '_raw_date', '_raw_venue', '_event_id', '_hash')
+
+    def __init__(self, event_name: str, event_date: str, venue_name: str, event_url: str = ""):
+        self.date = sys.intern(canonical_date(event_date))
+        self.name = sys.intern(normalize_event_name(event_name or ""))
+        self.venue = sys.intern(_event_key_venue(venue_name or ""))
+        self.url_key = sys.intern(normalize_url(event_url))
+        self.event_key = sys.intern(f"{self.date}|{self.name}|{self.venue}")
+        self._raw_date = event_date or ""
+        self._raw_venue = venue_name or ""
+        self._event_id = None
+        self._hash = hash((self.url_key, self.event_key))
+
+    @property
+    def event_id(self) -> str:
+        """
+        EVENT_ID: sha256("date|name|venue")[:16]
+
+        The date is hashed as it appears in the source sheet (not canonical)
+        and the venue only loses comma-separated location suffixes, so IDs -
+        and the APPROVE values keyed by them - match rows written before this
+        module existed.
+        """
+        if self._event_id is None:
+            venue = normalize_venue_name(self._raw_venue)
+            key = f"{self._raw_date}|{self.name}|{venue}"
+            self._event_id = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return self._event_id
+
+    def __setattr__(self, name, value):
+        if name != '_event_id' and hasattr(self, '_hash'):
+            raise AttributeError("EventKey is immutable")
+        object.__setattr__(self, name, value)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, EventKey):
+            return NotImplemented
+        return self.url_key is other.url_key and self.event_key is other.event_key
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"EventKey({self.event_key!r}, url={self.url_key!r})"
+
+
+@lru_cache(maxsize=EVENT_KEY_CACHE_SIZE)
+def event_key(event_name: str, event_date: str, venue_name: str, event_url: str = "") -> EventKey:
+    """
+    Interned EventKey for an event's raw fields (normalized once per process)
+
+    Example:
+        key = event_key("Jamiroquai", "09.12.25", "The O2, London", "https://www.theo2.co.uk/events/detail/jamiroquai")
+        key.event_key  Returns: "2025-12-09|jamiroquai|the o2"
+        key.url_key    Returns: "theo2.co.uk/events/detail/jamiroquai"
+        key is event_key("Jamiroquai", "09.12.25", "The O2, London", "https://www.theo2.co.uk/events/detail/jamiroquai")
+        Returns: True
+    """
+    return EventKey(event_name, event_date, venue_name, event_url)
+
+
+def event_key_for(event: Dict) -> EventKey:
+    """EventKey of an event dict (event_name, event_date, venue_name, event_url)"""
+    return event_key(
+        event.get('event_name') or "",
+        event.get('event_date') or "",
+        event.get('venue_name') or "",
+        event.get('event_url') or ""
+    )
@@ -7,6 +7,13 @@ Exports approved events from STAGED_EVENTS to READY_TO_PUBLISH:
 - Removes past events (>6h in Europe/London timezone)
 - Full refresh (overwrites READY_TO_PUBLISH)
 - Adds LAST_UPDATED timestamp
+- Writes the compact JSON feed (plus .gz/.br variants and ETag metadata)
+  to FEED_OUTPUT_DIR for the static host
+- Writes month/region feed shards with an index manifest alongside it
+- Advances the versioned delta changelog (N→latest deltas + periodic snapshots)
+- Writes a prebuilt search index for the compact feed
+- Caches event images and writes WebP thumbnails with dimensions and blur
+  placeholders recorded in the feed
 """
 
 import json
@@ -18,8 +25,14 @@ import pytz
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from pipeline.config import READY_TO_PUBLISH_COLUMNS, TIMEZONE
+from pipeline.config import READY_TO_PUBLISH_COLUMNS, TIMEZONE, FEED_OUTPUT_DIR, CHANGELOG_STATE_FILE
 from pipeline.utils import is_event_outdated
+from pipeline.publish_feed import (
+    build_feed_records, build_feed_from_records, write_feed_artifacts, write_shard_artifacts, print_artifact_sizes
+)
+from pipeline.image_cache import cache_images, attach_image_metadata, prune_thumbnails
+from pipeline.feed_changelog import update_changelog
+from pipeline.search_index import build_search_index, write_search_index
 
 
 def filter_approved_events(staged_events_data: list) -> list:
@@ -153,6 +166,11 @@ def main():
 
     Outputs:
         - ready-to-publish-output.json (ready to write to READY_TO_PUBLISH sheet)
+        - feed/events.json (+ .gz, .br, .meta.json) compact feed for the static host
+        - feed/index.json + feed/shards/YYYY-MM-region.json month/region shards
+        - feed/changelog/ delta-N.json (N→latest) + snapshots; state in feed-changelog-state.json
+        - feed/search-index.json (+ .gz, .br) inverted index over feed/events.json
+        - feed/img/{hash}-{width}.webp thumbnails; originals in image-cache/
     """
     print("=" * 70)
     print("📤 JOB 5: EXPORT TO READY_TO_PUBLISH")
@@ -201,6 +219,46 @@ def main():
     print(f"\n💾 Output saved to: ready-to-publish-output.json")
     print(f"   Ready to write to READY_TO_PUBLISH sheet in PUBLIC EVENTS FEED")
 
+    # Compact JSON feed for the static host
+    generated_at = datetime.now(pytz.timezone(TIMEZONE)).strftime('%Y-%m-%d %H:%M:%S')
+    records = build_feed_records(current_events, headers)
+
+    # Thumbnails + image dimensions (downloads only new or changed images)
+    print(f"\n🖼️  Caching event images...")
+    image_metadata, image_stats = cache_images((r.get('m', '') for r in records), FEED_OUTPUT_DIR)
+    attached = attach_image_metadata(records, image_metadata)
+    removed = prune_thumbnails(image_metadata, FEED_OUTPUT_DIR)
+    if 'skipped' in image_stats:
+        print(f"   ⚠️  Downloads skipped ({image_stats['skipped']}) - using cached images only")
+    else:
+        print(f"   Cache hits: {image_stats['cache_hits']}, revalidated: {image_stats['revalidated']}, "
+              f"downloaded: {image_stats['downloaded']} ({image_stats['bytes']:,} bytes), "
+              f"failed: {image_stats['failed']}")
+    print(f"   ✅ {attached} events with thumbnails ({image_stats['processed']} new images processed, "
+          f"{removed} stale thumbnails removed)")
+
+    feed = build_feed_from_records(records, generated_at)
+    feed_meta = write_feed_artifacts(feed, FEED_OUTPUT_DIR)
+
+    print(f"\n📦 Compact feed written to: {FEED_OUTPUT_DIR}/")
+    print_artifact_sizes(feed_meta, f"Version {feed_meta['version']} ({feed_meta['count']} events)")
+
+    shard_index = write_shard_artifacts(records, generated_at, FEED_OUTPUT_DIR)
+    print(f"   Shards: {len(shard_index['shards'])} across {len(shard_index['months'])} month(s), "
+          f"regions {', '.join(shard_index['regions']) or 'none'} (index version {shard_index['version']})")
+
+    changelog = update_changelog(
+        records, generated_at,
+        CHANGELOG_STATE_FILE, os.path.join(FEED_OUTPUT_DIR, 'changelog')
+    )
+    print(f"   Changelog: version {changelog['latest']}, deltas from {changelog['oldest_base']} "
+          f"({len(changelog['deltas'])} retained)")
+
+    search_index = build_search_index(feed)
+    search_variants = write_search_index(search_index, FEED_OUTPUT_DIR)
+    print(f"   Search index: {len(search_index['terms'])} terms, version {search_index['version']} "
+          f"({search_variants['gzip']['bytes']:,} bytes gzipped)")
+
 
 if __name__ == "__main__":
     main()
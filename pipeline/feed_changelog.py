@@ -0,0 +1,237 @@
+"""
+Versioned delta feed for the published events (Job 5)
+
+Keeps the previously published state keyed by EVENT_ID and, whenever the
+feed content changes, records a new integer version with the delta from the
+previous one (added IDs, removed IDs, changed field names).
+
+For every retained base version N the export writes a cumulative
+N→latest delta, so a client holding version N downloads one small file:
+- added:   full short-key records to upsert
+- changed: [{"i": EVENT_ID, "set": {field: value}, "unset": [field]}]
+- removed: EVENT_IDs to delete
+
+Steps older than CHANGELOG_RETAIN_VERSIONS are compacted away; a full
+snapshot is written every CHANGELOG_SNAPSHOT_INTERVAL versions so a client
+that is too far behind loads the latest snapshot and then its delta.
+"""
+
+import json
+import os
+from typing import Dict, List
+
+from pipeline.config import (
+    FEED_FORMAT_VERSION, CHANGELOG_RETAIN_VERSIONS, CHANGELOG_SNAPSHOT_INTERVAL
+)
+from pipeline.publish_feed import compute_version, encode_json, write_atomic, write_precompressed
+
+
+def records_by_id(records: List[Dict]) -> Dict[str, Dict]:
+    """
+    Key short-key feed records by EVENT_ID (records without an ID are skipped)
+
+    Args:
+        records: Short-key records from build_feed_records
+
+    Returns:
+        Dict of EVENT_ID → record
+    """
+    return {record['i']: record for record in records if record.get('i')}
+
+
+def diff_states(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Dict:
+    """
+    One-step delta between two published states
+
+    Args:
+        previous: EVENT_ID → record at the previous version
+        current: EVENT_ID → record at the new version
+
+    Returns:
+        Dict with added (IDs), removed (IDs), changed (ID → changed field names)
+
+    Example:
+        diff_states({"a": {"i": "a", "t": "19:00"}}, {"a": {"i": "a", "t": "19:30"}, "b": {"i": "b"}})
+        Returns: {"added": ["b"], "removed": [], "changed": {"a": ["t"]}}
+    """
+    added = sorted(set(current) - set(previous))
+    removed = sorted(set(previous) - set(current))
+
+    changed = {}
+    for event_id in sorted(set(current) & set(previous)):
+        old, new = previous[event_id], current[event_id]
+        if old != new:
+            fields = sorted(k for k in set(old) | set(new) if old.get(k) != new.get(k))
+            changed[event_id] = fields
+
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def compose_steps(steps: List[Dict], latest: Dict[str, Dict]) -> Dict:
+    """
+    Collapse consecutive one-step deltas into a single delta with values
+
+    Values are read from the latest state, so only IDs and field names need
+    to be kept per step.
+
+    Args:
+        steps: One-step deltas (oldest first) from diff_states
+        latest: EVENT_ID → record at the latest version
+
+    Returns:
+        Dict with added (records), changed ([{i, set, unset}]), removed (IDs)
+    """
+    net = {}  # EVENT_ID → ('added' | 'removed' | 'upsert' | set of changed fields)
+
+    for step in steps:
+        for event_id in step['added']:
+            # Removed then re-added within the window → replace the whole record
+            net[event_id] = 'upsert' if net.get(event_id) == 'removed' else 'added'
+
+        for event_id, fields in step['changed'].items():
+            state = net.get(event_id)
+            if state in ('added', 'upsert'):
+                continue
+            net[event_id] = (state or set()) | set(fields)
+
+        for event_id in step['removed']:
+            if net.get(event_id) == 'added':
+                del net[event_id]  # Added and removed inside the window → no-op
+            else:
+                net[event_id] = 'removed'
+
+    added, changed, removed = [], [], []
+    for event_id in sorted(net):
+        state = net[event_id]
+        if state == 'removed':
+            removed.append(event_id)
+        elif state in ('added', 'upsert'):
+            added.append(latest[event_id])
+        else:
+            record = latest[event_id]
+            changed.append({
+                'i': event_id,
+                'set': {k: record[k] for k in sorted(state) if k in record},
+                'unset': sorted(k for k in state if k not in record)
+            })
+
+    return {'added': added, 'changed': changed, 'removed': removed}
+
+
+def load_changelog_state(state_path: str) -> Dict:
+    """
+    Load the persisted changelog state (empty state on first run)
+
+    Returns:
+        Dict with seq, version, events (EVENT_ID → record), steps, snapshots
+    """
+    try:
+        with open(state_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'format': FEED_FORMAT_VERSION, 'seq': 0, 'version': '', 'events': {}, 'steps': [], 'snapshots': []}
+
+
+def update_changelog(records: List[Dict], generated_at: str, state_path: str, output_dir: str,
+                     retain_versions: int = CHANGELOG_RETAIN_VERSIONS,
+                     snapshot_interval: int = CHANGELOG_SNAPSHOT_INTERVAL) -> Dict:
+    """
+    Advance the changelog to the current records and write delta artifacts
+
+    Files written to output_dir:
+        - index.json: latest version, retained delta bases, latest snapshot
+        - delta-{N}.json: cumulative N→latest delta for each retained N
+        - snapshot-{S}.json: full state every snapshot_interval versions
+
+    Args:
+        records: Short-key records from build_feed_records
+        generated_at: Timestamp string
+        state_path: JSON file holding the previous published state (not served)
+        output_dir: Changelog directory on the static host
+        retain_versions: Number of one-step deltas to keep
+        snapshot_interval: Versions between full snapshots
+
+    Returns:
+        Changelog index dict (same content as index.json)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    state = load_changelog_state(state_path)
+    current = records_by_id(records)
+    content_version = compute_version(current)
+
+    if content_version != state['version']:
+        step = diff_states(state['events'], current)
+        state['seq'] += 1
+        state['version'] = content_version
+        state['events'] = current
+        state['steps'].append({'seq': state['seq'], 'generated': generated_at, **step})
+
+        if state['seq'] == 1 or state['seq'] % snapshot_interval == 0:
+            snapshot = {
+                'format': FEED_FORMAT_VERSION,
+                'seq': state['seq'],
+                'version': content_version,
+                'generated': generated_at,
+                'events': [current[event_id] for event_id in sorted(current)]
+            }
+            write_precompressed(os.path.join(output_dir, f"snapshot-{state['seq']}.json"),
+                                encode_json(snapshot), content_version)
+            state['snapshots'] = (state['snapshots'] + [state['seq']])[-2:]
+
+        # Compact: drop steps older than the retention window
+        state['steps'] = state['steps'][-retain_versions:]
+
+    latest_seq = state['seq']
+    oldest_base = max(1, state['steps'][0]['seq'] - 1) if state['steps'] else latest_seq
+
+    # Cumulative N→latest deltas for every retained base version
+    delta_entries = []
+    for index, step in enumerate(state['steps']):
+        base_seq = step['seq'] - 1
+        if base_seq < 1:
+            continue
+        delta = compose_steps(state['steps'][index:], state['events'])
+        document = {
+            'format': FEED_FORMAT_VERSION,
+            'from': base_seq,
+            'to': latest_seq,
+            'version': state['version'],
+            'generated': generated_at,
+            **delta
+        }
+        variants = write_precompressed(os.path.join(output_dir, f"delta-{base_seq}.json"),
+                                       encode_json(document), f"{state['version']}-{base_seq}")
+        delta_entries.append({
+            'from': base_seq,
+            'path': f"delta-{base_seq}.json",
+            'added': len(delta['added']),
+            'changed': len(delta['changed']),
+            'removed': len(delta['removed']),
+            'bytes': variants['gzip']['bytes']
+        })
+
+    # Remove delta/snapshot files that fell out of the window
+    keep = {entry['path'] for entry in delta_entries} | {f"snapshot-{seq}.json" for seq in state['snapshots']}
+    for filename in os.listdir(output_dir):
+        if filename.startswith(('delta-', 'snapshot-')) and filename.split('.json', 1)[0] + '.json' not in keep:
+            os.remove(os.path.join(output_dir, filename))
+
+    index = {
+        'format': FEED_FORMAT_VERSION,
+        'latest': latest_seq,
+        'version': state['version'],
+        'generated': generated_at,
+        'oldest_base': oldest_base,
+        'snapshot': {
+            'seq': state['snapshots'][-1],
+            'path': f"snapshot-{state['snapshots'][-1]}.json"
+        } if state['snapshots'] else None,
+        'deltas': delta_entries
+    }
+    write_precompressed(os.path.join(output_dir, 'index.json'), encode_json(index),
+                        f"{state['version']}-{latest_seq}")
+
+    write_atomic(state_path, encode_json(state))
+
+    return index
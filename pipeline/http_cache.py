@@ -0,0 +1,84 @@
+"""
+Persistent JSON cache for HTTP-derived pipeline data
+
+Entries are keyed by URL and carry their own expiry plus the validators
+(ETag / Last-Modified) needed to revalidate with a conditional request
+once they go stale. The cache file is rewritten atomically on save.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+class JsonCache:
+    """
+    URL-keyed cache persisted to a JSON file
+
+    Each entry is a dict; the cache adds:
+        - fetched_at: epoch seconds of the last fetch/revalidation
+        - expires_at: epoch seconds after which the entry is stale
+    """
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load entries from disk (missing or corrupt file → empty cache)"""
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        """Write entries to disk if anything changed"""
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Entry for key, fresh or stale (None if never cached)"""
+        return self.entries.get(key)
+
+    def get_fresh(self, key: str) -> Optional[Dict]:
+        """Entry for key only if it has not expired"""
+        entry = self.entries.get(key)
+        if entry and entry.get('expires_at', 0) > time.time():
+            return entry
+        return None
+
+    def put(self, key: str, entry: Dict, ttl_seconds: Optional[float] = None):
+        """Store entry, stamping fetched_at/expires_at"""
+        now = time.time()
+        entry = dict(entry)
+        entry['fetched_at'] = now
+        entry['expires_at'] = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        self.entries[key] = entry
+        self.dirty = True
+
+    def touch(self, key: str, ttl_seconds: Optional[float] = None):
+        """Extend a revalidated entry's expiry without changing its data"""
+        if key in self.entries:
+            self.put(key, self.entries[key], ttl_seconds)
+
+    def prune(self, max_stale_seconds: float):
+        """Drop entries that have been stale for longer than max_stale_seconds"""
+        cutoff = time.time() - max_stale_seconds
+        stale = [k for k, e in self.entries.items() if e.get('expires_at', 0) < cutoff]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.dirty = True
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Artist image bank for Job 3 (enrichment)
+
+Python port of AutoPublish.gs enrichMissingImages (tier 1): an event with no
+image reuses the image of the same artist at the same venue family, e.g.
+"Coldplay Live 2026 | The O2 Arena, London" reuses the image already
+published for "Coldplay | The O2, London".
+
+The bank is a persistent "artistKey|venueFamily" → image URL index
+(IMAGE_BANK_FILE). Every run adds the historical PUBLISHED rows (if exported)
+and the staged rows that already carry an image, then fills missing images
+with hash lookups - one pass over the rows, no per-row sheet scans.
+
+Usage:
+    python3 pipeline/image_bank.py --rebuild    Rebuild the bank from published-events-data.json
+"""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.config import IMAGE_BANK_FILE, PUBLISHED_EVENTS_DATA_FILE
+
+IMAGE_BANK_FORMAT = 1
+
+# Ordered (pattern, exclude, family) rules from AutoPublish.gs normalizeVenueFamily
+VENUE_FAMILY_RULES = [
+    (r'\b(the\s*)?o2\b', r'indigo|apollo|victoria|forum|kentish|academy|ritz', 'o2main'),
+    (r'indigo.*o2|o2.*indigo', None, 'indigoo2'),
+    (r'wembley\s*(stadium)?', r'arena|ovo|sse', 'wembleystadium'),
+    (r'ovo.*arena.*wembley|wembley.*ovo', None, 'ovowembley'),
+    (r'motorpoint.*nottingham|nottingham.*(motorpoint|arena)', None, 'motorpointnott'),
+    (r'southbank|rfh|qeh|purcell|royal\s*festival', None, 'southbank'),
+    (r'alexandra\s*palace', None, 'allypal'),
+    (r'eventim\s*apollo|hammersmith.*(apollo|eventim)', None, 'eventimapollo'),
+    (r'utilita.*sheffield|sheffield.*(utilita|arena)', None, 'utilitasheff'),
+    (r'ao\s*arena|manchester\s*arena', None, 'aomanc'),
+    (r'ovo\s*hydro|glasgow.*hydro', None, 'ovohydro'),
+    (r'bp\s*pulse', None, 'bppulse'),
+    (r'm&?s\s*bank|liverpool.*arena', None, 'msbankliverpool'),
+    (r'bournemouth', None, 'bournemouth'),
+    (r'o2.*apollo.*manchester|manchester.*o2.*apollo', None, 'o2apollomanc'),
+    (r'3\s*arena.*dublin|dublin.*3\s*arena', None, '3arenadublin'),
+    (r'stamford\s*bridge', None, 'stamfordbridge'),
+    (r'emirates\s*stadium', r'o2|wembley', 'emiratesstadium'),
+    (r'london\s*stadium', None, 'londonstadium'),
+    (r'anfield', None, 'anfield'),
+    (r'first\s*direct\s*arena', None, 'firstdirectleeds'),
+    (r'o2.*academy.*brixton|brixton.*academy', None, 'o2brixton'),
+    (r'o2.*victoria.*manchester|manchester.*o2.*victoria', None, 'o2vicmanc'),
+    (r'royal\s*albert\s*hall', None, 'rah'),
+    (r'pudding\s*mill\s*lane|abba\s*arena', None, 'abbaarena'),
+]
+_VENUE_FAMILY_RULES = [
+    (re.compile(pattern), re.compile(exclude) if exclude else None, family)
+    for pattern, exclude, family in VENUE_FAMILY_RULES
+]
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+_VENUE_STOPWORDS = re.compile(r'\b(the|arena|stadium|centre|center|at)\b')
+_BRACKETED = re.compile(r'\s*[\(\[].*?[\)\]]')
+_SUPPORT_ACTS = re.compile(r'\s*[&+]\s*Support\s*Acts?\s*(tbc)?', re.IGNORECASE)
+_CONCERT_SUFFIX = re.compile(r'\s*concerts?$', re.IGNORECASE)
+_LIVE_SUFFIX = re.compile(r'\s*\blive\b$', re.IGNORECASE)
+_TOUR_SUFFIX = re.compile(r'\s*\btour\b$', re.IGNORECASE)
+_SHOW_SUFFIX = re.compile(r'\s*\bshow\b$', re.IGNORECASE)
+_YEAR_SUFFIX = re.compile(r'\s*\b\d{4}\b$')
+_AMPERSAND = re.compile(r'\s*&\s*')
+_TITLE_SEPARATOR = re.compile(r'\s*[:\-–—]\s*')
+
+
+def normalize_for_image_match(text: str) -> str:
+    """
+    Lowercase and strip everything but a-z/0-9 (AutoPublish.gs normalizeForImageMatch)
+
+    Example:
+        normalize_for_image_match("Guns N' Roses")
+        Returns: "gunsnroses"
+    """
+    return _NON_ALNUM.sub('', (text or '').lower())
+
+
+def normalize_venue_family(venue: str) -> str:
+    """
+    Map venue spellings to a family identifier (AutoPublish.gs normalizeVenueFamily)
+
+    Example:
+        normalize_venue_family("The O2 Arena, London")
+        Returns: "o2main"
+    """
+    v = (venue or '').lower()
+    for pattern, exclude, family in _VENUE_FAMILY_RULES:
+        if pattern.search(v) and not (exclude and exclude.search(v)):
+            return family
+
+    # Fallback: strip common words
+    return _NON_ALNUM.sub('', _VENUE_STOPWORDS.sub('', v))
+
+
+def extract_artist_keys(event_name: str) -> List[str]:
+    """
+    Normalized artist keys for an event name, most specific first
+    (AutoPublish.gs extractArtistKeys)
+
+    Example:
+        extract_artist_keys("Coldplay: Music Of The Spheres Live")
+        Returns: ["coldplaymusicofthesphereslive", "coldplaymusicofthespheres", "coldplay"]
+    """
+    name = str(event_name or '').strip()
+    keys = []
+
+    def add_key(text):
+        key = normalize_for_image_match(text)
+        if len(key) >= 3 and key not in keys:
+            keys.append(key)
+
+    add_key(name)
+
+    stripped = _BRACKETED.sub('', name)
+    stripped = _SUPPORT_ACTS.sub('', stripped)
+    for suffix in (_CONCERT_SUFFIX, _LIVE_SUFFIX, _TOUR_SUFFIX, _SHOW_SUFFIX, _YEAR_SUFFIX):
+        stripped = suffix.sub('', stripped)
+    stripped = stripped.strip()
+    add_key(stripped)
+
+    amp_parts = _AMPERSAND.split(stripped)
+    if len(amp_parts) > 1:
+        add_key(_CONCERT_SUFFIX.sub('', amp_parts[0]).strip())
+
+    no_type = _LIVE_SUFFIX.sub('', _CONCERT_SUFFIX.sub('', stripped)).strip()
+    add_key(no_type)
+
+    title_parts = _TITLE_SEPARATOR.split(no_type)
+    if len(title_parts) > 1 and len(title_parts[0].strip()) >= 3:
+        add_key(title_parts[0].strip())
+
+    return keys
+
+
+def get_bank_keys(event_name: str, venue: str) -> List[str]:
+    """
+    Bank keys "artistKey|venueFamily" for an event, in lookup order
+
+    Example:
+        get_bank_keys("Coldplay Live", "The O2, London")
+        Returns: ["coldplaylive|o2main", "coldplay|o2main"]
+    """
+    venue_family = normalize_venue_family(venue)
+    return [f"{artist_key}|{venue_family}" for artist_key in extract_artist_keys(event_name)]
+
+
+def load_image_bank(path: str = IMAGE_BANK_FILE) -> Dict:
+    """
+    Load the persisted image bank (empty bank on first run)
+
+    Returns:
+        Dict with format, updated, entries ("artistKey|venueFamily" → image URL)
+    """
+    try:
+        with open(path, 'r') as f:
+            bank = json.load(f)
+        if bank.get('format') == IMAGE_BANK_FORMAT:
+            return bank
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return {'format': IMAGE_BANK_FORMAT, 'updated': '', 'entries': {}}
+
+
+def save_image_bank(bank: Dict, path: str = IMAGE_BANK_FILE):
+    """Write the bank via a temp file + rename"""
+    bank['updated'] = datetime.now().isoformat(timespec='seconds')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(bank, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _find_column(headers: list, names: tuple) -> int:
+    """Index of the first header matching one of names (case/underscore-insensitive), else -1"""
+    normalized = [str(h).strip().upper().replace('_', ' ') for h in headers]
+    for name in names:
+        if name in normalized:
+            return normalized.index(name)
+    return -1
+
+
+def add_rows_to_bank(bank: Dict, sheet_data: list, ignore_images: Optional[set] = None) -> int:
+    """
+    Index every row that has an image (first image seen for a key wins, as in AutoPublish.gs)
+
+    Works for PUBLISHED rows (EVENT / VENUE / IMAGE URL) and STAGED_EVENTS rows
+    (EVENT_NAME / VENUE_NAME / IMAGE_URL_OVERRIDE or IMAGE_URL).
+
+    Args:
+        bank: Bank from load_image_bank (updated in place)
+        sheet_data: 2D array (headers + rows)
+        ignore_images: Image URLs that must not be banked (venue/category defaults)
+
+    Returns:
+        Number of new keys added
+    """
+    if not sheet_data or len(sheet_data) < 2:
+        return 0
+
+    headers = sheet_data[0]
+    event_idx = _find_column(headers, ('EVENT NAME', 'EVENT'))
+    venue_idx = _find_column(headers, ('VENUE NAME', 'VENUE'))
+    image_indexes = [i for i in (_find_column(headers, ('IMAGE URL OVERRIDE',)),
+                                 _find_column(headers, ('IMAGE URL',))) if i >= 0]
+    if event_idx < 0 or not image_indexes:
+        return 0
+
+    ignore_images = ignore_images or set()
+    entries = bank['entries']
+    added = 0
+
+    for row in sheet_data[1:]:
+        image_url = ""
+        for idx in image_indexes:
+            value = str(row[idx]).strip() if idx < len(row) else ""
+            if value:
+                image_url = value
+                break
+        if not image_url or image_url in ignore_images:
+            continue
+
+        event_name = row[event_idx] if event_idx < len(row) else ""
+        venue = row[venue_idx] if 0 <= venue_idx < len(row) else ""
+        for key in get_bank_keys(event_name, venue):
+            if key not in entries:
+                entries[key] = image_url
+                added += 1
+
+    return added
+
+
+def lookup_image(bank: Dict, event_name: str, venue: str) -> str:
+    """
+    Image for an event from the bank (most specific artist key first)
+
+    Returns:
+        Image URL or empty string
+    """
+    entries = bank['entries']
+    for key in get_bank_keys(event_name, venue):
+        image_url = entries.get(key)
+        if image_url:
+            return image_url
+    return ""
+
+
+def load_published_rows(path: str = PUBLISHED_EVENTS_DATA_FILE) -> list:
+    """Historical PUBLISHED sheet export (empty list if not exported)"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def main():
+    """Rebuild the bank from scratch from the PUBLISHED export"""
+    if '--rebuild' not in sys.argv:
+        print(__doc__)
+        return
+
+    print("=" * 70)
+    print("🖼️  REBUILD IMAGE BANK")
+    print("=" * 70)
+
+    published_rows = load_published_rows()
+    if not published_rows:
+        print(f"❌ Error: {PUBLISHED_EVENTS_DATA_FILE} not found or empty")
+        sys.exit(1)
+
+    bank = {'format': IMAGE_BANK_FORMAT, 'updated': '', 'entries': {}}
+    added = add_rows_to_bank(bank, published_rows)
+    save_image_bank(bank)
+
+    print(f"✅ Indexed {len(published_rows) - 1} published rows → {added} keys")
+    print(f"💾 Saved to: {IMAGE_BANK_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Event image cache and thumbnails for the compact feed (Job 5)
+
+IMAGE_URLs point at full-size third-party assets (fbcdn, ticketmaster, ...).
+This stage downloads each distinct image once, stores it content-hashed and
+writes small WebP thumbnails to the static host, so the app can load
+thumbnails with known dimensions instead of multi-megabyte originals:
+- Originals: IMAGE_CACHE_DIR/{hash} (identical images from different URLs
+  are stored once)
+- Thumbnails: FEED_OUTPUT_DIR/FEED_IMAGE_DIR/{hash}-{width}.webp for each
+  IMAGE_THUMB_WIDTHS (never upscaled)
+- Index: IMAGE_CACHE_INDEX_FILE keyed by URL with hash, width, height and a
+  tiny base64 WebP blur placeholder. Entries are revalidated with
+  If-None-Match / If-Modified-Since after IMAGE_CACHE_TTL_HOURS, so an
+  unchanged URL is never downloaded again.
+
+Feed records gain mt (thumbnail hash), mw/mh (original width/height) and
+mb (blur placeholder data URI).
+
+Requires the optional `aiohttp` (download) and `Pillow` (thumbnails)
+packages; without them images already in the cache are still attached and
+nothing new is fetched.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import os
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+from pipeline.config import (
+    IMAGE_CACHE_DIR, IMAGE_CACHE_INDEX_FILE, IMAGE_CACHE_TTL_HOURS, IMAGE_MAX_BYTES,
+    IMAGE_THUMB_WIDTHS, IMAGE_THUMB_QUALITY, IMAGE_PLACEHOLDER_SIZE, FEED_IMAGE_DIR,
+    HTTP_TOTAL_CONCURRENCY, HTTP_PER_HOST_CONCURRENCY, HTTP_TIMEOUT_SECONDS, HTTP_USER_AGENT
+)
+from pipeline.http_cache import JsonCache
+
+# Check if aiohttp is available
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Check if Pillow is available
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Failed downloads are retried sooner than successful ones expire
+FAILURE_TTL_SECONDS = 6 * 3600
+
+
+def content_hash(data: bytes) -> str:
+    """First 16 hex chars of the SHA-256 of the image bytes"""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def thumbnail_filename(image_hash: str, width: int) -> str:
+    """
+    Thumbnail file name, as built by the app from mt and a width
+
+    Example:
+        thumbnail_filename("3f9a0c1b2d4e5f60", 320)
+        Returns: "3f9a0c1b2d4e5f60-320.webp"
+    """
+    return f"{image_hash}-{width}.webp"
+
+
+def make_thumbnails(data: bytes, image_hash: str, thumb_dir: str) -> Dict:
+    """
+    Decode an image, write its WebP thumbnails and build the blur placeholder
+
+    Args:
+        data: Original image bytes
+        image_hash: content_hash(data)
+        thumb_dir: Directory for the thumbnails
+
+    Returns:
+        Dict with width, height, blur (data URI)
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        image.seek(0)  # First frame of animated GIF/WebP
+        width, height = image.size
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        for target_width in IMAGE_THUMB_WIDTHS:
+            path = os.path.join(thumb_dir, thumbnail_filename(image_hash, target_width))
+            if os.path.exists(path):
+                continue
+            thumb = image
+            if width > target_width:
+                thumb = image.resize((target_width, max(1, round(height * target_width / width))), Image.LANCZOS)
+            tmp_path = f"{path}.tmp"
+            thumb.save(tmp_path, 'WEBP', quality=IMAGE_THUMB_QUALITY, method=6)
+            os.replace(tmp_path, path)
+
+        tiny = image.copy()
+        tiny.thumbnail((IMAGE_PLACEHOLDER_SIZE, IMAGE_PLACEHOLDER_SIZE))
+        buffer = io.BytesIO()
+        tiny.save(buffer, 'WEBP', quality=30)
+
+    return {
+        'width': width,
+        'height': height,
+        'blur': 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+    }
+
+
+def has_thumbnails(entry: Dict, thumb_dir: str) -> bool:
+    """True if the entry was processed and all its thumbnails exist on disk"""
+    if not entry or not entry.get('hash') or not entry.get('width'):
+        return False
+    return all(
+        os.path.exists(os.path.join(thumb_dir, thumbnail_filename(entry['hash'], w)))
+        for w in IMAGE_THUMB_WIDTHS
+    )
+
+
+def _original_path(image_hash: str) -> str:
+    return os.path.join(IMAGE_CACHE_DIR, image_hash)
+
+
+async def _fetch_one(session, url: str, cache: JsonCache, thumb_dir: str, host_limits: Dict,
+                     total_limit: asyncio.Semaphore, stats: Dict):
+    """Download (or revalidate) one image URL and store the original content-hashed"""
+    entry = cache.get(url) or {}
+    if cache.get_fresh(url) is not None and has_thumbnails(entry, thumb_dir):
+        stats['cache_hits'] += 1
+        return
+
+    headers = {}
+    if entry.get('hash') and os.path.exists(_original_path(entry['hash'])):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    host = urlsplit(url).netloc.lower()
+    host_limit = host_limits.setdefault(host, asyncio.Semaphore(HTTP_PER_HOST_CONCURRENCY))
+
+    try:
+        # Host slot first: waiting for a busy host must not hold a total slot
+        async with host_limit, total_limit:
+            async with session.get(url, headers=headers, allow_redirects=True) as response:
+                if response.status == 304 and headers:
+                    stats['revalidated'] += 1
+                    cache.touch(url)
+                    return
+
+                if response.status != 200:
+                    stats['failed'] += 1
+                    cache.put(url, {**entry, 'status': response.status}, FAILURE_TTL_SECONDS)
+                    return
+
+                data = await response.content.read(IMAGE_MAX_BYTES + 1)
+                if len(data) > IMAGE_MAX_BYTES:
+                    stats['failed'] += 1
+                    cache.put(url, {**entry, 'status': response.status, 'error': 'too large'}, FAILURE_TTL_SECONDS)
+                    return
+
+                image_hash = content_hash(data)
+                path = _original_path(image_hash)
+                if not os.path.exists(path):
+                    with open(f"{path}.tmp", 'wb') as f:
+                        f.write(data)
+                    os.replace(f"{path}.tmp", path)
+
+                stats['downloaded'] += 1
+                stats['bytes'] += len(data)
+                keep = entry if entry.get('hash') == image_hash else {}
+                cache.put(url, {
+                    **{k: keep[k] for k in ('width', 'height', 'blur') if k in keep},
+                    'hash': image_hash,
+                    'status': response.status,
+                    'etag': response.headers.get('ETag', ''),
+                    'last_modified': response.headers.get('Last-Modified', '')
+                })
+
+    except Exception as e:
+        stats['failed'] += 1
+        cache.put(url, {**entry, 'error': str(e)[:200]}, FAILURE_TTL_SECONDS)
+
+
+async def _fetch_all(urls: List[str], cache: JsonCache, thumb_dir: str, stats: Dict):
+    """Fetch all URLs over one pooled session with total and per-host limits"""
+    connector = aiohttp.TCPConnector(limit=HTTP_TOTAL_CONCURRENCY, limit_per_host=HTTP_PER_HOST_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS * 4)
+    total_limit = asyncio.Semaphore(HTTP_TOTAL_CONCURRENCY)
+    host_limits = {}
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={'User-Agent': HTTP_USER_AGENT}) as session:
+        await asyncio.gather(*[
+            _fetch_one(session, url, cache, thumb_dir, host_limits, total_limit, stats)
+            for url in urls
+        ])
+
+
+def cache_images(urls: Iterable[str], output_dir: str) -> Tuple[Dict[str, Dict], Dict]:
+    """
+    Download, hash and thumbnail every distinct image URL
+
+    Args:
+        urls: IMAGE_URLs of the feed (duplicates handled once)
+        output_dir: Feed directory; thumbnails go to output_dir/FEED_IMAGE_DIR
+
+    Returns:
+        Tuple of ({url: {hash, width, height, blur}}, stats). Only URLs with
+        thumbnails on disk are returned.
+    """
+    thumb_dir = os.path.join(output_dir, FEED_IMAGE_DIR)
+    os.makedirs(thumb_dir, exist_ok=True)
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+
+    cache = JsonCache(IMAGE_CACHE_INDEX_FILE, IMAGE_CACHE_TTL_HOURS * 3600)
+    stats = {'cache_hits': 0, 'revalidated': 0, 'downloaded': 0, 'bytes': 0, 'failed': 0, 'processed': 0}
+    unique_urls = sorted({u.strip() for u in urls if u and u.strip().startswith(('http://', 'https://'))})
+
+    if AIOHTTP_AVAILABLE and PIL_AVAILABLE:
+        asyncio.run(_fetch_all(unique_urls, cache, thumb_dir, stats))
+    else:
+        stats['skipped'] = 'aiohttp/Pillow not installed'
+
+    # Thumbnails for new or changed originals (each hash processed once)
+    processed = {}
+    metadata = {}
+    for url in unique_urls:
+        entry = cache.get(url)
+        if not entry or not entry.get('hash'):
+            continue
+
+        image_hash = entry['hash']
+        if not has_thumbnails(entry, thumb_dir):
+            if not PIL_AVAILABLE or not os.path.exists(_original_path(image_hash)):
+                continue
+            if image_hash not in processed:
+                try:
+                    with open(_original_path(image_hash), 'rb') as f:
+                        processed[image_hash] = make_thumbnails(f.read(), image_hash, thumb_dir)
+                    stats['processed'] += 1
+                except Exception as e:
+                    processed[image_hash] = None
+                    print(f"   ⚠️  Could not decode image {url}: {e}")
+            if not processed[image_hash]:
+                continue
+            entry = {**entry, **processed[image_hash]}
+            cache.entries[url] = entry
+            cache.dirty = True
+
+        metadata[url] = {k: entry[k] for k in ('hash', 'width', 'height', 'blur')}
+
+    cache.save()
+    return metadata, stats
+
+
+def attach_image_metadata(records: List[Dict], metadata: Dict[str, Dict]) -> int:
+    """
+    Add mt/mw/mh/mb to feed records whose image (m) was cached
+
+    Returns:
+        Number of records with image metadata
+    """
+    attached = 0
+    for record in records:
+        image = metadata.get(record.get('m', ''))
+        if image:
+            record['mt'] = image['hash']
+            record['mw'] = image['width']
+            record['mh'] = image['height']
+            record['mb'] = image['blur']
+            attached += 1
+    return attached
+
+
+def prune_thumbnails(metadata: Dict[str, Dict], output_dir: str) -> int:
+    """
+    Delete thumbnails no longer referenced by the feed
+
+    Returns:
+        Number of files removed
+    """
+    thumb_dir = os.path.join(output_dir, FEED_IMAGE_DIR)
+    if not os.path.isdir(thumb_dir):
+        return 0
+
+    keep = {thumbnail_filename(m['hash'], w) for m in metadata.values() for w in IMAGE_THUMB_WIDTHS}
+    removed = 0
+    for filename in os.listdir(thumb_dir):
+        if filename not in keep:
+            os.remove(os.path.join(thumb_dir, filename))
+            removed += 1
+    return removed
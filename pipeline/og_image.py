@@ -0,0 +1,211 @@
+"""
+Concurrent og:image resolver for Job 3 (enrichment)
+
+Resolves the og:image of event ticket pages so rows without an image get an
+event-specific picture before falling back to venue/category defaults.
+
+- One pooled aiohttp session (keep-alive connections reused across URLs)
+- Per-host concurrency limit so a single ticketing site is never hammered
+- Reads only the document <head> (stops at </head>/<body> or a byte cap)
+- Persistent cache keyed by ticket URL with TTL; stale entries are
+  revalidated with If-None-Match / If-Modified-Since, so a 304 costs no
+  body download
+
+Requires the optional `aiohttp` package; without it resolve_og_images()
+returns no images and enrichment falls back exactly as before.
+"""
+
+import asyncio
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from pipeline.config import (
+    OG_IMAGE_CACHE_FILE, OG_IMAGE_CACHE_TTL_HOURS, OG_IMAGE_MAX_HEAD_BYTES,
+    HTTP_TOTAL_CONCURRENCY, HTTP_PER_HOST_CONCURRENCY, HTTP_TIMEOUT_SECONDS, HTTP_USER_AGENT
+)
+from pipeline.http_cache import JsonCache
+
+# Check if aiohttp is available
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Meta tags checked in priority order
+OG_IMAGE_PROPERTIES = ('og:image:secure_url', 'og:image', 'og:image:url', 'twitter:image', 'twitter:image:src')
+
+# Failed fetches are retried sooner than successful ones expire
+FAILURE_TTL_SECONDS = 3600
+
+
+class _HeadMetaParser(HTMLParser):
+    """Collects <meta property/name=... content=...> until the head ends"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'body':
+            self.done = True
+            return
+        if tag != 'meta':
+            return
+        attrs = dict(attrs)
+        key = (attrs.get('property') or attrs.get('name') or '').strip().lower()
+        content = (attrs.get('content') or '').strip()
+        if key in OG_IMAGE_PROPERTIES and content and key not in self.meta:
+            self.meta[key] = content
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.done = True
+
+
+def extract_og_image(head_html: str, page_url: str) -> str:
+    """
+    Extract the og:image (or twitter:image) URL from a document head
+
+    Args:
+        head_html: HTML up to (at least) the end of <head>
+        page_url: Page URL, used to resolve relative image URLs
+
+    Returns:
+        Absolute image URL or empty string
+
+    Example:
+        extract_og_image('<meta property="og:image" content="/img/a.jpg">', "https://www.theo2.co.uk/events/x")
+        Returns: "https://www.theo2.co.uk/img/a.jpg"
+    """
+    parser = _HeadMetaParser()
+    try:
+        parser.feed(head_html)
+    except Exception:
+        pass
+
+    for key in OG_IMAGE_PROPERTIES:
+        if key in parser.meta:
+            return urljoin(page_url, parser.meta[key])
+
+    return ""
+
+
+async def _read_head(response, max_bytes: int) -> str:
+    """Read the response body only until </head> (or <body>) or max_bytes"""
+    chunks = []
+    total = 0
+    async for chunk in response.content.iter_chunked(8192):
+        chunks.append(chunk)
+        total += len(chunk)
+        tail = b''.join(chunks[-2:]).lower()
+        if b'</head>' in tail or b'<body' in tail or total >= max_bytes:
+            break
+
+    charset = response.charset or 'utf-8'
+    return b''.join(chunks).decode(charset, errors='replace')
+
+
+async def _resolve_one(session, url: str, cache: JsonCache, host_limits: Dict,
+                       total_limit: asyncio.Semaphore, stats: Dict) -> Tuple[str, str]:
+    """Resolve one ticket URL, using/revalidating the cache entry"""
+    fresh = cache.get_fresh(url)
+    if fresh is not None:
+        stats['cache_hits'] += 1
+        return url, fresh.get('image', '')
+
+    stale = cache.get(url) or {}
+    headers = {}
+    if stale.get('etag'):
+        headers['If-None-Match'] = stale['etag']
+    if stale.get('last_modified'):
+        headers['If-Modified-Since'] = stale['last_modified']
+
+    host = urlsplit(url).netloc.lower()
+    host_limit = host_limits.setdefault(host, asyncio.Semaphore(HTTP_PER_HOST_CONCURRENCY))
+
+    try:
+        # Host slot first: waiting for a busy host must not hold a total slot
+        async with host_limit, total_limit:
+            async with session.get(url, headers=headers, allow_redirects=True) as response:
+                if response.status == 304 and stale:
+                    stats['revalidated'] += 1
+                    cache.touch(url)
+                    return url, stale.get('image', '')
+
+                if response.status != 200:
+                    stats['failed'] += 1
+                    cache.put(url, {'image': '', 'status': response.status}, FAILURE_TTL_SECONDS)
+                    return url, ''
+
+                head_html = await _read_head(response, OG_IMAGE_MAX_HEAD_BYTES)
+                image = extract_og_image(head_html, str(response.url))
+                stats['fetched'] += 1
+                cache.put(url, {
+                    'image': image,
+                    'status': response.status,
+                    'etag': response.headers.get('ETag', ''),
+                    'last_modified': response.headers.get('Last-Modified', '')
+                })
+                return url, image
+
+    except Exception as e:
+        stats['failed'] += 1
+        cache.put(url, {'image': stale.get('image', ''), 'error': str(e)[:200]}, FAILURE_TTL_SECONDS)
+        return url, stale.get('image', '')
+
+
+async def resolve_og_images_async(urls: Iterable[str], cache: JsonCache) -> Tuple[Dict[str, str], Dict]:
+    """
+    Resolve og:images for many URLs concurrently over one pooled session
+
+    Args:
+        urls: Ticket URLs (duplicates are fetched once)
+        cache: JsonCache for og:image entries
+
+    Returns:
+        Tuple of ({url: image_url}, stats)
+    """
+    stats = {'cache_hits': 0, 'revalidated': 0, 'fetched': 0, 'failed': 0}
+    unique_urls = sorted({u for u in urls if u and u.startswith(('http://', 'https://'))})
+    if not unique_urls:
+        return {}, stats
+
+    connector = aiohttp.TCPConnector(limit=HTTP_TOTAL_CONCURRENCY, limit_per_host=HTTP_PER_HOST_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+    total_limit = asyncio.Semaphore(HTTP_TOTAL_CONCURRENCY)
+    host_limits = {}
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={'User-Agent': HTTP_USER_AGENT}) as session:
+        results = await asyncio.gather(*[
+            _resolve_one(session, url, cache, host_limits, total_limit, stats)
+            for url in unique_urls
+        ])
+
+    return dict(results), stats
+
+
+def resolve_og_images(urls: Iterable[str], cache_path: Optional[str] = None) -> Tuple[Dict[str, str], Dict]:
+    """
+    Synchronous entry point used by enrichment
+
+    Args:
+        urls: Ticket URLs
+        cache_path: Cache file (default: OG_IMAGE_CACHE_FILE)
+
+    Returns:
+        Tuple of ({url: image_url}, stats); empty when aiohttp is not installed
+    """
+    if not AIOHTTP_AVAILABLE:
+        return {}, {'skipped': 'aiohttp not installed'}
+
+    cache = JsonCache(cache_path or OG_IMAGE_CACHE_FILE, OG_IMAGE_CACHE_TTL_HOURS * 3600)
+    images, stats = asyncio.run(resolve_og_images_async(urls, cache))
+    cache.save()
+
+    return images, stats
@@ -0,0 +1,386 @@
+"""
+Compact JSON feed for the PWA, generated by Job 5 (export)
+
+Instead of the full published sheet as CSV, the app can load a compact JSON
+feed served straight from the static host:
+- Short keys (see FEED_KEYS in config.py), empty values omitted
+- Venues, cities and categories dictionary-encoded (stored once, referenced by index)
+- Content version hash (stable across runs when the data is unchanged)
+- Pre-gzipped and pre-brotli'd variants plus ETag metadata
+- Shards partitioned by month and region (BSL/ISL) with an index manifest,
+  so clients fetch only what they show and one month's change only
+  invalidates that shard
+
+Brotli output requires the optional `brotli` package; without it only the
+identity and gzip variants are written.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from pipeline.config import FEED_KEYS, FEED_DICT_KEYS, FEED_IMAGE_KEYS, FEED_FORMAT_VERSION
+from pipeline.utils import get_language_from_country
+
+# Check if brotli is available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+def get_staged_value(row: list, col_map: dict, columns) -> str:
+    """
+    Read the first non-empty value among one or more STAGED_EVENTS columns
+
+    Args:
+        row: Event row
+        col_map: Header name → index
+        columns: Column name or tuple of fallback column names
+
+    Returns:
+        Stripped string value or empty string
+    """
+    if isinstance(columns, str):
+        columns = (columns,)
+
+    for column in columns:
+        idx = col_map.get(column, -1)
+        if 0 <= idx < len(row):
+            value = str(row[idx]).strip()
+            if value:
+                return value
+
+    return ""
+
+
+def build_feed_records(events: list, headers: list) -> List[Dict]:
+    """
+    Convert STAGED_EVENTS rows to short-key records (before dictionary encoding)
+
+    Args:
+        events: List of event rows
+        headers: Column headers from STAGED_EVENTS
+
+    Returns:
+        List of dicts keyed by FEED_KEYS short keys (empty values omitted)
+
+    Example:
+        build_feed_records([["abc", "2026-06-15", ...]], STAGED_EVENTS_COLUMNS)
+        Returns: [{"i": "abc", "d": "2026-06-15", "n": "Taylor Swift", "v": "Wembley Stadium", ...}]
+    """
+    col_map = {h: i for i, h in enumerate(headers)}
+    records = []
+
+    for row in events:
+        record = {}
+        for short_key, columns in FEED_KEYS.items():
+            value = get_staged_value(row, col_map, columns)
+            if value:
+                record[short_key] = value
+        records.append(record)
+
+    records.sort(key=lambda r: (r.get('d', '9999-99-99'), r.get('t', ''), r.get('n', ''), r.get('i', '')))
+    return records
+
+
+def dictionary_encode(records: List[Dict]) -> tuple:
+    """
+    Replace venue, city and category strings with indexes into shared tables
+
+    Tables are sorted so the same set of values always encodes identically.
+
+    Args:
+        records: Short-key records from build_feed_records
+
+    Returns:
+        Tuple of (encoded_records, dictionaries)
+
+    Example:
+        dictionary_encode([{"v": "The O2"}, {"v": "Wembley"}, {"v": "The O2"}])
+        Returns: ([{"v": 0}, {"v": 1}, {"v": 0}], {"v": ["The O2", "Wembley"]})
+    """
+    dictionaries = {
+        key: sorted({r[key] for r in records if key in r})
+        for key in FEED_DICT_KEYS
+    }
+    lookups = {
+        key: {value: i for i, value in enumerate(values)}
+        for key, values in dictionaries.items()
+    }
+
+    encoded = []
+    for record in records:
+        encoded_record = dict(record)
+        for key, lookup in lookups.items():
+            if key in encoded_record:
+                encoded_record[key] = lookup[encoded_record[key]]
+        encoded.append(encoded_record)
+
+    return encoded, dictionaries
+
+
+def compute_version(content) -> str:
+    """
+    Content hash used as the feed version and ETag (first 16 chars of SHA-256)
+
+    Args:
+        content: Any JSON-serialisable value
+
+    Returns:
+        16-character hex digest
+    """
+    canonical = json.dumps(content, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def build_feed(events: list, headers: list, generated_at: str) -> Dict:
+    """
+    Build the compact feed document
+
+    Args:
+        events: Current approved event rows
+        headers: Column headers from STAGED_EVENTS
+        generated_at: Timestamp string for the LAST_UPDATED equivalent
+
+    Returns:
+        Feed dict: {format, version, generated, count, keys, dicts, events}
+    """
+    return build_feed_from_records(build_feed_records(events, headers), generated_at)
+
+
+def build_feed_from_records(records: List[Dict], generated_at: str) -> Dict:
+    """
+    Build a feed document from short-key records (full feed or one shard)
+
+    Args:
+        records: Sorted short-key records from build_feed_records
+        generated_at: Timestamp string
+
+    Returns:
+        Feed dict: {format, version, generated, count, keys, dicts, events}
+    """
+    encoded, dictionaries = dictionary_encode(records)
+
+    body = {
+        'format': FEED_FORMAT_VERSION,
+        'keys': {**{k: (v if isinstance(v, str) else v[0]) for k, v in FEED_KEYS.items()}, **FEED_IMAGE_KEYS},
+        'dicts': dictionaries,
+        'events': encoded
+    }
+
+    # Version hashes the content only, so an unchanged feed keeps its ETag
+    return {
+        'format': FEED_FORMAT_VERSION,
+        'version': compute_version(body),
+        'generated': generated_at,
+        'count': len(encoded),
+        'keys': body['keys'],
+        'dicts': dictionaries,
+        'events': encoded
+    }
+
+
+def encode_json(document) -> bytes:
+    """Serialise without whitespace (UTF-8, non-ASCII kept as-is)"""
+    return json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def write_atomic(path: str, data: bytes):
+    """Write bytes via a temp file + rename so the static host never serves a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_precompressed(path: str, data: bytes, etag_base: str,
+                        content_type: str = 'application/json') -> Dict:
+    """
+    Write identity, gzip and (if available) brotli variants of one artifact
+
+    Compression is deterministic (gzip mtime=0) so unchanged content produces
+    byte-identical files.
+
+    Args:
+        path: Output path for the identity variant (e.g. feed/events.json)
+        data: Uncompressed bytes
+        etag_base: Content version used to build strong ETags per variant
+
+    Returns:
+        Dict of variant name → {path, bytes, etag, content_type, content_encoding}
+    """
+    variants = {}
+
+    def record(name, variant_path, payload, encoding, etag):
+        write_atomic(variant_path, payload)
+        variants[name] = {
+            'path': os.path.basename(variant_path),
+            'bytes': len(payload),
+            'etag': f'"{etag}"',
+            'content_type': content_type,
+            'content_encoding': encoding
+        }
+
+    record('identity', path, data, None, etag_base)
+    record('gzip', f"{path}.gz", gzip.compress(data, compresslevel=9, mtime=0), 'gzip', f"{etag_base}-gz")
+
+    if BROTLI_AVAILABLE:
+        record('br', f"{path}.br", brotli.compress(data, quality=11), 'br', f"{etag_base}-br")
+
+    return variants
+
+
+def write_feed_artifacts(feed: Dict, output_dir: str, name: str = 'events') -> Dict:
+    """
+    Write the feed, its compressed variants and ETag metadata
+
+    Files written to output_dir:
+        - {name}.json, {name}.json.gz, {name}.json.br (brotli optional)
+        - {name}.meta.json (version, count, per-variant size and ETag)
+
+    Args:
+        feed: Feed dict from build_feed
+        output_dir: Directory to write into (created if missing)
+        name: Base filename
+
+    Returns:
+        Metadata dict (same content as {name}.meta.json)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    data = encode_json(feed)
+    variants = write_precompressed(os.path.join(output_dir, f"{name}.json"), data, feed['version'])
+
+    meta = {
+        'format': feed['format'],
+        'version': feed['version'],
+        'generated': feed['generated'],
+        'count': feed['count'],
+        'variants': variants
+    }
+    write_atomic(os.path.join(output_dir, f"{name}.meta.json"), encode_json(meta))
+
+    return meta
+
+
+def get_record_region(record: Dict) -> str:
+    """
+    Region of a feed record: its sign language, derived from COUNTRY when unset
+
+    Example:
+        get_record_region({"k": "Ireland"})
+        Returns: "isl"
+    """
+    language = record.get('l', '').strip().upper()
+    if language not in ('BSL', 'ISL'):
+        language = get_language_from_country(record.get('k', ''))
+    return language.lower()
+
+
+def get_shard_key(record: Dict) -> str:
+    """
+    Shard key "YYYY-MM-region" for a record (undated events go to "undated-region")
+
+    Example:
+        get_shard_key({"d": "2026-06-15", "l": "BSL"})
+        Returns: "2026-06-bsl"
+    """
+    event_date = record.get('d', '')
+    month = event_date[:7] if len(event_date) >= 7 and event_date[4] == '-' else 'undated'
+    return f"{month}-{get_record_region(record)}"
+
+
+def partition_records(records: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Group records by shard key (order within each shard is preserved)
+
+    Args:
+        records: Sorted short-key records
+
+    Returns:
+        Dict of shard key → records
+    """
+    shards = {}
+    for record in records:
+        shards.setdefault(get_shard_key(record), []).append(record)
+    return dict(sorted(shards.items()))
+
+
+def write_shard_artifacts(records: List[Dict], generated_at: str,
+                          output_dir: str, subdir: str = 'shards') -> Dict:
+    """
+    Write one self-contained feed per month/region shard plus an index manifest
+
+    Files written:
+        - {output_dir}/{subdir}/{key}.json (+ .gz, .br, .meta.json) per shard
+        - {output_dir}/index.json (+ .gz, .br) listing every shard
+
+    Shards that no longer have events are deleted so stale months disappear.
+    A shard's version only changes when its own events change, so a client
+    or cache holding the other shards keeps them.
+
+    Args:
+        records: Sorted short-key records from build_feed_records
+        generated_at: Timestamp string
+        output_dir: Feed directory
+        subdir: Shard directory inside output_dir
+
+    Returns:
+        Index manifest dict (same content as index.json)
+    """
+    shard_dir = os.path.join(output_dir, subdir)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    shard_entries = []
+    for key, shard_records in partition_records(records).items():
+        shard_feed = build_feed_from_records(shard_records, generated_at)
+        meta = write_feed_artifacts(shard_feed, shard_dir, key)
+        month, region = key.rsplit('-', 1)
+        shard_entries.append({
+            'key': key,
+            'month': month,
+            'region': region,
+            'count': meta['count'],
+            'version': meta['version'],
+            'path': f"{subdir}/{key}.json",
+            'variants': {
+                name: {'bytes': v['bytes'], 'etag': v['etag']}
+                for name, v in meta['variants'].items()
+            }
+        })
+
+    # Remove shards that no longer exist (e.g. months now in the past)
+    current_keys = {entry['key'] for entry in shard_entries}
+    for filename in os.listdir(shard_dir):
+        key = filename.split('.', 1)[0]
+        if key not in current_keys:
+            os.remove(os.path.join(shard_dir, filename))
+
+    index_body = {
+        'format': FEED_FORMAT_VERSION,
+        'shards': [{'key': e['key'], 'version': e['version']} for e in shard_entries]
+    }
+    index = {
+        'format': FEED_FORMAT_VERSION,
+        'version': compute_version(index_body),
+        'generated': generated_at,
+        'count': sum(e['count'] for e in shard_entries),
+        'months': sorted({e['month'] for e in shard_entries}),
+        'regions': sorted({e['region'] for e in shard_entries}),
+        'shards': shard_entries
+    }
+    write_precompressed(os.path.join(output_dir, 'index.json'), encode_json(index), index['version'])
+
+    return index
+
+
+def print_artifact_sizes(meta: Dict, label: Optional[str] = None):
+    """Print one line per variant with its size"""
+    if label:
+        print(f"   {label}")
+    for variant in meta['variants'].values():
+        print(f"      {variant['path']}: {variant['bytes']:,} bytes (ETag {variant['etag']})")
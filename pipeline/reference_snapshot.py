@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Binary, memory-mapped snapshot of the reference sheets (VENUES, EVENT_CATEGORIES)
+
+Every job re-parsed venues-data.json / categories-data.json and re-derived
+the same things: normalized venue names, alias lists (a JSON cell per row,
+parsed again on every match_venue call), venue details, category keyword
+lists and the typo-correction vocabulary. compile_snapshot() derives them
+once into REFERENCE_SNAPSHOT_FILE; ReferenceSnapshot mmaps the file and reads
+fixed-width tables straight from the mapped pages, so opening it costs a few
+microseconds and forked workers share one copy.
+
+Layout (native byte order, recorded in the header - a snapshot from another
+platform is rebuilt; sections 4-byte aligned):
+    header    magic "PIRS", format, byte order, SHA-256 of the source files,
+              section count, then (name, offset, length) per section
+    strings   UTF-8 string pool + uint32 offsets; tables below store string
+              numbers
+    venues    per VENUES row: VENUE_ID, VENUE_NAME, normalized name, CITY,
+              COUNTRY, LANGUAGE, DEFAULT_TICKET_URL, DEFAULT_IMAGE_URL,
+              INTERPRETER_STATUS, first alias, alias count
+    aliases   normalized aliases (strings), grouped per venue
+    nameidx   venue numbers sorted by normalized name (binary search)
+    aliasidx  (alias string, venue number) sorted by alias (binary search)
+    cats      per category: CATEGORY_ID, DEFAULT_IMAGE_URL, first keyword,
+              keyword count
+    keywords  lowercased keywords (strings)
+    vocab     (word, count) of the venue typo-correction vocabulary
+    meta      JSON: venues_hash (venue_memo fingerprint), built, counts
+
+The snapshot is rebuilt only when the SHA-256 of the source files, the
+VENUE_MATCHER_VERSION or the code that derives the tables (this module,
+utils, event_keys, typo_correction) changes (load_reference_snapshot).
+
+Usage:
+    python3 pipeline/reference_snapshot.py [--rebuild]
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.config import REFERENCE_SNAPSHOT_FILE, VENUE_MATCHER_VERSION
+from pipeline.utils import normalize_venue_name, parse_venue_aliases, build_venue_index, build_category_index
+from pipeline.typo_correction import venue_vocabulary
+from pipeline.venue_memo import venues_fingerprint
+
+SNAPSHOT_MAGIC = b'PIRS'
+SNAPSHOT_FORMAT = 1
+
+_HEADER = struct.Struct('<4sHBx32sI')
+_SECTION = struct.Struct('<8sII')
+
+VENUE_FIELDS = ('venue_id', 'name', 'normalized_name', 'city', 'country', 'language',
+                'default_ticket_url', 'default_image_url', 'access_status', 'alias_start', 'alias_count')
+CATEGORY_FIELDS = ('category_id', 'default_image_url', 'keyword_start', 'keyword_count')
+
+_BYTE_ORDER = 0 if sys.byteorder == 'little' else 1
+
+# Modules whose code produces the precomputed tables (normalized names,
+# parsed aliases, vocabulary); editing any of them rebuilds the snapshot
+DERIVATION_MODULES = ('reference_snapshot.py', 'utils.py', 'event_keys.py', 'typo_correction.py')
+
+
+def _derivation_code_hash() -> bytes:
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in DERIVATION_MODULES:
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.digest()
+
+
+def source_hash(venues_bytes: bytes, categories_bytes: bytes) -> bytes:
+    """SHA-256 over the raw source files, the snapshot format, VENUE_MATCHER_VERSION and the derivation code"""
+    digest = hashlib.sha256(SNAPSHOT_MAGIC + struct.pack('<HI', SNAPSHOT_FORMAT, VENUE_MATCHER_VERSION))
+    digest.update(_derivation_code_hash())
+    for data in (venues_bytes, categories_bytes):
+        digest.update(struct.pack('<Q', len(data)))
+        digest.update(data)
+    return digest.digest()
+
+
+class _StringPool:
+    def __init__(self):
+        self.numbers: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def add(self, text) -> int:
+        text = "" if text is None else str(text)
+        number = self.numbers.get(text)
+        if number is None:
+            number = self.numbers[text] = len(self.encoded)
+            self.encoded.append(text.encode('utf-8'))
+        return number
+
+
+def compile_snapshot(venues_data: list, categories_data: list, hash_bytes: bytes) -> bytes:
+    """
+    Compile the reference sheets into snapshot bytes
+
+    Args:
+        venues_data: VENUES sheet data
+        categories_data: EVENT_CATEGORIES sheet data
+        hash_bytes: source_hash() of the files the data was read from
+
+    Returns:
+        The snapshot file contents
+    """
+    pool = _StringPool()
+    venues = array('I')
+    aliases = array('I')
+    name_keys = []   # (normalized name bytes, venue number)
+    alias_keys = []  # (alias bytes, venue number, alias number)
+
+    headers = venues_data[0] if venues_data else []
+    col_map = {h: i for i, h in enumerate(headers)}
+    venue_id_idx = col_map.get('VENUE_ID', -1)
+    venue_name_idx = col_map.get('VENUE_NAME', -1)
+    aliases_idx = col_map.get('VENUE_ALIASES', -1)
+
+    # Same rows, details and first-row-wins rules as match_venue / build_venue_index
+    details_index = build_venue_index(venues_data)
+    if venue_id_idx >= 0 and venue_name_idx >= 0:
+        for row in venues_data[1:]:
+            if len(row) <= venue_id_idx:
+                continue
+            venue_number = len(venues) // len(VENUE_FIELDS)
+            venue_id = row[venue_id_idx]
+            details = details_index.get(venue_id, {})
+            canonical_name = row[venue_name_idx] if venue_name_idx < len(row) else ""
+            normalized_name = normalize_venue_name(canonical_name)
+            name_keys.append((normalized_name.encode('utf-8'), venue_number))
+
+            alias_start = len(aliases)
+            aliases_str = row[aliases_idx] if aliases_idx >= 0 and aliases_idx < len(row) else ""
+            if aliases_str:
+                for alias in parse_venue_aliases(aliases_str):
+                    if not alias:
+                        continue
+                    normalized_alias = normalize_venue_name(alias)
+                    alias_keys.append((normalized_alias.encode('utf-8'), venue_number, len(aliases)))
+                    aliases.append(pool.add(normalized_alias))
+
+            # Details come from the first row with this VENUE_ID, as in build_venue_index
+            venues.extend((
+                pool.add(venue_id), pool.add(canonical_name), pool.add(normalized_name),
+                pool.add(details.get('city', "")), pool.add(details.get('country', "")),
+                pool.add(details.get('language', "")), pool.add(details.get('default_ticket_url', "")),
+                pool.add(details.get('default_image_url', "")), pool.add(details.get('access_status', "")),
+                alias_start, len(aliases) - alias_start
+            ))
+
+    # Sorted by UTF-8 bytes (= code point order), then row: bisect finds the first row
+    name_keys.sort()
+    alias_keys.sort()
+    name_index = array('I', (venue_number for _, venue_number in name_keys))
+    alias_index = array('I')
+    for _, venue_number, alias_number in alias_keys:
+        alias_index.extend((aliases[alias_number], venue_number))
+
+    categories = array('I')
+    keywords = array('I')
+    for category in build_category_index(categories_data):
+        keyword_start = len(keywords)
+        keywords.extend(pool.add(keyword) for keyword in category['keywords'])
+        categories.extend((pool.add(category['category_id']), pool.add(category['details']['default_image_url']),
+                           keyword_start, len(keywords) - keyword_start))
+
+    vocabulary = array('I')
+    for word, count in sorted(venue_vocabulary(venues_data).items()):
+        vocabulary.extend((pool.add(word), count))
+
+    meta = {
+        'venues_hash': venues_fingerprint(venues_data),
+        'built': datetime.now().isoformat(timespec='seconds'),
+        'venues': len(venues) // len(VENUE_FIELDS),
+        'aliases': len(aliases),
+        'categories': len(categories) // len(CATEGORY_FIELDS),
+        'vocabulary': len(vocabulary) // 2
+    }
+
+    offsets = array('I', [0])
+    for encoded in pool.encoded:
+        offsets.append(offsets[-1] + len(encoded))
+
+    sections = [
+        (b'strpool', b''.join(pool.encoded)),
+        (b'stroffs', offsets.tobytes()),
+        (b'venues', venues.tobytes()),
+        (b'aliases', aliases.tobytes()),
+        (b'nameidx', name_index.tobytes()),
+        (b'aliasidx', alias_index.tobytes()),
+        (b'cats', categories.tobytes()),
+        (b'keywords', keywords.tobytes()),
+        (b'vocab', vocabulary.tobytes()),
+        (b'meta', json.dumps(meta).encode('utf-8')),
+    ]
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table, body = [], []
+    for name, data in sections:
+        padding = -offset % 4
+        body.append(b'\0' * padding)
+        offset += padding
+        table.append(_SECTION.pack(name, offset, len(data)))
+        body.append(data)
+        offset += len(data)
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, _BYTE_ORDER, hash_bytes, len(sections))
+    return header + b''.join(table) + b''.join(body)
+
+
+class ReferenceSnapshot:
+    """
+    Read-only view of a compiled snapshot file (open with open_snapshot())
+
+    Tables are memoryviews over the mapping; strings are decoded on access.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, version, byte_order, self.source_hash, section_count = _HEADER.unpack_from(view, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT or byte_order != _BYTE_ORDER:
+            view.release()
+            self._mmap.close()
+            raise ValueError(f"{path} is not a format {SNAPSHOT_FORMAT} reference snapshot for this platform")
+
+        sections = {}
+        for n in range(section_count):
+            name, offset, length = _SECTION.unpack_from(view, _HEADER.size + n * _SECTION.size)
+            sections[name.rstrip(b'\0')] = view[offset:offset + length]
+        self._views = [view] + list(sections.values())
+
+        self._pool = sections[b'strpool']
+        self._offsets = sections[b'stroffs'].cast('I')
+        self._venues = sections[b'venues'].cast('I')
+        self._aliases = sections[b'aliases'].cast('I')
+        self._name_index = sections[b'nameidx'].cast('I')
+        self._alias_index = sections[b'aliasidx'].cast('I')
+        self._categories = sections[b'cats'].cast('I')
+        self._keywords = sections[b'keywords'].cast('I')
+        self._vocabulary = sections[b'vocab'].cast('I')
+        self._views += [self._offsets, self._venues, self._aliases, self._name_index, self._alias_index,
+                        self._categories, self._keywords, self._vocabulary]
+        self.meta = json.loads(bytes(sections[b'meta']))
+        self.venue_count = len(self._venues) // len(VENUE_FIELDS)
+        self._fuzzy_candidates = None
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._mmap.close()
+
+    # Strings and records
+
+    def _bytes(self, number: int) -> bytes:
+        return bytes(self._pool[self._offsets[number]:self._offsets[number + 1]])
+
+    def string(self, number: int) -> str:
+        return str(self._pool[self._offsets[number]:self._offsets[number + 1]], 'utf-8')
+
+    def _venue_field(self, venue_number: int, field: int) -> int:
+        return self._venues[venue_number * len(VENUE_FIELDS) + field]
+
+    def venue(self, venue_number: int) -> Dict:
+        """One VENUES record: VENUE_FIELDS strings plus its normalized aliases"""
+        base = venue_number * len(VENUE_FIELDS)
+        record = {field: self.string(self._venues[base + n]) for n, field in enumerate(VENUE_FIELDS[:9])}
+        alias_start, alias_count = self._venues[base + 9], self._venues[base + 10]
+        record['aliases'] = [self.string(self._aliases[a]) for a in range(alias_start, alias_start + alias_count)]
+        return record
+
+    # Lookups used by utils.match_venue
+
+    def _bisect(self, count: int, string_at, key: bytes) -> int:
+        # First position whose string (string_at(position) = string number) is >= key
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._bytes(string_at(middle)) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find_by_name(self, normalized_name: str) -> Optional[str]:
+        """VENUE_ID of the first row whose normalized VENUE_NAME equals the input, else None"""
+        key = normalized_name.encode('utf-8')
+        name_at = lambda position: self._venue_field(self._name_index[position], 2)
+        position = self._bisect(len(self._name_index), name_at, key)
+        if position < len(self._name_index) and self._bytes(name_at(position)) == key:
+            return self.string(self._venue_field(self._name_index[position], 0))
+        return None
+
+    def find_by_alias(self, normalized_alias: str) -> Optional[str]:
+        """VENUE_ID of the first row with a normalized alias equal to the input, else None"""
+        key = normalized_alias.encode('utf-8')
+        alias_at = lambda position: self._alias_index[position * 2]
+        count = len(self._alias_index) // 2
+        position = self._bisect(count, alias_at, key)
+        if position < count and self._bytes(alias_at(position)) == key:
+            return self.string(self._venue_field(self._alias_index[position * 2 + 1], 0))
+        return None
+
+    def fuzzy_candidates(self) -> List[Tuple[str, str]]:
+        """(VENUE_ID, normalized name/alias) in utils.venue_match_candidates order (decoded once)"""
+        if self._fuzzy_candidates is None:
+            candidates = []
+            for venue_number in range(self.venue_count):
+                venue_id = self.string(self._venue_field(venue_number, 0))
+                candidates.append((venue_id, self.string(self._venue_field(venue_number, 2))))
+                alias_start = self._venue_field(venue_number, 9)
+                for a in range(alias_start, alias_start + self._venue_field(venue_number, 10)):
+                    candidates.append((venue_id, self.string(self._aliases[a])))
+            self._fuzzy_candidates = candidates
+        return self._fuzzy_candidates
+
+    # Derived tables in the shapes the jobs use
+
+    def venue_index(self) -> Dict[str, Dict]:
+        """utils.build_venue_index() result"""
+        detail_fields = VENUE_FIELDS[3:9]
+        index = {}
+        for venue_number in range(self.venue_count):
+            venue_id = self.string(self._venue_field(venue_number, 0))
+            if venue_id not in index:
+                index[venue_id] = {field: self.string(self._venue_field(venue_number, 3 + n))
+                                   for n, field in enumerate(detail_fields)}
+        return index
+
+    def venue_ids(self) -> set:
+        """Non-empty VENUE_IDs (validation_rules.load_reference_ids semantics)"""
+        ids = (self.string(self._venue_field(n, 0)).strip() for n in range(self.venue_count))
+        return {venue_id for venue_id in ids if venue_id}
+
+    def category_index(self) -> List[Dict]:
+        """utils.build_category_index() result"""
+        index = []
+        for base in range(0, len(self._categories), len(CATEGORY_FIELDS)):
+            keyword_start, keyword_count = self._categories[base + 2], self._categories[base + 3]
+            index.append({
+                'category_id': self.string(self._categories[base]),
+                'keywords': [self.string(self._keywords[k]) for k in range(keyword_start, keyword_start + keyword_count)],
+                'details': {'default_image_url': self.string(self._categories[base + 1])}
+            })
+        return index
+
+    def category_ids(self) -> set:
+        """Non-empty CATEGORY_IDs"""
+        ids = (self.string(self._categories[base]).strip()
+               for base in range(0, len(self._categories), len(CATEGORY_FIELDS)))
+        return {category_id for category_id in ids if category_id}
+
+    def vocabulary(self) -> Dict[str, int]:
+        """typo_correction.venue_vocabulary() result"""
+        return {self.string(self._vocabulary[n]): self._vocabulary[n + 1]
+                for n in range(0, len(self._vocabulary), 2)}
+
+
+def open_snapshot(path: str = REFERENCE_SNAPSHOT_FILE) -> ReferenceSnapshot:
+    """Map a snapshot file (raises OSError / ValueError if missing or not a snapshot)"""
+    return ReferenceSnapshot(path)
+
+
+def load_reference_snapshot(venues_path: str = 'venues-data.json', categories_path: str = 'categories-data.json',
+                            path: str = REFERENCE_SNAPSHOT_FILE, venues_data: list = None,
+                            categories_data: list = None) -> Optional[ReferenceSnapshot]:
+    """
+    Open the snapshot for the current source files, recompiling it if they changed
+
+    Args:
+        venues_path: VENUES export the snapshot must match
+        categories_path: EVENT_CATEGORIES export the snapshot must match
+        path: Snapshot file
+        venues_data, categories_data: Already-parsed contents of the source
+            files (only used for a rebuild; parsed from the files otherwise)
+
+    Returns:
+        ReferenceSnapshot, or None if a source file is missing
+    """
+    try:
+        with open(venues_path, 'rb') as f:
+            venues_bytes = f.read()
+        with open(categories_path, 'rb') as f:
+            categories_bytes = f.read()
+    except FileNotFoundError:
+        return None
+    expected = source_hash(venues_bytes, categories_bytes)
+
+    try:
+        snapshot = open_snapshot(path)
+        if snapshot.source_hash == expected:
+            return snapshot
+        snapshot.close()
+    except (OSError, ValueError, KeyError, struct.error):
+        pass
+
+    if venues_data is None:
+        venues_data = json.loads(venues_bytes)
+    if categories_data is None:
+        categories_data = json.loads(categories_bytes)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(compile_snapshot(venues_data, categories_data, expected))
+    os.replace(tmp_path, path)
+    print(f"🗜️  Reference snapshot rebuilt: {path}")
+    return open_snapshot(path)
+
+
+def main():
+    """Build (or verify) the snapshot for venues-data.json / categories-data.json"""
+    if '--rebuild' in sys.argv and os.path.exists(REFERENCE_SNAPSHOT_FILE):
+        os.remove(REFERENCE_SNAPSHOT_FILE)
+
+    start = time.perf_counter()
+    snapshot = load_reference_snapshot()
+    if snapshot is None:
+        print("❌ venues-data.json / categories-data.json not found")
+        sys.exit(1)
+    load_ms = (time.perf_counter() - start) * 1000
+    snapshot.close()
+
+    start = time.perf_counter()
+    snapshot = open_snapshot()
+    open_us = (time.perf_counter() - start) * 1_000_000
+
+    print(f"✅ {REFERENCE_SNAPSHOT_FILE}: {os.path.getsize(REFERENCE_SNAPSHOT_FILE):,} bytes")
+    print(f"   {snapshot.meta['venues']} venues, {snapshot.meta['aliases']} aliases, "
+          f"{snapshot.meta['categories']} categories, {snapshot.meta['vocabulary']} vocabulary words")
+    print(f"   Load (hash check / rebuild): {load_ms:.1f}ms, open: {open_us:.0f}µs")
+    snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
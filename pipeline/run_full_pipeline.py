@@ -6,15 +6,31 @@ This script coordinates the full PI Events pipeline:
 1. Populate INGEST_FROM_MONTHLY (Job 1)
 2. Build STAGED_EVENTS (Job 2)
 3. Enrich STAGED_EVENTS (Job 3)
+3b. Check EVENT_URL / IMAGE_URL liveness (Job 3b)
 4. Validate STAGED_EVENTS (Job 4)
 5. (Optional) Export to READY_TO_PUBLISH (Job 5)
 
 Usage:
-    python3 pipeline/run_full_pipeline.py [--export]
+    python3 pipeline/run_full_pipeline.py [--export] [--resume] [--force]
 
 Options:
     --export    Also run Job 5 (export to READY_TO_PUBLISH)
                 Default: Skip Job 5 (staff must manually approve first)
+    --resume    Continue the last run if it failed or was interrupted (keeps
+                its --export mode) from its first incomplete job
+    --force     Run every job, ignoring checkpoints
+
+Checkpoints:
+    Every job records a checkpoint in PIPELINE_RUN_MANIFEST_FILE: SHA-256 of
+    its input JSON files and of the pipeline code, its output file + hash and
+    its status. A job whose inputs hash identically to its completed
+    checkpoint (and whose output file is still intact) is skipped, so a rerun
+    after a failure or timeout only repeats the remaining work. Job 3b
+    checkpoints expire after LINK_CHECK_TTL_HOURS, since link liveness
+    changes without any input changing. Jobs 4 and 5 also depend on the
+    clock (Job 4 flags past dates, Job 5 drops events that ended hours ago),
+    so the current date (Job 4) or date and hour (Job 5) is part of their
+    input hashes.
 
 This script expects Claude Code to have already fetched sheet data and saved to JSON files.
 It processes the data and outputs results that Claude Code can write back to sheets.
@@ -24,7 +40,53 @@ import subprocess
 import sys
 import json
 import os
+import glob
+import hashlib
+import uuid
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.config import PIPELINE_RUN_MANIFEST_FILE, LINK_CHECK_TTL_HOURS
+
+RUN_MANIFEST_FORMAT = 1
+
+# Jobs in run order. inputs: JSON files the job reads; output: file it writes;
+# clock: strftime format of the current local time hashed with the inputs, for
+# jobs whose output depends on it.
+STAGES = [
+    {'id': 'job1', 'name': "Job 1: Populate INGEST_FROM_MONTHLY",
+     'script': "pipeline/populate_ingest_from_monthly.py",
+     'inputs': ['monthly-tabs-data.json'],
+     'output': 'ingest-from-monthly-output.json'},
+    {'id': 'job2', 'name': "Job 2: Build STAGED_EVENTS",
+     'script': "pipeline/build_staged_events.py",
+     'inputs': ['pre-approved-events-data.json', 'ingest-from-monthly-data.json', 'staged-events-existing.json'],
+     'output': 'staged-events-output.json'},
+    {'id': 'job3', 'name': "Job 3: Enrich STAGED_EVENTS",
+     'script': "pipeline/enrich_staged_events.py",
+     'inputs': ['staged-events-data.json', 'venues-data.json', 'categories-data.json',
+                'published-events-data.json'],
+     'output': 'enriched-staged-events-output.json'},
+    {'id': 'job3b', 'name': "Job 3b: Check links",
+     'script': "pipeline/check_links.py",
+     'inputs': ['staged-events-data.json'],
+     'output': 'link-checked-staged-events-output.json',
+     'max_age_hours': LINK_CHECK_TTL_HOURS},
+    {'id': 'job4', 'name': "Job 4: Validate STAGED_EVENTS",
+     'script': "pipeline/validate_staged_events.py",
+     'inputs': ['staged-events-data.json', 'venues-data.json', 'categories-data.json'],
+     'output': 'validated-staged-events-output.json',
+     'clock': '%Y-%m-%d'},  # FutureDate rule compares against today
+    {'id': 'job5', 'name': "Job 5: Export to READY_TO_PUBLISH",
+     'script': "pipeline/export_to_ready_to_publish.py",
+     'inputs': ['staged-events-data.json'],
+     'output': 'ready-to-publish-output.json',
+     'clock': '%Y-%m-%d %H',  # is_event_outdated cuts off by the hour
+     'export_only': True},
+]
 
 
 def print_header(title):
@@ -75,6 +137,145 @@ def run_job(job_name, script_path):
         return False
 
 
+def file_hash(path: str) -> Optional[str]:
+    """SHA-256 of a file, or None if it does not exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def code_fingerprint() -> str:
+    """SHA-256 over the pipeline's Python sources (a code change reruns every job)"""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        digest.update(os.path.basename(path).encode())
+        digest.update((file_hash(path) or '').encode())
+    return digest.hexdigest()
+
+
+def stage_input_hashes(stage: Dict, code_hash: str) -> Dict[str, Optional[str]]:
+    """Input file → SHA-256 (None = missing), plus the code fingerprint and clock"""
+    hashes = {path: file_hash(path) for path in stage['inputs']}
+    hashes['<code>'] = code_hash
+    if stage.get('clock'):
+        hashes['<clock>'] = datetime.now().strftime(stage['clock'])
+    return hashes
+
+
+def load_run_manifest(path: str = PIPELINE_RUN_MANIFEST_FILE) -> Dict:
+    """
+    Load the run manifest
+
+    Returns:
+        Dict with format, run (id, mode, status, started, finished,
+        failed_stage) and stages (stage id → checkpoint)
+    """
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('format') == RUN_MANIFEST_FORMAT:
+            return manifest
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return {'format': RUN_MANIFEST_FORMAT, 'run': {}, 'stages': {}}
+
+
+def save_run_manifest(manifest: Dict, path: str = PIPELINE_RUN_MANIFEST_FILE):
+    """Write the manifest via a temp file + rename (it is saved after every job)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def checkpoint_is_current(stage: Dict, checkpoint: Optional[Dict],
+                          input_hashes: Dict[str, Optional[str]]) -> Tuple[bool, str]:
+    """
+    Whether a stage's checkpoint still covers its current inputs
+
+    Returns:
+        (current, reason) - reason explains why the job has to run
+    """
+    if not checkpoint:
+        return False, "no checkpoint"
+    if checkpoint.get('status') != 'complete':
+        return False, f"last attempt {checkpoint.get('status', 'incomplete')}"
+    if checkpoint.get('inputs') != input_hashes:
+        changed = sorted(k for k in set(input_hashes) | set(checkpoint.get('inputs', {}))
+                         if input_hashes.get(k) != checkpoint.get('inputs', {}).get(k))
+        return False, f"inputs changed: {', '.join(changed)}"
+    output = checkpoint.get('output', {})
+    if file_hash(output.get('path', stage['output'])) != output.get('sha256'):
+        return False, f"output {stage['output']} missing or modified"
+    max_age = stage.get('max_age_hours')
+    if max_age is not None:
+        age = datetime.now() - datetime.fromisoformat(checkpoint['finished'])
+        if age.total_seconds() > max_age * 3600:
+            return False, f"checkpoint older than {max_age}h"
+    return True, "inputs unchanged"
+
+
+def first_incomplete_stage(manifest: Dict, stages: List[Dict]) -> Optional[str]:
+    """Name of the first job without a completed checkpoint"""
+    for stage in stages:
+        if manifest['stages'].get(stage['id'], {}).get('status') != 'complete':
+            return stage['name']
+    return None
+
+
+def run_stages(manifest: Dict, stages: List[Dict], force: bool = False) -> Tuple[List[str], Optional[Dict]]:
+    """
+    Run (or skip) each stage in order, checkpointing after every job
+
+    Returns:
+        (names of skipped jobs, failed stage or None)
+    """
+    run_id = manifest['run']['id']
+    code_hash = code_fingerprint()
+    skipped = []
+
+    for stage in stages:
+        input_hashes = stage_input_hashes(stage, code_hash)
+        checkpoint = manifest['stages'].get(stage['id'])
+        current, reason = checkpoint_is_current(stage, checkpoint, input_hashes)
+
+        if current and not force:
+            print_header(f"⏭️  SKIPPING: {stage['name']}")
+            print(f"   Checkpoint from {checkpoint['finished']} (run {checkpoint['run_id']}): {reason}")
+            skipped.append(stage['name'])
+            continue
+        if not force:
+            print(f"\n🔁 {stage['name']}: {reason}")
+
+        started = datetime.now()
+        manifest['stages'][stage['id']] = {
+            'job': stage['name'], 'run_id': run_id, 'status': 'running',
+            'inputs': input_hashes, 'started': started.isoformat(timespec='seconds')
+        }
+        save_run_manifest(manifest)
+
+        succeeded = run_job(stage['name'], stage['script'])
+
+        finished = datetime.now()
+        manifest['stages'][stage['id']].update({
+            'status': 'complete' if succeeded else 'failed',
+            'finished': finished.isoformat(timespec='seconds'),
+            'seconds': round((finished - started).total_seconds(), 1),
+            'output': {'path': stage['output'], 'sha256': file_hash(stage['output'])}
+        })
+        save_run_manifest(manifest)
+
+        if not succeeded:
+            return skipped, stage
+
+    return skipped, None
+
+
 def main():
     """
     Main orchestration
@@ -83,15 +284,45 @@ def main():
     1. Job 1: Populate INGEST_FROM_MONTHLY
     2. Job 2: Build STAGED_EVENTS
     3. Job 3: Enrich STAGED_EVENTS
+    3b. Job 3b: Check links
     4. Job 4: Validate STAGED_EVENTS
     5. Job 5: Export to READY_TO_PUBLISH (optional - only if --export flag)
     """
     print_header("🔄 PI EVENTS PIPELINE - FULL RUN")
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+    manifest = load_run_manifest()
+    previous_run = manifest['run']
+    force = '--force' in sys.argv
+
     # Check if export flag is present
     export_enabled = '--export' in sys.argv
 
+    resuming = '--resume' in sys.argv and previous_run.get('status') in ('running', 'failed')
+    if resuming:
+        # Continue the interrupted run under its own id and mode
+        export_enabled = export_enabled or previous_run.get('mode') == 'export'
+
+    # Jobs 1-4, plus Job 5 (export to READY_TO_PUBLISH) only with --export
+    stages = [stage for stage in STAGES if export_enabled or not stage.get('export_only')]
+
+    if resuming:
+        print(f"\n⏯️  Resuming run {previous_run['id']} (started {previous_run.get('started')}) "
+              f"from {first_incomplete_stage(manifest, stages) or 'the end'}")
+        manifest['run'].update({'status': 'running', 'finished': None, 'failed_stage': None,
+                                'mode': 'export' if export_enabled else 'review'})
+    else:
+        if '--resume' in sys.argv:
+            print(f"\n⏯️  Nothing to resume (last run: {previous_run.get('status', 'none')}) - starting a new run")
+        manifest['run'] = {
+            'id': uuid.uuid4().hex[:12],
+            'mode': 'export' if export_enabled else 'review',
+            'status': 'running',
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'finished': None,
+            'failed_stage': None
+        }
+
     if export_enabled:
         print("\n📋 Mode: FULL PIPELINE (including export)")
         print("   Jobs 1-5 will run")
@@ -100,47 +331,33 @@ def main():
         print("   Jobs 1-4 will run")
         print("   Staff must manually approve events in STAGED_EVENTS")
         print("   Then run with --export flag to publish")
+    if force:
+        print("   --force: checkpoints ignored, every job runs")
 
-    # Job 1: Populate INGEST_FROM_MONTHLY
-    if not run_job("Job 1: Populate INGEST_FROM_MONTHLY",
-                   "pipeline/populate_ingest_from_monthly.py"):
-        print("\n❌ Pipeline failed at Job 1")
-        sys.exit(1)
-
-    # Job 2: Build STAGED_EVENTS
-    if not run_job("Job 2: Build STAGED_EVENTS",
-                   "pipeline/build_staged_events.py"):
-        print("\n❌ Pipeline failed at Job 2")
-        sys.exit(1)
+    skipped, failed_stage = run_stages(manifest, stages, force=force)
 
-    # Job 3: Enrich STAGED_EVENTS
-    if not run_job("Job 3: Enrich STAGED_EVENTS",
-                   "pipeline/enrich_staged_events.py"):
-        print("\n❌ Pipeline failed at Job 3")
+    manifest['run']['finished'] = datetime.now().isoformat(timespec='seconds')
+    if failed_stage:
+        manifest['run'].update({'status': 'failed', 'failed_stage': failed_stage['id']})
+        save_run_manifest(manifest)
+        print(f"\n❌ Pipeline failed at {failed_stage['name'].split(':')[0]}")
+        print("   Fix the problem, then rerun with --resume to continue from there")
         sys.exit(1)
-
-    # Job 4: Validate STAGED_EVENTS
-    if not run_job("Job 4: Validate STAGED_EVENTS",
-                   "pipeline/validate_staged_events.py"):
-        print("\n❌ Pipeline failed at Job 4")
-        sys.exit(1)
-
-    # Job 5: Export to READY_TO_PUBLISH (optional)
-    if export_enabled:
-        if not run_job("Job 5: Export to READY_TO_PUBLISH",
-                       "pipeline/export_to_ready_to_publish.py"):
-            print("\n❌ Pipeline failed at Job 5")
-            sys.exit(1)
+    manifest['run']['status'] = 'complete'
+    save_run_manifest(manifest)
 
     # Success summary
     print_header("✅ PIPELINE COMPLETE")
     print(f"Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if skipped:
+        print(f"⏭️  Skipped (inputs unchanged since checkpoint): {', '.join(skipped)}")
 
     if export_enabled:
         print("\n📊 Output files generated:")
         print("   - ingest-from-monthly-output.json → Write to INGEST_FROM_MONTHLY")
         print("   - staged-events-output.json → Write to STAGED_EVENTS")
         print("   - enriched-staged-events-output.json → Update STAGED_EVENTS")
+        print("   - link-checked-staged-events-output.json → Update STAGED_EVENTS")
         print("   - validated-staged-events-output.json → Update STAGED_EVENTS")
         print("   - ready-to-publish-output.json → Write to READY_TO_PUBLISH")
         print("\n✅ All jobs completed. Ready to write to sheets via MCP.")
@@ -149,6 +366,7 @@ def main():
         print("   - ingest-from-monthly-output.json → Write to INGEST_FROM_MONTHLY")
         print("   - staged-events-output.json → Write to STAGED_EVENTS")
         print("   - enriched-staged-events-output.json → Update STAGED_EVENTS")
+        print("   - link-checked-staged-events-output.json → Update STAGED_EVENTS")
         print("   - validated-staged-events-output.json → Update STAGED_EVENTS")
         print("\n📋 NEXT STEPS:")
         print("   1. Review STAGED_EVENTS in Google Sheets")
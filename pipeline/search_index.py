@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Prebuilt search index for the compact feed (Job 5)
+
+Builds an inverted index over the published feed so the app can answer
+searches with dictionary lookups instead of scanning every event:
+- terms: sorted token list (accents folded via NFKD, then normalized with
+  utils.normalize_event_name and split on letters/digits of any script, so
+  the client must tokenize queries the same way: "Dún" → "dun")
+- postings: per term, delta-encoded ints of (doc_index * 32 + field_mask)
+  where doc_index is the event's position in the feed and field_mask says
+  which fields (name, artist, venue, city, category) contain the term
+- prefixes: for 1..SEARCH_PREFIX_MAX_LENGTH character prefixes, the most
+  frequent matching term indexes for type-ahead (longer prefixes: binary
+  search the sorted terms)
+
+Usage:
+    python3 pipeline/search_index.py --benchmark [N]    (default N=100000)
+"""
+
+import bisect
+import os
+import re
+import sys
+import time
+import unicodedata
+from typing import Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.config import FEED_FORMAT_VERSION, SEARCH_PREFIX_MAX_LENGTH, SEARCH_PREFIX_TOP_TERMS
+from pipeline.utils import normalize_event_name
+from pipeline.publish_feed import compute_version, encode_json, write_precompressed
+
+# Indexed feed keys and their bit in the field mask
+SEARCH_FIELDS = {'n': 1, 'a': 2, 'v': 4, 'c': 8, 'g': 16}
+FIELD_MASK_BITS = 32
+
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def fold_accents(text: str) -> str:
+    """
+    Strip diacritics (NFKD decomposition without combining marks)
+
+    Example:
+        fold_accents("Dún Laoghaire")
+        Returns: "Dun Laoghaire"
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Fold accents, normalize text like event names and split into search tokens
+
+    Used for both the index and queries, so "beyonce" finds "Beyoncé".
+
+    Example:
+        tokenize("The Beatles - Live Tour 2026")
+        Returns: ["beatles", "live", "tour"]
+    """
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(normalize_event_name(fold_accents(text)))
+
+
+def build_search_index(feed: Dict) -> Dict:
+    """
+    Build the inverted index for a compact feed document
+
+    Args:
+        feed: Feed dict from publish_feed.build_feed (dictionary-encoded events)
+
+    Returns:
+        Index dict: {format, version, feed_version, fields, terms, postings, prefixes}
+    """
+    dicts = feed.get('dicts', {})
+
+    # Tokenize each distinct dictionary value once (venues/cities/categories repeat a lot)
+    dict_tokens = {
+        key: [tokenize(value) for value in values]
+        for key, values in dicts.items() if key in SEARCH_FIELDS
+    }
+
+    term_masks = {}  # term → {doc_index: field_mask}
+    for doc_index, event in enumerate(feed['events']):
+        for key, bit in SEARCH_FIELDS.items():
+            value = event.get(key)
+            if value is None or value == '':
+                continue
+            tokens = dict_tokens[key][value] if key in dict_tokens else tokenize(value)
+            for token in tokens:
+                docs = term_masks.setdefault(token, {})
+                docs[doc_index] = docs.get(doc_index, 0) | bit
+
+    terms = sorted(term_masks)
+    postings = []
+    for term in terms:
+        docs = term_masks[term]
+        encoded, previous = [], 0
+        for doc_index in sorted(docs):
+            value = doc_index * FIELD_MASK_BITS + docs[doc_index]
+            encoded.append(value - previous)
+            previous = value
+        postings.append(encoded)
+
+    # Type-ahead: most frequent terms per short prefix
+    prefix_candidates = {}
+    for term_index, term in enumerate(terms):
+        for length in range(1, min(SEARCH_PREFIX_MAX_LENGTH, len(term)) + 1):
+            prefix_candidates.setdefault(term[:length], []).append(term_index)
+
+    prefixes = {
+        prefix: sorted(candidates, key=lambda i: (-len(postings[i]), terms[i]))[:SEARCH_PREFIX_TOP_TERMS]
+        for prefix, candidates in sorted(prefix_candidates.items())
+    }
+
+    body = {
+        'format': FEED_FORMAT_VERSION,
+        'feed_version': feed['version'],
+        'fields': SEARCH_FIELDS,
+        'terms': terms,
+        'postings': postings,
+        'prefixes': prefixes
+    }
+    return {'version': compute_version(body), **body}
+
+
+def decode_postings(encoded: List[int]) -> Dict[int, int]:
+    """
+    Decode one term's postings back to {doc_index: field_mask}
+
+    Example:
+        decode_postings([33, 32])
+        Returns: {1: 1, 2: 1}
+    """
+    decoded, value = {}, 0
+    for delta in encoded:
+        value += delta
+        decoded[value // FIELD_MASK_BITS] = value % FIELD_MASK_BITS
+    return decoded
+
+
+def search(index: Dict, query: str) -> List[int]:
+    """
+    Reference query evaluation: AND of all query tokens (last token as prefix)
+
+    Mirrors what the app does with the index; used by the benchmark.
+
+    Returns:
+        Sorted doc indexes into the feed's events
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+
+    terms = index['terms']
+    result = None
+    for position, token in enumerate(tokens):
+        docs = set()
+        if position == len(tokens) - 1:
+            # Type-ahead: every term starting with the last token
+            start = bisect.bisect_left(terms, token)
+            end = bisect.bisect_left(terms, token + '\uffff')
+            for term_index in range(start, end):
+                docs.update(decode_postings(index['postings'][term_index]))
+        else:
+            term_index = bisect.bisect_left(terms, token)
+            if term_index < len(terms) and terms[term_index] == token:
+                docs.update(decode_postings(index['postings'][term_index]))
+
+        result = docs if result is None else result & docs
+        if not result:
+            return []
+
+    return sorted(result)
+
+
+def write_search_index(index: Dict, output_dir: str, name: str = 'search-index') -> Dict:
+    """
+    Write the index (+ .gz/.br variants) next to the feed
+
+    Returns:
+        Variant metadata from write_precompressed
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    return write_precompressed(os.path.join(output_dir, f"{name}.json"), encode_json(index), index['version'])
+
+
+def benchmark(event_count: int = 100000):
+    """Build the index over synthetic events and time build, encode and queries"""
+    import random
+    from pipeline.config import STAGED_EVENTS_COLUMNS
+    from pipeline.publish_feed import build_feed
+
+    print("=" * 70)
+    print(f"⏱️  SEARCH INDEX BENCHMARK ({event_count:,} events)")
+    print("=" * 70)
+
+    rng = random.Random(42)
+    words = ['live', 'tour', 'symphony', 'comedy', 'night', 'festival', 'musical', 'orchestra',
+             'legends', 'christmas', 'gala', 'championship', 'family', 'show', 'acoustic', 'summer']
+    venues = [f"Venue {i} Arena" for i in range(400)]
+    cities = ['London', 'Manchester', 'Birmingham', 'Glasgow', 'Dublin', 'Cardiff', 'Leeds', 'Belfast']
+    categories = ['concert', 'comedy', 'theatre', 'sports', 'family', 'festival']
+
+    col = {h: i for i, h in enumerate(STAGED_EVENTS_COLUMNS)}
+    rows = []
+    for i in range(event_count):
+        row = [''] * len(STAGED_EVENTS_COLUMNS)
+        row[col['EVENT_ID']] = f"{i:016x}"
+        row[col['EVENT_DATE']] = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        row[col['EVENT_NAME']] = f"Artist{rng.randint(0, 20000)} {' '.join(rng.sample(words, 2))}"
+        row[col['ARTIST_NAME']] = f"Artist{rng.randint(0, 20000)}"
+        row[col['VENUE_NAME']] = rng.choice(venues)
+        row[col['CITY']] = rng.choice(cities)
+        row[col['CATEGORY_ID']] = rng.choice(categories)
+        rows.append(row)
+
+    start = time.perf_counter()
+    feed = build_feed(rows, STAGED_EVENTS_COLUMNS, 'benchmark')
+    feed_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = build_search_index(feed)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encoded = encode_json(index)
+    encode_seconds = time.perf_counter() - start
+
+    import gzip
+    gzipped = len(gzip.compress(encoded, compresslevel=9, mtime=0))
+
+    queries = ['symphony', 'live tour', 'london', 'venue 12', 'artist1', 'chr', 'comedy night']
+    start = time.perf_counter()
+    hits = {q: len(search(index, q)) for q in queries}
+    query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"   Feed build:   {feed_seconds:.2f}s")
+    print(f"   Index build:  {build_seconds:.2f}s ({len(index['terms']):,} terms, {len(index['prefixes']):,} prefixes)")
+    print(f"   Encode:       {encode_seconds:.2f}s ({len(encoded):,} bytes, {gzipped:,} gzipped)")
+    print(f"   Query (avg):  {query_ms:.1f}ms")
+    for query, count in hits.items():
+        print(f"      '{query}': {count:,} hits")
+
+
+if __name__ == "__main__":
+    if '--benchmark' in sys.argv:
+        args = sys.argv[sys.argv.index('--benchmark') + 1:]
+        benchmark(int(args[0]) if args else 100000)
+    else:
+        print(__doc__)
@@ -0,0 +1,162 @@
+"""
+Range-coalesced row formatting for STAGED_EVENTS (Job 4)
+
+Job 4 colors each row by validation status. Instead of one formatting call
+per row, contiguous rows with the same color are coalesced into ranges and
+turned into Sheets API batchUpdate repeatCell request bodies:
+- coalesce_rows():   per-row reasons → [{start_row, end_row, color, reason}]
+- format_requests(): only the rows whose color differs from the previous
+  run's ranges (VALIDATION_FORMAT_STATE_FILE), again coalesced. Without a
+  previous state the data rows are painted with the most common color in
+  one request, then the exceptions.
+
+Row numbers in ranges are 1-based sheet rows (row 1 is the header), as in
+the sheet UI; request bodies use the API's 0-based, end-exclusive indices.
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+from pipeline.config import VALIDATION_COLORS, VALIDATION_CLEAR_COLOR
+
+
+def hex_to_color(hex_color: str) -> Dict[str, float]:
+    """
+    Sheets API Color for a #rrggbb string
+
+    Example:
+        hex_to_color("#ffffff")
+        Returns: {"red": 1.0, "green": 1.0, "blue": 1.0}
+    """
+    value = hex_color.lstrip('#')
+    return {
+        'red': round(int(value[0:2], 16) / 255, 4),
+        'green': round(int(value[2:4], 16) / 255, 4),
+        'blue': round(int(value[4:6], 16) / 255, 4)
+    }
+
+
+def coalesce_rows(reasons: List[str], first_row: int = 2) -> List[Dict]:
+    """
+    Merge runs of rows with the same formatting reason into ranges
+
+    Args:
+        reasons: One reason per data row (ERROR / WARNING / OK_APPROVED, "" for unformatted)
+        first_row: Sheet row number of reasons[0]
+
+    Returns:
+        List of {start_row, end_row (inclusive), color, reason}, unformatted rows omitted
+
+    Example:
+        coalesce_rows(["ERROR", "ERROR", "", "WARNING"])
+        Returns: [{"start_row": 2, "end_row": 3, "color": "#f4cccc", "reason": "ERROR"},
+                  {"start_row": 5, "end_row": 5, "color": "#fff2cc", "reason": "WARNING"}]
+    """
+    ranges = []
+    for offset, reason in enumerate(reasons):
+        if not reason:
+            continue
+        row = first_row + offset
+        last = ranges[-1] if ranges else None
+        if last and last['reason'] == reason and last['end_row'] == row - 1:
+            last['end_row'] = row
+        else:
+            ranges.append({'start_row': row, 'end_row': row, 'color': reason_color(reason), 'reason': reason})
+    return ranges
+
+
+def reason_color(reason: str) -> str:
+    """Background color for a formatting reason ("" → VALIDATION_CLEAR_COLOR)"""
+    if not reason:
+        return VALIDATION_CLEAR_COLOR
+    return VALIDATION_COLORS['OK' if reason == 'OK_APPROVED' else reason]
+
+
+def _row_colors(ranges: List[Dict]) -> Dict[int, str]:
+    return {row: r['color'] for r in ranges for row in range(r['start_row'], r['end_row'] + 1)}
+
+
+def repeat_cell_request(sheet_id: int, start_row: int, end_row: int, color: str) -> Dict:
+    """repeatCell request painting whole sheet rows start_row..end_row (1-based, inclusive)"""
+    return {
+        'repeatCell': {
+            'range': {
+                'sheetId': sheet_id,
+                'startRowIndex': start_row - 1,
+                'endRowIndex': end_row
+            },
+            'cell': {'userEnteredFormat': {'backgroundColor': hex_to_color(color)}},
+            'fields': 'userEnteredFormat.backgroundColor'
+        }
+    }
+
+
+def format_requests(ranges: List[Dict], last_row: int, sheet_id: int,
+                    previous_ranges: Optional[List[Dict]] = None,
+                    previous_last_row: int = 0) -> List[Dict]:
+    """
+    repeatCell requests bringing the sheet from the previous run's colors to these
+
+    Args:
+        ranges: coalesce_rows() output for this run
+        last_row: Last data row of this run
+        sheet_id: Numeric sheetId (gid) of the sheet
+        previous_ranges: Ranges applied by the previous run (None → repaint everything)
+        previous_last_row: Last data row of the previous run (rows past last_row
+            are cleared, rows past previous_last_row are always painted)
+
+    Returns:
+        List of request bodies for spreadsheets.batchUpdate
+    """
+    colors = _row_colors(ranges)
+    requests = []
+
+    if previous_ranges is None:
+        # Paint all data rows with the most common color, then only the exceptions
+        counts = Counter(colors.values())
+        counts[VALIDATION_CLEAR_COLOR] += (last_row - 1) - len(colors)
+        base = counts.most_common(1)[0][0] if last_row >= 2 else VALIDATION_CLEAR_COLOR
+        if last_row >= 2:
+            requests.append(repeat_cell_request(sheet_id, 2, last_row, base))
+        previous = {}
+        previous_default = base
+        previous_last_row = last_row
+    else:
+        previous = _row_colors(previous_ranges)
+        previous_default = VALIDATION_CLEAR_COLOR
+        # Rows that no longer exist lose their color
+        if previous_last_row > last_row:
+            requests.append(repeat_cell_request(sheet_id, last_row + 1, previous_last_row, VALIDATION_CLEAR_COLOR))
+
+    run_start, run_color = None, None
+    for row in range(2, last_row + 2):
+        color = colors.get(row, VALIDATION_CLEAR_COLOR) if row <= last_row else None
+        # Rows past the previous run's last row have unknown formatting
+        before = previous.get(row, previous_default) if row <= previous_last_row else None
+        changed = color is not None and color != before
+        if run_start is not None and (not changed or color != run_color):
+            requests.append(repeat_cell_request(sheet_id, run_start, row - 1, run_color))
+            run_start = None
+        if changed and run_start is None:
+            run_start, run_color = row, color
+
+    return requests
+
+
+def load_format_state(path: str) -> Optional[Dict]:
+    """Previous run's {sheet_id, last_row, ranges}, or None if missing/unreadable"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_format_state(path: str, sheet_id: int, last_row: int, ranges: List[Dict]):
+    """Record the ranges this run formatted (atomic write)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'sheet_id': sheet_id, 'last_row': last_row, 'ranges': ranges}, f)
+    os.replace(tmp_path, path)
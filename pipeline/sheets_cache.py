@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Revision-aware read-through cache for Google Sheets ranges
+
+Every run used to download PRE_APPROVED EVENTS, the monthly tabs, VENUES,
+EVENT_CATEGORIES and STAGED_EVENTS in full, edited or not. SheetsReadCache
+sits in front of those reads:
+1. One Drive files.get per spreadsheet per run asks for its `version`
+   (bumped by every edit).
+2. Ranges cached at that version are served from SHEETS_CACHE_DIR
+   (gzipped JSON per range, plus an index of range → version).
+3. All other requested ranges of the spreadsheet are fetched with ONE
+   spreadsheets.values.batchGet and stored under the version read in step 1.
+
+The version is read before the fetch, so an edit landing in between leaves
+the new values stored under the old version; the next run sees a newer
+version and fetches again. Without a Drive service every read is a miss.
+
+export_pipeline_inputs() writes the JSON files Jobs 1-5 read from the PI
+Work Flow spreadsheet (SHEETS_CACHE_EXPORTS + monthly-tabs-data.json) and
+leaves a file untouched when its content is unchanged, so downstream hashes
+(reference snapshot, run checkpoints) stay stable. The optional
+published-events-data.json (PUBLISHED sheet, public feed spreadsheet) is
+still exported by hand.
+
+tests/test_sheets_cache.py exercises the cache offline against an
+in-memory double of the Drive/Sheets calls used here.
+
+Usage:
+    python3 pipeline/sheets_cache.py --export       (needs token.pickle + googleapiclient)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.config import PI_WORK_FLOW_ID, SHEETS, SHEETS_CACHE_DIR, SHEETS_CACHE_EXPORTS
+
+SHEETS_CACHE_FORMAT = 1
+
+
+def sheet_range(sheet_name: str, cells: str = "") -> str:
+    """
+    A1 range for a sheet name (quoted, so names with spaces work)
+
+    Example:
+        sheet_range("PRE_APPROVED EVENTS", "A:N")
+        Returns: "'PRE_APPROVED EVENTS'!A:N"
+    """
+    quoted = "'" + sheet_name.replace("'", "''") + "'"
+    return f"{quoted}!{cells}" if cells else quoted
+
+
+class SheetsReadCache:
+    """
+    Read-through cache of spreadsheet ranges keyed by the spreadsheet's Drive version
+
+    Args:
+        sheets_service: googleapiclient Sheets v4 service
+        drive_service: googleapiclient Drive v3 service;
+            None disables revision checks (every read fetches)
+        cache_dir: Directory for the index and the gzipped ranges
+        value_render_option: Passed to batchGet; part of the cache key
+
+    Attributes:
+        stats: revision_checks, hits, misses, batch_gets
+    """
+
+    def __init__(self, sheets_service, drive_service=None, cache_dir: str = SHEETS_CACHE_DIR,
+                 value_render_option: str = 'FORMATTED_VALUE'):
+        self.sheets = sheets_service
+        self.drive = drive_service
+        self.cache_dir = cache_dir
+        self.value_render_option = value_render_option
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.index: Dict[str, Dict] = {}
+        self.revisions: Dict[str, Optional[str]] = {}
+        self.stats = {'revision_checks': 0, 'hits': 0, 'misses': 0, 'batch_gets': 0}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load the index (missing, corrupt or other-format index → empty cache)"""
+        try:
+            with open(self.index_path, 'r') as f:
+                stored = json.load(f)
+            if stored.get('format') == SHEETS_CACHE_FORMAT:
+                self.index = stored.get('entries', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.index = {}
+
+    def save(self):
+        """Write the index if anything was fetched (atomic)"""
+        if not self.dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'format': SHEETS_CACHE_FORMAT, 'entries': self.index}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+        self.dirty = False
+
+    def _key(self, spreadsheet_id: str, range_name: str) -> str:
+        raw = f"{spreadsheet_id}|{range_name}|{self.value_render_option}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+    def revision(self, spreadsheet_id: str) -> Optional[str]:
+        """Drive version of the spreadsheet (checked once per cache instance; None = unknown)"""
+        if spreadsheet_id not in self.revisions:
+            revision = None
+            if self.drive is not None:
+                self.stats['revision_checks'] += 1
+                metadata = self.drive.files().get(
+                    fileId=spreadsheet_id, fields='version,modifiedTime', supportsAllDrives=True
+                ).execute()
+                revision = str(metadata.get('version') or metadata.get('modifiedTime') or "") or None
+            self.revisions[spreadsheet_id] = revision
+        return self.revisions[spreadsheet_id]
+
+    def read_ranges(self, spreadsheet_id: str, ranges: List[str]) -> Dict[str, list]:
+        """
+        Values of each range, from the cache when the spreadsheet is unchanged
+
+        Args:
+            spreadsheet_id: Spreadsheet to read
+            ranges: A1 ranges (see sheet_range)
+
+        Returns:
+            Dict of range → 2D values list (rows as the API returns them;
+            an empty range gives [])
+        """
+        revision = self.revision(spreadsheet_id)
+        results = {}
+        stale = []
+        for range_name in dict.fromkeys(ranges):
+            entry = self.index.get(self._key(spreadsheet_id, range_name))
+            values = None
+            if revision is not None and entry and entry.get('revision') == revision:
+                values = self._read_values(entry['file'])
+            if values is None:
+                stale.append(range_name)
+            else:
+                self.stats['hits'] += 1
+                results[range_name] = values
+
+        if stale:
+            self.stats['misses'] += len(stale)
+            self.stats['batch_gets'] += 1
+            response = self.sheets.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id, ranges=stale, valueRenderOption=self.value_render_option
+            ).execute()
+            # valueRanges come back in request order (their 'range' is normalized by the API)
+            for range_name, value_range in zip(stale, response.get('valueRanges', [])):
+                values = value_range.get('values', [])
+                results[range_name] = values
+                self._store(spreadsheet_id, range_name, revision, values)
+
+        return {range_name: results[range_name] for range_name in ranges}
+
+    def read_range(self, spreadsheet_id: str, range_name: str) -> list:
+        """read_ranges() for a single range"""
+        return self.read_ranges(spreadsheet_id, [range_name])[range_name]
+
+    def sheet_titles(self, spreadsheet_id: str) -> List[str]:
+        """Tab titles of the spreadsheet, cached under the same revision as the ranges"""
+        key = self._key(spreadsheet_id, '#titles')
+        revision = self.revision(spreadsheet_id)
+        entry = self.index.get(key)
+        if revision is not None and entry and entry.get('revision') == revision:
+            self.stats['hits'] += 1
+            return entry['titles']
+
+        self.stats['misses'] += 1
+        metadata = self.sheets.spreadsheets().get(
+            spreadsheetId=spreadsheet_id, fields='sheets.properties.title'
+        ).execute()
+        titles = [sheet['properties']['title'] for sheet in metadata.get('sheets', [])]
+        self.index[key] = {'spreadsheet_id': spreadsheet_id, 'range': '#titles', 'revision': revision,
+                           'titles': titles, 'fetched': datetime.now().isoformat(timespec='seconds')}
+        self.dirty = True
+        return titles
+
+    def _read_values(self, filename: str) -> Optional[list]:
+        try:
+            with gzip.open(os.path.join(self.cache_dir, filename), 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, EOFError, json.JSONDecodeError):
+            return None
+
+    def _store(self, spreadsheet_id: str, range_name: str, revision: Optional[str], values: list):
+        if revision is None:
+            return
+        key = self._key(spreadsheet_id, range_name)
+        filename = f"{key}.json.gz"
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                                  compresslevel=6, mtime=0))
+        os.replace(tmp_path, path)
+        self.index[key] = {'spreadsheet_id': spreadsheet_id, 'range': range_name, 'revision': revision,
+                           'file': filename, 'rows': len(values),
+                           'fetched': datetime.now().isoformat(timespec='seconds')}
+        self.dirty = True
+
+
+def write_if_changed(path: str, data) -> bool:
+    """Write data as JSON unless the file already holds exactly that; True if written"""
+    encoded = json.dumps(data, indent=2).encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == encoded:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(encoded)
+    os.replace(tmp_path, path)
+    return True
+
+
+def export_pipeline_inputs(cache: SheetsReadCache, spreadsheet_id: str = PI_WORK_FLOW_ID,
+                           output_dir: str = '.') -> Dict[str, bool]:
+    """
+    Write the JSON inputs of Jobs 1-5 from the cache
+
+    Reads every SHEETS_CACHE_EXPORTS sheet plus all monthly tabs in one
+    read_ranges() call (one batchGet for whatever is stale).
+
+    Returns:
+        Dict of output file → True if it was (re)written
+    """
+    from pipeline.populate_ingest_from_monthly import is_monthly_tab
+
+    monthly_tabs = [title for title in cache.sheet_titles(spreadsheet_id) if is_monthly_tab(title)]
+    ranges = {filename: sheet_range(SHEETS[sheet_key]) for filename, sheet_key in SHEETS_CACHE_EXPORTS.items()}
+    monthly_ranges = {title: sheet_range(title) for title in monthly_tabs}
+
+    values = cache.read_ranges(spreadsheet_id, list(ranges.values()) + list(monthly_ranges.values()))
+    cache.save()
+
+    written = {}
+    for filename, range_name in ranges.items():
+        written[filename] = write_if_changed(os.path.join(output_dir, filename), values[range_name])
+    monthly_data = {title: values[range_name] for title, range_name in monthly_ranges.items()}
+    written['monthly-tabs-data.json'] = write_if_changed(os.path.join(output_dir, 'monthly-tabs-data.json'),
+                                                         monthly_data)
+    return written
+
+
+def main():
+    """Export the pipeline's input JSON files through the cache"""
+    import pickle
+    from googleapiclient.discovery import build
+
+    print("=" * 70)
+    print("📥 EXPORT SHEETS (revision-aware cache)")
+    print("=" * 70)
+
+    with open('token.pickle', 'rb') as token:
+        credentials = pickle.load(token)
+    cache = SheetsReadCache(build('sheets', 'v4', credentials=credentials),
+                            build('drive', 'v3', credentials=credentials))
+    written = export_pipeline_inputs(cache)
+
+    for filename, changed in written.items():
+        print(f"   {'💾 written  ' if changed else '✓ unchanged'} {filename}")
+    stats = cache.stats
+    print(f"\n   Revision checks: {stats['revision_checks']}, cached ranges: {stats['hits']}, "
+          f"fetched ranges: {stats['misses']} ({stats['batch_gets']} batchGet calls)")
+
+
+if __name__ == "__main__":
+    if '--export' in sys.argv:
+        main()
+    else:
+        print(__doc__)
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Bit-parallel string similarity for fuzzy venue matching (Job 3)
+
+The query string is encoded once as per-character bitmasks (one bit per
+query position, Python ints as bit vectors), after which each candidate is
+scored in one pass over its characters with a handful of integer operations
+per character instead of a Python-level DP table:
+- levenshtein():    Myers/Hyyro bit-parallel edit distance
+- osa_distance():   same with adjacent transpositions counted as one edit
+- lcs_length():     bit-parallel longest common subsequence
+
+Scorers (QueryScorer) return a ratio in 0..1 and stop early once a candidate
+can no longer reach score_cutoff, returning 0.0 for it:
+- 'levenshtein':      1 - distance / max(len). Aborts as soon as the
+                      distance is certain to exceed the cutoff's budget.
+- 'sequence_matcher': difflib.SequenceMatcher(None, a, b).ratio(), the
+                      scorer match_venue has always used. 2 * LCS / total
+                      length is an upper bound of that ratio, so only
+                      candidates whose bound reaches the cutoff are handed
+                      to SequenceMatcher; decisions are identical.
+
+Which scorer match_venue uses is VENUE_FUZZY_SCORER (pipeline/config.py).
+
+Usage:
+    python3 pipeline/similarity.py --benchmark [venues-data.json]
+"""
+
+import os
+import sys
+import time
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Optional, Tuple
+
+SCORERS = ('levenshtein', 'sequence_matcher')
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    """Character → bitmask of its positions in pattern"""
+    masks = {}
+    bit = 1
+    for char in pattern:
+        masks[char] = masks.get(char, 0) | bit
+        bit <<= 1
+    return masks
+
+
+def _levenshtein(masks: Dict[str, int], m: int, text: str, max_distance: int) -> int:
+    # Myers (1999) in Hyyro's formulation; VP/VN are the vertical +1/-1 deltas
+    # of the current DP column, score is the bottom cell D[m][j]
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    vp, vn = full, 0
+    score = m
+    remaining = len(text)
+    for char in text:
+        pm = masks.get(char, 0)
+        x = pm | vn
+        d0 = (((x & vp) + vp) ^ vp) | x
+        hp = vn | ~(d0 | vp)
+        hn = vp & d0
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        remaining -= 1
+        # Each remaining character lowers the score by at most one
+        if score - remaining > max_distance:
+            return max_distance + 1
+        hp = (hp << 1) | 1
+        hn <<= 1
+        vp = (hn | ~(d0 | hp)) & full
+        vn = hp & d0 & full
+    return score
+
+
+def _osa_distance(masks: Dict[str, int], m: int, text: str, max_distance: int) -> int:
+    # Hyyro (2003) extension of Myers with transposition bits (TR)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    vp, vn, d0 = full, 0, 0
+    pm_previous = 0
+    score = m
+    remaining = len(text)
+    for char in text:
+        pm = masks.get(char, 0)
+        tr = (((~d0) & pm) << 1) & pm_previous
+        d0 = ((((pm & vp) + vp) ^ vp) | pm | vn | tr) & full
+        hp = vn | ~(d0 | vp)
+        hn = d0 & vp
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        remaining -= 1
+        if score - remaining > max_distance:
+            return max_distance + 1
+        hp = (hp << 1) | 1
+        hn <<= 1
+        vp = (hn | ~(d0 | hp)) & full
+        vn = hp & d0 & full
+        pm_previous = pm
+    return score
+
+
+def _lcs_length(masks: Dict[str, int], m: int, text: str) -> int:
+    # Allison-Dix / Hyyro: zero bits of S mark matched pattern positions
+    full = (1 << m) - 1
+    s = full
+    for char in text:
+        u = s & masks.get(char, 0)
+        s = ((s + u) | (s - u)) & full
+    return m - s.bit_count()
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Edit distance of a and b (insert, delete, substitute)
+
+    Args:
+        max_distance: Optional bound; returns max_distance + 1 as soon as the
+            distance is known to exceed it
+
+    Example:
+        levenshtein("wembly stadium", "wembley stadium")
+        Returns: 1
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    bound = len(a) if max_distance is None else max_distance
+    if len(a) - len(b) > bound:
+        return bound + 1
+    if not b:
+        return len(a)
+    return _levenshtein(_pattern_masks(b), len(b), a, bound)
+
+
+def osa_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Edit distance counting an adjacent transposition as one edit (optimal
+    string alignment); bounded like levenshtein()
+
+    Example:
+        osa_distance("arean", "arena")
+        Returns: 1
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    bound = len(a) if max_distance is None else max_distance
+    if len(a) - len(b) > bound:
+        return bound + 1
+    if not b:
+        return len(a)
+    return _osa_distance(_pattern_masks(b), len(b), a, bound)
+
+
+def lcs_length(a: str, b: str) -> int:
+    """Length of the longest common subsequence of a and b"""
+    if not a or not b:
+        return 0
+    return _lcs_length(_pattern_masks(a), len(a), b)
+
+
+class QueryScorer:
+    """
+    Similarity of one query string against many candidates
+
+    The query's bitmasks are built once; call the scorer with each candidate.
+
+    Example:
+        scorer = QueryScorer("wembly stadium")
+        scorer("wembley stadium", score_cutoff=0.85)
+        Returns: 0.9333
+    """
+
+    def __init__(self, query: str, scorer: str = 'levenshtein'):
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown scorer {scorer!r} (expected one of {', '.join(SCORERS)})")
+        self.query = query
+        self.scorer = scorer
+        self._masks = _pattern_masks(query)
+
+    def __call__(self, choice: str, score_cutoff: float = 0.0) -> float:
+        """Ratio in 0..1, or 0.0 if it is below score_cutoff"""
+        if self.scorer == 'levenshtein':
+            return self._levenshtein_ratio(choice, score_cutoff)
+        return self._sequence_matcher_ratio(choice, score_cutoff)
+
+    def _levenshtein_ratio(self, choice: str, score_cutoff: float) -> float:
+        m, n = len(self.query), len(choice)
+        longest = max(m, n)
+        if longest == 0:
+            return 1.0
+        # Largest distance that still scores >= score_cutoff (epsilon absorbs float error)
+        max_distance = int((1.0 - score_cutoff) * longest + 1e-9)
+        if abs(m - n) > max_distance:
+            return 0.0
+        if m == 0:
+            distance = n
+        else:
+            distance = _levenshtein(self._masks, m, choice, max_distance)
+        if distance > max_distance:
+            return 0.0
+        return 1.0 - distance / longest
+
+    def _sequence_matcher_ratio(self, choice: str, score_cutoff: float) -> float:
+        total = len(self.query) + len(choice)
+        if total == 0:
+            return 1.0
+        # SequenceMatcher's matching blocks form a common subsequence, so
+        # 2 * min(len) / total and then 2 * LCS / total bound its ratio
+        if 2.0 * min(len(self.query), len(choice)) / total < score_cutoff:
+            return 0.0
+        if self.query and 2.0 * _lcs_length(self._masks, len(self.query), choice) / total < score_cutoff:
+            return 0.0
+        score = SequenceMatcher(None, self.query, choice).ratio()
+        return score if score >= score_cutoff else 0.0
+
+
+def best_match(query: str, choices: Iterable[Tuple[str, str]], score_cutoff: float = 0.0,
+               scorer: str = 'levenshtein') -> Tuple[Optional[str], float]:
+    """
+    Highest-scoring (key, text) choice at or above score_cutoff
+
+    Ties keep the first choice; each candidate only has to beat the best
+    score so far, so later candidates are cut off ever earlier.
+
+    Returns:
+        (key, score) or (None, 0.0) if no choice reaches score_cutoff
+    """
+    score_query = QueryScorer(query, scorer)
+    best_key, best_score = None, 0.0
+    for key, text in choices:
+        score = score_query(text, max(score_cutoff, best_score))
+        if score > best_score:
+            best_key, best_score = key, score
+    return best_key, best_score
+
+
+def benchmark(venues_path: str = 'venues-data.json', repeat: int = 3):
+    """
+    Time the fuzzy tier over the venue name corpus: SequenceMatcher as
+    match_venue used to call it vs. both QueryScorer modes
+    """
+    import json
+    import random
+    from pipeline.config import VENUE_MATCH_THRESHOLD
+    from pipeline.event_keys import normalize_venue_name
+
+    print("=" * 70)
+    print("⏱️  VENUE SIMILARITY BENCHMARK")
+    print("=" * 70)
+
+    try:
+        with open(venues_path, 'r') as f:
+            venues_data = json.load(f)
+        print(f"   Corpus: {venues_path}")
+    except FileNotFoundError:
+        venues_data = _synthetic_venues(400)
+        print(f"   Corpus: {venues_path} not found, using {len(venues_data) - 1} synthetic venues")
+
+    headers = venues_data[0]
+    name_idx = headers.index('VENUE_NAME')
+    aliases_idx = headers.index('VENUE_ALIASES') if 'VENUE_ALIASES' in headers else -1
+    corpus = []
+    for row in venues_data[1:]:
+        if name_idx < len(row) and row[name_idx]:
+            corpus.append(normalize_venue_name(row[name_idx]))
+        if 0 <= aliases_idx < len(row) and row[aliases_idx]:
+            try:
+                aliases = json.loads(row[aliases_idx])
+            except (ValueError, TypeError):
+                aliases = [a.strip() for a in row[aliases_idx].split(',')]
+            corpus.extend(normalize_venue_name(a) for a in aliases if a)
+    choices = list(enumerate(corpus))
+
+    # Queries: corpus strings with 0-3 random typos, plus unrelated strings
+    rng = random.Random(42)
+    letters = 'abcdefghijklmnopqrstuvwxyz '
+    queries = []
+    for text in rng.sample(corpus, min(200, len(corpus))):
+        chars = list(text)
+        for _ in range(rng.randint(0, 3)):
+            if not chars:
+                break
+            pos = rng.randrange(len(chars))
+            edit = rng.choice(('sub', 'del', 'ins'))
+            if edit == 'sub':
+                chars[pos] = rng.choice(letters)
+            elif edit == 'del':
+                del chars[pos]
+            else:
+                chars.insert(pos, rng.choice(letters))
+        queries.append(''.join(chars))
+    queries += [f"unknown venue {i}" for i in range(50)]
+
+    def baseline(query):
+        best_key, best_score = None, 0.0
+        for key, text in choices:
+            score = SequenceMatcher(None, query, text).ratio()
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key if best_score >= VENUE_MATCH_THRESHOLD else None
+
+    def run(scorer):
+        return lambda query: best_match(query, choices, VENUE_MATCH_THRESHOLD, scorer)[0]
+
+    print(f"   {len(queries)} queries x {len(choices)} names/aliases, threshold {VENUE_MATCH_THRESHOLD}")
+    print()
+
+    expected = None
+    for label, match in (('SequenceMatcher (before)', baseline),
+                         ("QueryScorer 'sequence_matcher'", run('sequence_matcher')),
+                         ("QueryScorer 'levenshtein'", run('levenshtein'))):
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decisions = [match(q) for q in queries]
+            seconds.append(time.perf_counter() - start)
+        per_query_ms = min(seconds) * 1000 / len(queries)
+        if expected is None:
+            expected = decisions
+            agreement = ""
+        else:
+            same = sum(1 for a, b in zip(expected, decisions) if a == b)
+            agreement = f", {same}/{len(queries)} decisions as before"
+        matched = sum(1 for d in decisions if d is not None)
+        print(f"   {label:<32} {per_query_ms:7.2f}ms/query ({matched} matched{agreement})")
+
+
+def _synthetic_venues(count: int) -> list:
+    import json
+    import random
+    rng = random.Random(7)
+    words = ['grand', 'theatre', 'hall', 'arena', 'club', 'centre', 'playhouse', 'academy', 'lyceum',
+             'empire', 'pavilion', 'opera', 'house', 'garden', 'park', 'civic', 'corn', 'exchange',
+             'victoria', "king's", "queen's", 'royal', 'city', 'town', 'assembly', 'rooms', 'music']
+    cities = ['London', 'Manchester', 'Birmingham', 'Glasgow', 'Dublin', 'Cardiff', 'Leeds', 'Belfast']
+    rows = [['VENUE_ID', 'VENUE_NAME', 'VENUE_ALIASES', 'CITY']]
+    for i in range(count):
+        name = ' '.join(rng.sample(words, rng.randint(2, 3))).title()
+        city = rng.choice(cities)
+        rows.append([f"venue-{i}", f"{name} {city}", json.dumps([name]), city])
+    return rows
+
+
+if __name__ == "__main__":
+    # Add parent directory to path
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+    if '--benchmark' in sys.argv:
+        args = sys.argv[sys.argv.index('--benchmark') + 1:]
+        benchmark(args[0] if args else 'venues-data.json')
+    else:
+        print(__doc__)
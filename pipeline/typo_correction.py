@@ -0,0 +1,267 @@
+"""
+Typo correction for venue and event names (Job 3)
+
+Python counterpart of the Apps Script correctVenueTypos / correctCityTypos /
+correctEventTypos pattern lists. Instead of scanning a dictionary with an
+edit-distance function per cell, each dictionary is a symmetric-delete
+(SymSpell) index: every known word's deletes (up to TYPO_MAX_EDIT_DISTANCE
+characters removed from its first TYPO_PREFIX_LENGTH characters) point back
+to the word. A lookup generates the input's own deletes, so the candidates
+come from a few dict probes and only those are verified with a bounded edit
+distance (transpositions count as one edit) - lookup cost depends on the
+word's length, not the dictionary size.
+
+Dictionaries:
+- Venues: words of VENUE_NAME, VENUE_ALIASES and CITY (build_venue_corrector)
+- Events: category keywords plus event-name words that occur at least
+  TYPO_EVENT_TOKEN_MIN_COUNT times, i.e. frequent artist tokens
+  (build_event_corrector)
+
+Corrections are only applied with confidence >= TYPO_MIN_CONFIDENCE and to
+words of at least TYPO_MIN_WORD_LENGTH characters. Enrichment uses the
+corrected text for matching only; the sheet cells are not rewritten.
+
+Example:
+    corrector = build_venue_corrector(venues_data)
+    corrector.correct("Wembly Stadium, Londn")
+    Returns: ("Wembley Stadium, London", 0.8)
+"""
+
+import json
+import re
+from collections import Counter
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pipeline.config import (
+    TYPO_MAX_EDIT_DISTANCE, TYPO_PREFIX_LENGTH, TYPO_MIN_WORD_LENGTH,
+    TYPO_MIN_CONFIDENCE, TYPO_EVENT_TOKEN_MIN_COUNT
+)
+from pipeline.similarity import osa_distance
+from pipeline.utils import parse_venue_aliases
+
+WORD_PATTERN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+# Weight of category keywords relative to a word seen once in event names
+KEYWORD_WEIGHT = 100
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Edit distance of a and b counting an adjacent transposition as one edit
+    (optimal string alignment), or max_distance + 1 once it is exceeded
+
+    Computed bit-parallel by similarity.osa_distance.
+    """
+    if a == b:
+        return 0
+    return min(osa_distance(a, b, max_distance), max_distance + 1)
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """Every string obtained by deleting up to max_distance characters"""
+    result = {word}
+    for distance in range(1, min(max_distance, len(word)) + 1):
+        for positions in combinations(range(len(word)), distance):
+            result.add(''.join(c for i, c in enumerate(word) if i not in positions))
+    return result
+
+
+class SymSpellIndex:
+    """
+    Symmetric-delete index of a word dictionary
+
+    Attributes:
+        words: {word: count}
+        max_distance: Largest edit distance looked up
+        prefix_length: Deletes are generated from this many leading characters
+    """
+
+    def __init__(self, max_distance: int = TYPO_MAX_EDIT_DISTANCE, prefix_length: int = TYPO_PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words: Dict[str, int] = {}
+        self.deletes: Dict[str, List[str]] = {}
+        self._memo: Dict[str, Optional[Tuple[str, int, float]]] = {}
+
+    def add(self, word: str, count: int = 1):
+        """Add a (lowercase) word, or raise its count if known"""
+        if not word:
+            return
+        if word not in self.words:
+            for delete in _deletes(word[:self.prefix_length], self.max_distance):
+                self.deletes.setdefault(delete, []).append(word)
+        self.words[word] = self.words.get(word, 0) + count
+        self._memo.clear()
+
+    def allowed_distance(self, word: str) -> int:
+        """Edit distance tolerated for a word (1 below 8 characters)"""
+        return self.max_distance if len(word) >= 8 else min(1, self.max_distance)
+
+    def lookup(self, word: str) -> Optional[Tuple[str, int, float]]:
+        """
+        Closest dictionary word
+
+        Returns:
+            (suggestion, distance, confidence) or None if nothing is within
+            the allowed distance. Known words return (word, 0, 1.0).
+            Confidence falls with the distance relative to the word length and
+            with the share of equally close candidates (by count).
+        """
+        if word in self._memo:
+            return self._memo[word]
+
+        if word in self.words:
+            result = (word, 0, 1.0)
+        else:
+            max_distance = self.allowed_distance(word)
+            candidates = set()
+            for delete in _deletes(word[:self.prefix_length], max_distance):
+                candidates.update(self.deletes.get(delete, ()))
+
+            best_distance = max_distance + 1
+            best = []
+            for candidate in candidates:
+                distance = bounded_edit_distance(word, candidate, max_distance)
+                if distance < best_distance:
+                    best_distance, best = distance, [candidate]
+                elif distance == best_distance:
+                    best.append(candidate)
+
+            if best_distance > max_distance:
+                result = None
+            else:
+                # Most frequent first, then alphabetical for stable results
+                best.sort(key=lambda w: (-self.words[w], w))
+                total = sum(self.words[w] for w in best)
+                share = self.words[best[0]] / total
+                result = (best[0], best_distance, round((1 - best_distance / len(word)) * share, 3))
+
+        self._memo[word] = result
+        return result
+
+
+def _match_case(original: str, word: str) -> str:
+    if original.isupper() and len(original) > 1:
+        return word.upper()
+    if original[:1].isupper():
+        return word[:1].upper() + word[1:]
+    return word
+
+
+class TypoCorrector:
+    """Word-by-word correction of free text against one SymSpellIndex"""
+
+    def __init__(self, index: SymSpellIndex, min_confidence: float = TYPO_MIN_CONFIDENCE,
+                 min_word_length: int = TYPO_MIN_WORD_LENGTH):
+        self.index = index
+        self.min_confidence = min_confidence
+        self.min_word_length = min_word_length
+
+    def correct(self, text: str) -> Tuple[str, float]:
+        """
+        Correct every word of the text that has a confident suggestion
+
+        Returns:
+            (corrected text, confidence) where confidence is the lowest of the
+            applied corrections (1.0 if nothing changed). Punctuation, spacing
+            and capitalization of the input are kept.
+        """
+        if not text:
+            return text, 1.0
+        confidence = 1.0
+
+        def replace(match):
+            nonlocal confidence
+            original = match.group(0)
+            word = original.lower()
+            if len(word) < self.min_word_length or word.isdigit():
+                return original
+            suggestion = self.index.lookup(word)
+            if not suggestion or suggestion[1] == 0 or suggestion[2] < self.min_confidence:
+                return original
+            confidence = min(confidence, suggestion[2])
+            return _match_case(original, suggestion[0])
+
+        corrected = WORD_PATTERN.sub(replace, text)
+        return corrected, confidence
+
+    def correct_column(self, values: Iterable[str]) -> List[Tuple[str, float]]:
+        """correct() for a whole column; each distinct value is corrected once"""
+        memo = {}
+        results = []
+        for value in values:
+            value = str(value or "")
+            if value not in memo:
+                memo[value] = self.correct(value)
+            results.append(memo[value])
+        return results
+
+
+def _words(text: str) -> List[str]:
+    return [w.lower() for w in WORD_PATTERN.findall(str(text or ""))]
+
+
+def venue_vocabulary(venues_data: list) -> Counter:
+    """Word counts over VENUES names, aliases and cities"""
+    counts = Counter()
+    if venues_data and len(venues_data) > 1:
+        col_map = {h: i for i, h in enumerate(venues_data[0])}
+
+        def cell(row, column):
+            idx = col_map.get(column, -1)
+            return row[idx] if 0 <= idx < len(row) else ""
+
+        for row in venues_data[1:]:
+            counts.update(_words(cell(row, 'VENUE_NAME')))
+            counts.update(_words(cell(row, 'CITY')))
+            for alias in parse_venue_aliases(cell(row, 'VENUE_ALIASES')):
+                counts.update(_words(alias))
+    return counts
+
+
+def build_venue_corrector(venues_data: list, vocabulary: Dict[str, int] = None) -> TypoCorrector:
+    """
+    Corrector over the words of VENUES names, aliases and cities
+
+    Args:
+        venues_data: VENUES sheet data
+        vocabulary: Precomputed venue_vocabulary(venues_data) (e.g. from the
+            reference snapshot); venues_data is not read when given
+    """
+    index = SymSpellIndex()
+    if vocabulary is None:
+        vocabulary = venue_vocabulary(venues_data)
+    for word, count in vocabulary.items():
+        index.add(word, count)
+    return TypoCorrector(index)
+
+
+def build_event_corrector(event_names: Iterable[str], categories_data: list = None,
+                          min_count: int = TYPO_EVENT_TOKEN_MIN_COUNT) -> TypoCorrector:
+    """
+    Corrector over category keywords and frequent event-name words
+
+    Args:
+        event_names: Event names to learn frequent (artist) words from
+        categories_data: EVENT_CATEGORIES sheet data (KEYWORDS column)
+        min_count: Occurrences needed for an event-name word to be trusted
+    """
+    index = SymSpellIndex()
+    counts = Counter(word for name in event_names for word in _words(name))
+    for word, count in counts.items():
+        if count >= min_count:
+            index.add(word, count)
+
+    if categories_data and len(categories_data) > 1:
+        idx = {h: i for i, h in enumerate(categories_data[0])}.get('KEYWORDS', -1)
+        for row in categories_data[1:]:
+            keywords_str = row[idx] if 0 <= idx < len(row) else "[]"
+            try:
+                keywords = json.loads(keywords_str)
+            except:
+                keywords = [k.strip() for k in keywords_str.strip('[]').replace('"', '').split(',')]
+            for keyword in keywords:
+                for word in _words(keyword):
+                    index.add(word, KEYWORD_WEIGHT)
+    return TypoCorrector(index)
@@ -1,103 +1,21 @@
 """Shared utility functions for PI Events pipeline"""
 
 import hashlib
+import json
 import re
 from datetime import datetime, timedelta
 import pytz
 from typing import Dict, List, Optional, Tuple
-from difflib import SequenceMatcher
 
-
-def normalize_url(url: str) -> str:
-    """
-    Normalize URL for deduplication (strips protocol, www, params, trailing slashes)
-
-    Example:
-        normalize_url("https://www.theo2.co.uk/events/detail/event?ref=123")
-        Returns: "theo2.co.uk/events/detail/event"
-    """
-    if not url:
-        return ""
-
-    url = url.lower().strip()
-    url = url.replace('https://', '').replace('http://', '')
-
-    if '?' in url:
-        url = url.split('?', 1)[0]
-
-    url = url.rstrip('/')
-    url = url.replace('www.', '')
-
-    return url
-
-
-def normalize_event_name(name: str) -> str:
-    """
-    Normalize event name for deduplication
-
-    Example:
-        normalize_event_name("The Beatles - Live Tour 2026")
-        Returns: "beatles - live tour"
-    """
-    if not name:
-        return ""
-
-    # Convert to lowercase, strip whitespace
-    name = name.lower().strip()
-
-    # Remove common suffixes/prefixes
-    patterns = [
-        r'\s*-\s*live$',
-        r'^the\s+',
-        r'\s+tour$',
-        r'\s+\d{4}$',  # Year suffixes
-        r'\s*\(.*\)$',  # Parenthetical notes
-    ]
-
-    for pattern in patterns:
-        name = re.sub(pattern, '', name)
-
-    # Normalize whitespace
-    name = re.sub(r'\s+', ' ', name)
-
-    return name.strip()
-
-
-def normalize_venue_name(venue: str) -> str:
-    """
-    Normalize venue name for matching
-
-    Example:
-        normalize_venue_name("The O2 Arena, London")
-        Returns: "o2"
-    """
-    if not venue:
-        return ""
-
-    venue = venue.lower().strip()
-
-    # Remove common location suffixes
-    venue = re.sub(r',\s*london$', '', venue)
-    venue = re.sub(r',\s*uk$', '', venue)
-    venue = re.sub(r',\s*ireland$', '', venue)
-
-    # Normalize common venue name variations
-    replacements = {
-        'the o2 arena': 'the o2',
-        'o2 arena': 'the o2',
-        'indigo at the o2': 'indigo',
-    }
-
-    for old, new in replacements.items():
-        if old in venue:
-            venue = venue.replace(old, new)
-
-    return venue.strip()
+# Keying helpers live in pipeline.event_keys; re-exported for existing imports
+from pipeline.event_keys import normalize_url, normalize_event_name, normalize_venue_name, parse_date
+from pipeline.similarity import QueryScorer
 
 
 def generate_event_id(event_date: str, event_name: str, venue_id: str) -> str:
     """
     Generate unique EVENT_ID from event key using SHA-256 hash
+    (same value as event_keys.event_key(...).event_id)
 
     Example:
         generate_event_id("2026-06-15", "Taylor Swift", "wembley-stadium-london")
@@ -109,7 +27,8 @@ def generate_event_id(event_date: str, event_name: str, venue_id: str) -> str:
 
 def create_event_key(event_date: str, event_name: str, venue_id: str) -> str:
     """
-    Create deduplication key (date|name|venue)
+    Create deduplication key (date|name|venue) from an already-normalized
+    date and venue; event_keys.event_key() normalizes raw fields itself
 
     Example:
         create_event_key("2026-06-15", "Taylor Swift", "wembley-stadium-london")
@@ -118,60 +37,6 @@ def create_event_key(event_date: str, event_name: str, venue_id: str) -> str:
     return f"{event_date}|{normalize_event_name(event_name)}|{venue_id}"
 
 
-def parse_date(date_str: str) -> Optional[str]:
-    """
-    Parse various date formats to YYYY-MM-DD
-
-    Supported formats:
-        - YYYY-MM-DD (already normalized)
-        - DD.MM.YY or DD.MM.YYYY
-        - DD/MM/YY or DD/MM/YYYY
-
-    Example:
-        parse_date("15.06.26") Returns: "2026-06-15"
-        parse_date("15/06/2026") Returns: "2026-06-15"
-        parse_date("2026-06-15") Returns: "2026-06-15"
-    """
-    if not date_str:
-        return None
-
-    date_str = str(date_str).strip()
-
-    # Already in YYYY-MM-DD format
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        return date_str
-
-    # Handle date ranges: "DD.MM.YY - DD.MM.YY" -> extract first date
-    if ' - ' in date_str or ' & ' in date_str:
-        date_str = re.split(r'\s*[-&]\s*', date_str)[0].strip()
-
-    # DD.MM.YY or DD.MM.YYYY
-    if '.' in date_str:
-        parts = date_str.split('.')
-        if len(parts) == 3:
-            day, month, year = parts
-            if len(year) == 2:
-                year = '20' + year
-            try:
-                return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-            except:
-                return None
-
-    # DD/MM/YY or DD/MM/YYYY
-    if '/' in date_str:
-        parts = date_str.split('/')
-        if len(parts) == 3:
-            day, month, year = parts
-            if len(year) == 2:
-                year = '20' + year
-            try:
-                return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-            except:
-                return None
-
-    return None
-
-
 def is_event_outdated(event_date: str, event_time: str, hours_buffer: int = 6) -> bool:
     """
     Check if event is outdated (end time < now - hours_buffer)
@@ -220,39 +85,73 @@ def is_event_outdated(event_date: str, event_time: str, hours_buffer: int = 6) -
         return False
 
 
-def fuzzy_match_venue(venue_name: str, venues_data: List[List[str]], threshold: float = 0.85) -> Optional[str]:
+def parse_venue_aliases(aliases_str: str) -> List[str]:
     """
-    Match venue name to VENUES.VENUE_ID using tiered matching
+    Parse a VENUE_ALIASES cell (JSON array or comma-separated)
+
+    Example:
+        parse_venue_aliases('["O2 Arena", "North Greenwich Arena"]')
+        Returns: ["O2 Arena", "North Greenwich Arena"]
+    """
+    if not aliases_str:
+        return []
+    if aliases_str.startswith('['):
+        try:
+            return json.loads(aliases_str)
+        except:
+            pass
+    return [a.strip().strip('"[]') for a in aliases_str.split(',')]
+
+
+def match_venue(venue_name: str, venues_data: List[List[str]], threshold: float = 0.85,
+                scorer: str = 'sequence_matcher', snapshot=None) -> Tuple[Optional[str], str, float]:
+    """
+    Match venue name to VENUES.VENUE_ID using tiered matching, reporting the tier
 
     Algorithm (in order of priority):
         1. Exact normalized match against canonical name
         2. Exact normalized match against aliases
-        3. Fuzzy match (Levenshtein distance) against canonical name and aliases
+        3. Fuzzy match (similarity.QueryScorer) against canonical name and aliases
 
     Args:
         venue_name: Input venue name to match
         venues_data: 2D array from VENUES sheet (headers + data rows)
         threshold: Similarity threshold for fuzzy matching (0.0 to 1.0, default: 0.85)
+        scorer: QueryScorer mode ('sequence_matcher' = difflib ratio, 'levenshtein')
+        snapshot: Optional ReferenceSnapshot of the same VENUES data
+            (reference_snapshot.py); tiers 1-2 become binary searches and
+            nothing is re-parsed or re-normalized
 
     Returns:
-        VENUE_ID if match found, None otherwise
+        Tuple of (VENUE_ID or None, tier, score) where tier is exact, alias,
+        fuzzy or none and score the similarity (1.0 for exact/alias, 0.0 when
+        nothing reaches the threshold)
 
     Example:
-        fuzzy_match_venue("O2 Arena London", venues_data, 0.85)
-        Returns: "the-o2-arena-london"
+        match_venue("O2 Arena London", venues_data, 0.85)
+        Returns: ("the-o2-arena-london", "alias", 1.0)
     """
-    if not venues_data or len(venues_data) < 2:
-        return None
-
     normalized_input = normalize_venue_name(venue_name)
 
+    if snapshot is not None:
+        venue_id = snapshot.find_by_name(normalized_input)
+        if venue_id is not None:
+            return venue_id, 'exact', 1.0
+        venue_id = snapshot.find_by_alias(normalized_input)
+        if venue_id is not None:
+            return venue_id, 'alias', 1.0
+        return _best_fuzzy_match(normalized_input, snapshot.fuzzy_candidates(), threshold, scorer)
+
+    if not venues_data or len(venues_data) < 2:
+        return None, 'none', 0.0
+
     headers = venues_data[0]
     try:
         venue_id_idx = headers.index('VENUE_ID')
         venue_name_idx = headers.index('VENUE_NAME')
         aliases_idx = headers.index('VENUE_ALIASES') if 'VENUE_ALIASES' in headers else -1
     except ValueError:
-        return None
+        return None, 'none', 0.0
 
     # Tier 1: Exact normalized match against canonical name
     for row in venues_data[1:]:
@@ -263,7 +162,7 @@ def fuzzy_match_venue(venue_name: str, venues_data: List[List[str]], threshold:
         normalized_canonical = normalize_venue_name(canonical_name)
 
         if normalized_input == normalized_canonical:
-            return row[venue_id_idx]
+            return row[venue_id_idx], 'exact', 1.0
 
     # Tier 2: Exact normalized match against aliases
     for row in venues_data[1:]:
@@ -274,27 +173,32 @@ def fuzzy_match_venue(venue_name: str, venues_data: List[List[str]], threshold:
         aliases_str = row[aliases_idx] if aliases_idx >= 0 and aliases_idx < len(row) else ""
 
         if aliases_str:
-            # Parse aliases (JSON array or comma-separated)
-            aliases = []
-            if aliases_str.startswith('['):
-                try:
-                    import json
-                    aliases = json.loads(aliases_str)
-                except:
-                    aliases = [a.strip().strip('"[]') for a in aliases_str.split(',')]
-            else:
-                aliases = [a.strip().strip('"[]') for a in aliases_str.split(',')]
-
-            for alias in aliases:
+            for alias in parse_venue_aliases(aliases_str):
                 if not alias:
                     continue
                 normalized_alias = normalize_venue_name(alias)
                 if normalized_input == normalized_alias:
-                    return venue_id
+                    return venue_id, 'alias', 1.0
 
-    # Tier 3: Fuzzy match (Levenshtein distance)
-    best_match = None
-    best_score = 0.0
+    # Tier 3: Fuzzy match
+    return _best_fuzzy_match(normalized_input, venue_match_candidates(venues_data), threshold, scorer)
+
+
+def venue_match_candidates(venues_data: List[List[str]]):
+    """
+    Yield (VENUE_ID, normalized name) for every canonical name and alias, in
+    the order match_venue's fuzzy tier compares them (row by row, canonical
+    name first)
+    """
+    if not venues_data or len(venues_data) < 2:
+        return
+
+    headers = venues_data[0]
+    if 'VENUE_ID' not in headers or 'VENUE_NAME' not in headers:
+        return
+    venue_id_idx = headers.index('VENUE_ID')
+    venue_name_idx = headers.index('VENUE_NAME')
+    aliases_idx = headers.index('VENUE_ALIASES') if 'VENUE_ALIASES' in headers else -1
 
     for row in venues_data[1:]:
         if len(row) <= venue_id_idx:
@@ -302,38 +206,116 @@ def fuzzy_match_venue(venue_name: str, venues_data: List[List[str]], threshold:
 
         venue_id = row[venue_id_idx]
         canonical_name = row[venue_name_idx] if venue_name_idx < len(row) else ""
+        yield venue_id, normalize_venue_name(canonical_name)
+
         aliases_str = row[aliases_idx] if aliases_idx >= 0 and aliases_idx < len(row) else ""
+        if aliases_str:
+            for alias in parse_venue_aliases(aliases_str):
+                if alias:
+                    yield venue_id, normalize_venue_name(alias)
 
-        # Check canonical name
-        normalized_canonical = normalize_venue_name(canonical_name)
-        score = SequenceMatcher(None, normalized_input, normalized_canonical).ratio()
 
+def _best_fuzzy_match(normalized_input: str, candidates, threshold: float,
+                      scorer: str) -> Tuple[Optional[str], str, float]:
+    # Candidates only have to beat the threshold and the best score so far,
+    # so most are cut off early; ties keep the first candidate
+    score_input = QueryScorer(normalized_input, scorer)
+    best_match = None
+    best_score = 0.0
+
+    for venue_id, normalized_name in candidates:
+        score = score_input(normalized_name, max(threshold, best_score))
         if score > best_score:
             best_score = score
             best_match = venue_id
 
-        # Check aliases
-        if aliases_str:
-            aliases = []
-            if aliases_str.startswith('['):
-                try:
-                    import json
-                    aliases = json.loads(aliases_str)
-                except:
-                    aliases = [a.strip().strip('"[]') for a in aliases_str.split(',')]
-            else:
-                aliases = [a.strip().strip('"[]') for a in aliases_str.split(',')]
+    if best_score >= threshold:
+        return best_match, 'fuzzy', best_score
+    return None, 'none', best_score
 
-            for alias in aliases:
-                if not alias:
-                    continue
-                normalized_alias = normalize_venue_name(alias)
-                score = SequenceMatcher(None, normalized_input, normalized_alias).ratio()
-                if score > best_score:
-                    best_score = score
-                    best_match = venue_id
 
-    return best_match if best_score >= threshold else None
+def fuzzy_match_venue(venue_name: str, venues_data: List[List[str]], threshold: float = 0.85) -> Optional[str]:
+    """
+    Match venue name to VENUES.VENUE_ID using tiered matching (see match_venue)
+
+    Example:
+        fuzzy_match_venue("O2 Arena London", venues_data, 0.85)
+        Returns: "the-o2-arena-london"
+    """
+    return match_venue(venue_name, venues_data, threshold)[0]
+
+
+def build_venue_index(venues_data: list) -> dict:
+    """
+    Venue details of every VENUES row keyed by VENUE_ID (first row wins)
+
+    Returns:
+        Dict of VENUE_ID → get_venue_details() dict
+    """
+    if not venues_data or len(venues_data) < 2:
+        return {}
+
+    headers = venues_data[0]
+    col_map = {h: i for i, h in enumerate(headers)}
+
+    def cell(row, column):
+        idx = col_map.get(column, -1)
+        return row[idx] if idx >= 0 and idx < len(row) else ""
+
+    index = {}
+    for row in venues_data[1:]:
+        if len(row) <= col_map.get('VENUE_ID', 0):
+            continue
+
+        index.setdefault(row[col_map['VENUE_ID']], {
+            'city': cell(row, 'CITY'),
+            'country': cell(row, 'COUNTRY'),
+            'language': cell(row, 'LANGUAGE'),
+            'default_ticket_url': cell(row, 'DEFAULT_TICKET_URL'),
+            'default_image_url': cell(row, 'DEFAULT_IMAGE_URL'),
+            'access_status': cell(row, 'INTERPRETER_STATUS')
+        })
+
+    return index
+
+
+def build_category_index(categories_data: list) -> list:
+    """
+    EVENT_CATEGORIES rows with their keywords parsed and lowercased once
+
+    Returns:
+        List of {category_id, keywords, details} in sheet order
+    """
+    if not categories_data or len(categories_data) < 2:
+        return []
+
+    headers = categories_data[0]
+    col_map = {h: i for i, h in enumerate(headers)}
+    keywords_idx = col_map.get('KEYWORDS', -1)
+    image_idx = col_map.get('DEFAULT_IMAGE_URL', -1)
+
+    index = []
+    for row in categories_data[1:]:
+        if len(row) <= col_map.get('CATEGORY_ID', 0):
+            continue
+
+        keywords_str = row[keywords_idx] if keywords_idx >= 0 and keywords_idx < len(row) else "[]"
+
+        # Parse keywords (JSON array)
+        try:
+            keywords = json.loads(keywords_str)
+        except:
+            keywords = [k.strip() for k in keywords_str.strip('[]').replace('"', '').split(',')]
+
+        index.append({
+            'category_id': row[col_map['CATEGORY_ID']],
+            'keywords': [kw.lower() for kw in keywords],
+            'details': {
+                'default_image_url': row[image_idx] if image_idx >= 0 and image_idx < len(row) else ""
+            }
+        })
+
+    return index
 
 
 def generate_venue_id(venue_name: str) -> str:
@@ -4,160 +4,134 @@ Job 4: Validate STAGED_EVENTS
 
 Validates events and sets VALIDATION_STATUS:
 - OK: All required fields present
-- WARNING: Missing non-critical fields
+- WARNING: Past or unparseable EVENT_DATE, malformed URLs, VENUE_ID /
+  CATEGORY_ID not in the reference sheets, or broken links (from Job 3b)
 - ERROR: Missing required fields
 
-Generates formatting rules for color coding:
+Checks are declarative rules in pipeline/validation_rules.py, compiled once
+per header layout and run column-wise over the sheet.
+
+Generates formatting for color coding:
 - Red: ERROR status
 - Amber: WARNING status
 - Green: OK status AND APPROVE=TRUE
+
+Contiguous rows with the same color are coalesced into ranges, and only
+ranges whose color changed since the previous run become batchUpdate
+repeatCell requests (see pipeline/sheet_formatting.py).
 """
 
 import json
 import sys
 import os
+from collections import Counter
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from pipeline.config import REQUIRED_FIELDS, VALIDATION_COLORS
+from pipeline.config import VALIDATION_COLORS, STAGED_EVENTS_SHEET_GID, VALIDATION_FORMAT_STATE_FILE
+from pipeline.validation_rules import compile_rules, load_reference_ids
+from pipeline.sheet_formatting import coalesce_rows, format_requests, load_format_state, save_format_state
+from pipeline.reference_snapshot import load_reference_snapshot
 
 
-def validate_event(row: list, headers: list) -> dict:
+def validate_event(row: list, headers: list, reference: dict = None) -> dict:
     """
-    Validate single event row
-
-    Required fields:
-    - EVENT_DATE, EVENT_TIME, EVENT_NAME, VENUE_ID
-    - TICKET_URL, IMAGE_URL, CATEGORY_ID, LANGUAGE
+    Validate single event row (compiles the rules for this row's headers;
+    use validate_all_events for whole sheets)
 
     Args:
         row: Event row
         headers: Column headers
+        reference: Optional reference data (see load_reference)
 
     Returns:
         Dict with status, message, color
     """
-    col_map = {h: i for i, h in enumerate(headers)}
+    statuses, messages = compile_rules(headers, reference=reference).run([row])
+    return {
+        'status': statuses[0],
+        'message': messages[0],
+        'color': VALIDATION_COLORS[statuses[0]]
+    }
 
-    blocking_issues = []
-    warnings = []
-
-    # Check required fields
-    for field in REQUIRED_FIELDS:
-        idx = col_map.get(field, -1)
-        if idx < 0 or idx >= len(row) or not str(row[idx]).strip():
-            blocking_issues.append(f"Missing {field}")
-
-    # Check specific validations
-    event_date = row[col_map.get('EVENT_DATE', -1)] if col_map.get('EVENT_DATE', -1) >= 0 else ""
-    if event_date and not str(event_date).strip():
-        blocking_issues.append("EVENT_DATE is empty")
-
-    ticket_url = row[col_map.get('TICKET_URL', -1)] if col_map.get('TICKET_URL', -1) >= 0 else ""
-    if not ticket_url or not str(ticket_url).strip():
-        warnings.append("Missing TICKET_URL")
-
-    image_url = row[col_map.get('IMAGE_URL', -1)] if col_map.get('IMAGE_URL', -1) >= 0 else ""
-    if not image_url or not str(image_url).strip():
-        warnings.append("Missing IMAGE_URL")
-
-    # Determine status
-    if blocking_issues:
-        return {
-            'status': 'ERROR',
-            'message': '; '.join(blocking_issues),
-            'color': VALIDATION_COLORS['ERROR']
-        }
-    elif warnings:
-        return {
-            'status': 'WARNING',
-            'message': '; '.join(warnings),
-            'color': VALIDATION_COLORS['WARNING']
-        }
-    else:
-        return {
-            'status': 'OK',
-            'message': '',
-            'color': VALIDATION_COLORS['OK']
-        }
 
+def load_reference(venues_data: list = None, categories_data: list = None) -> dict:
+    """
+    Reference data for the known-ID rules
+
+    Args:
+        venues_data: VENUES sheet data (enables the VENUE_ID check)
+        categories_data: EVENT_CATEGORIES sheet data (enables the CATEGORY_ID check)
 
-def validate_all_events(staged_events_data: list) -> tuple:
+    Returns:
+        Dict with venue_ids and category_ids sets
+    """
+    return {
+        'venue_ids': load_reference_ids(venues_data, 'VENUE_ID'),
+        'category_ids': load_reference_ids(categories_data, 'CATEGORY_ID')
+    }
+
+
+def validate_all_events(staged_events_data: list, reference: dict = None) -> tuple:
     """
     Validate all events
 
+    The rules are compiled once for the sheet's headers and run column-wise
+    over every row (see pipeline/validation_rules.py).
+
     Args:
         staged_events_data: STAGED_EVENTS sheet data
+        reference: Optional reference data (see load_reference)
 
     Returns:
-        Tuple of (validated_rows, formatting_rules)
+        Tuple of (validated_rows, formatting_rules) where formatting_rules
+        are coalesced row ranges: {start_row, end_row, color, reason}
     """
     if not staged_events_data or len(staged_events_data) < 2:
         return staged_events_data, []
 
     headers = staged_events_data[0]
+    rows = staged_events_data[1:]
     col_map = {h: i for i, h in enumerate(headers)}
-    validated_rows = [headers]
-    formatting_rules = []
+    reasons = []
 
     validation_status_idx = col_map.get('VALIDATION_STATUS', -1)
     approve_idx = col_map.get('APPROVE', -1)
 
     print(f"\n✅ Validating events...")
 
-    ok_count = 0
-    warning_count = 0
-    error_count = 0
-
-    for i, row in enumerate(staged_events_data[1:], start=2):
-        result = validate_event(row, headers)
+    statuses, messages = compile_rules(headers, reference=reference).run(rows)
 
+    for row, status in zip(rows, statuses):
         # Set VALIDATION_STATUS
         if validation_status_idx >= 0:
             # Ensure row is long enough
             while len(row) <= validation_status_idx:
                 row.append("")
-            row[validation_status_idx] = result['status']
-
-        # Track counts
-        if result['status'] == 'OK':
-            ok_count += 1
-        elif result['status'] == 'WARNING':
-            warning_count += 1
-        else:
-            error_count += 1
+            row[validation_status_idx] = status
 
-        # Add formatting rule
+        # Formatting reason (coalesced into ranges below)
         approve_value = row[approve_idx] if approve_idx >= 0 and approve_idx < len(row) else "FALSE"
 
-        if result['status'] == 'ERROR':
-            formatting_rules.append({
-                'row': i,
-                'color': result['color'],
-                'reason': result['status']
-            })
-        elif result['status'] == 'WARNING':
-            formatting_rules.append({
-                'row': i,
-                'color': result['color'],
-                'reason': result['status']
-            })
-        elif result['status'] == 'OK' and approve_value == 'TRUE':
-            formatting_rules.append({
-                'row': i,
-                'color': result['color'],
-                'reason': 'OK_APPROVED'
-            })
-
-        validated_rows.append(row)
+        if status in ('ERROR', 'WARNING'):
+            reasons.append(status)
+        elif approve_value == 'TRUE':
+            reasons.append('OK_APPROVED')
+        else:
+            reasons.append('')
 
     print(f"\n📊 VALIDATION SUMMARY:")
-    print(f"   ✅ OK: {ok_count}")
-    print(f"   ⚠️  WARNING: {warning_count}")
-    print(f"   ❌ ERROR: {error_count}")
+    print(f"   ✅ OK: {statuses.count('OK')}")
+    print(f"   ⚠️  WARNING: {statuses.count('WARNING')}")
+    print(f"   ❌ ERROR: {statuses.count('ERROR')}")
+
+    # Most common findings, so systematic problems stand out
+    finding_counts = Counter(m for message in messages for m in message.split('; ') if m)
+    for message, count in finding_counts.most_common(5):
+        print(f"      {count} × {message}")
 
-    return validated_rows, formatting_rules
+    return [headers] + rows, coalesce_rows(reasons)
 
 
 def main():
@@ -166,9 +140,16 @@ def main():
 
     Expects:
         - staged-events-data.json (from STAGED_EVENTS sheet)
+        - venues-data.json, categories-data.json (optional; enable the
+          known VENUE_ID / CATEGORY_ID checks)
 
     Outputs:
-        - validated-staged-events-output.json (ready to update STAGED_EVENTS sheet)
+        - validated-staged-events-output.json (ready to update STAGED_EVENTS
+          sheet; format_requests is a spreadsheets.batchUpdate body)
+        - VALIDATION_FORMAT_STATE_FILE (ranges formatted by this run)
+
+    Flags:
+        --full-repaint: ignore the previous run's formatting and send every range
     """
     print("=" * 70)
     print("🔍 JOB 4: VALIDATE STAGED_EVENTS")
@@ -183,19 +164,50 @@ def main():
         print(f"❌ Error: {e}")
         sys.exit(1)
 
+    # Reference sheets (optional) - from the compiled snapshot when both are exported
+    snapshot = load_reference_snapshot()
+    if snapshot is not None:
+        reference = {'venue_ids': snapshot.venue_ids(), 'category_ids': snapshot.category_ids()}
+        snapshot.close()
+    else:
+        reference_sheets = {}
+        for name in ('venues-data.json', 'categories-data.json'):
+            try:
+                with open(name, 'r') as f:
+                    reference_sheets[name] = json.load(f)
+            except FileNotFoundError:
+                print(f"⚠️  {name} not found - skipping its known-ID check")
+        reference = load_reference(reference_sheets.get('venues-data.json'),
+                                   reference_sheets.get('categories-data.json'))
+
     # Validate
-    validated_rows, formatting_rules = validate_all_events(staged_events_data)
+    validated_rows, formatting_rules = validate_all_events(staged_events_data, reference)
 
     print(f"\n" + "=" * 70)
     print(f"📊 SUMMARY")
     print(f"=" * 70)
     print(f"   Total events validated: {len(validated_rows) - 1}")
-    print(f"   Formatting rules generated: {len(formatting_rules)}")
+    print(f"   Formatting ranges: {len(formatting_rules)}")
+
+    # Only send ranges whose color changed since the previous run
+    last_row = len(validated_rows)
+    state = None if '--full-repaint' in sys.argv else load_format_state(VALIDATION_FORMAT_STATE_FILE)
+    if state and state.get('sheet_id') != STAGED_EVENTS_SHEET_GID:
+        state = None
+    requests = format_requests(
+        formatting_rules, last_row, STAGED_EVENTS_SHEET_GID,
+        previous_ranges=state['ranges'] if state else None,
+        previous_last_row=state['last_row'] if state else 0
+    )
+    save_format_state(VALIDATION_FORMAT_STATE_FILE, STAGED_EVENTS_SHEET_GID, last_row, formatting_rules)
+    print(f"   Formatting requests: {len(requests)} "
+          f"({'changed ranges since last run' if state else 'full repaint'})")
 
     # Save output
     output = {
         'rows': validated_rows,
-        'formatting_rules': formatting_rules
+        'formatting_rules': formatting_rules,
+        'format_requests': {'requests': requests}
     }
 
     with open('validated-staged-events-output.json', 'w') as f:
@@ -0,0 +1,245 @@
+"""
+Declarative validation rules for STAGED_EVENTS (Job 4)
+
+A rule describes one check over one or more columns. compile_rules() binds
+every rule to the sheet's header layout once (column indices, reference
+sets, today's date); CompiledRules.run() then executes each rule column-wise
+over all rows and returns per-row status and message arrays in one pass.
+
+Each distinct column is extracted and stripped once and shared by every rule
+that reads it. Rules only report failing row indices, so a clean sheet costs
+one scan per rule.
+
+Adding a check means adding a Rule subclass (or instance) to DEFAULT_RULES
+or passing a custom list to compile_rules(); the engine loop is unchanged.
+
+Example:
+    compiled = compile_rules(headers, reference={'venue_ids': {'o2-arena-london'}})
+    statuses, messages = compiled.run(rows)
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from pipeline.config import REQUIRED_FIELDS
+from pipeline.event_keys import parse_date
+from pipeline.check_links import LINK_COLUMNS, is_problem_status
+
+# Severities, most severe first; a row's status is its most severe finding
+SEVERITIES = ('ERROR', 'WARNING')
+
+# A compiled check: column values (one per row) → (row index, message) for failing rows
+Check = Callable[[List[str]], Iterable[Tuple[int, str]]]
+
+
+class Rule:
+    """
+    One declarative check
+
+    Subclasses set columns (candidate header names, first present wins) and
+    severity, and implement compile_check(). A rule whose column is absent
+    from the sheet is skipped unless it overrides compile().
+    """
+
+    columns: Tuple[str, ...] = ()
+    severity = 'WARNING'
+
+    def compile(self, col_map: Dict[str, int], reference: Dict) -> Optional[Tuple[int, Check]]:
+        """
+        Bind the rule to a header layout
+
+        Returns:
+            (column index, check) or None if the rule doesn't apply to this sheet
+        """
+        idx = next((col_map[c] for c in self.columns if c in col_map), -1)
+        if idx < 0:
+            return None
+        check = self.compile_check(reference)
+        return (idx, check) if check else None
+
+    def compile_check(self, reference: Dict) -> Optional[Check]:
+        raise NotImplementedError
+
+    @property
+    def label(self) -> str:
+        return self.columns[0] if self.columns else type(self).__name__
+
+
+class Required(Rule):
+    """Cell must be non-empty (a missing column fails every row)"""
+
+    severity = 'ERROR'
+
+    def __init__(self, column: str, *aliases: str):
+        self.columns = (column,) + aliases
+
+    def compile(self, col_map, reference):
+        compiled = super().compile(col_map, reference)
+        if compiled is None:
+            message = f"Missing {self.label}"
+            return -1, lambda values: ((i, message) for i in range(len(values)))
+        return compiled
+
+    def compile_check(self, reference):
+        message = f"Missing {self.label}"
+        return lambda values: ((i, message) for i, v in enumerate(values) if not v)
+
+
+class UrlShape(Rule):
+    """Non-empty cell must be an absolute http(s) URL"""
+
+    def __init__(self, column: str, *aliases: str):
+        self.columns = (column,) + aliases
+
+    def compile_check(self, reference):
+        message = f"{self.label} is not an http(s) URL"
+        return lambda values: (
+            (i, message) for i, v in enumerate(values) if v and not v.startswith(('http://', 'https://'))
+        )
+
+
+class FutureDate(Rule):
+    """Non-empty date must parse and not be before reference['today'] (YYYY-MM-DD)"""
+
+    def __init__(self, column: str = 'EVENT_DATE'):
+        self.columns = (column,)
+
+    def compile_check(self, reference):
+        today = reference.get('today') or datetime.now().strftime('%Y-%m-%d')
+        label = self.label
+
+        def check(values):
+            for i, v in enumerate(values):
+                if not v:
+                    continue
+                date = parse_date(v)
+                if date is None:
+                    yield i, f"{label} not a date: {v}"
+                elif date < today:
+                    yield i, f"{label} in the past"
+        return check
+
+
+class KnownValue(Rule):
+    """Non-empty cell must be one of the IDs in reference[reference_key] (skipped without it)"""
+
+    def __init__(self, column: str, reference_key: str, sheet_name: str):
+        self.columns = (column,)
+        self.reference_key = reference_key
+        self.sheet_name = sheet_name
+
+    def compile_check(self, reference):
+        known = reference.get(self.reference_key)
+        if not known:
+            return None
+        label, sheet_name = self.label, self.sheet_name
+        return lambda values: (
+            (i, f"Unknown {label} {v} (not in {sheet_name})")
+            for i, v in enumerate(values) if v and v not in known
+        )
+
+
+class LinkStatus(Rule):
+    """Job 3b link status column must not be BROKEN/ERROR (empty → not checked)"""
+
+    def __init__(self, status_column: str, url_column: str):
+        self.columns = (status_column,)
+        self.url_column = url_column
+
+    def compile_check(self, reference):
+        url_column = self.url_column
+        return lambda values: (
+            (i, f"{url_column} {v}") for i, v in enumerate(values) if is_problem_status(v)
+        )
+
+
+DEFAULT_RULES: List[Rule] = (
+    [Required(field) for field in REQUIRED_FIELDS]
+    + [
+        FutureDate('EVENT_DATE'),
+        UrlShape('EVENT_URL', 'TICKET_URL'),
+        UrlShape('IMAGE_URL'),
+        KnownValue('VENUE_ID', 'venue_ids', 'VENUES'),
+        KnownValue('CATEGORY_ID', 'category_ids', 'EVENT_CATEGORIES'),
+    ]
+    + [LinkStatus(status_column, url_columns[0]) for url_columns, status_column in LINK_COLUMNS.items()]
+)
+
+
+class CompiledRules:
+    """Rules bound to one header layout (build with compile_rules())"""
+
+    def __init__(self, checks: List[Tuple[int, str, Check]]):
+        # (column index or -1, severity, check) in rule order
+        self.checks = checks
+
+    def run(self, rows: Sequence[list]) -> Tuple[List[str], List[str]]:
+        """
+        Run every rule column-wise over the rows
+
+        Args:
+            rows: Data rows (no header)
+
+        Returns:
+            Tuple of (statuses, messages), one entry per row. Status is
+            ERROR / WARNING / OK; the message joins the findings of the
+            row's most severe level with "; "
+        """
+        n = len(rows)
+        findings = {severity: [None] * n for severity in SEVERITIES}
+        columns = {}
+
+        for idx, severity, check in self.checks:
+            values = columns.get(idx)
+            if values is None:
+                values = [str(row[idx]).strip() if 0 <= idx < len(row) else "" for row in rows]
+                columns[idx] = values
+
+            row_findings = findings[severity]
+            for i, message in check(values):
+                if row_findings[i] is None:
+                    row_findings[i] = [message]
+                else:
+                    row_findings[i].append(message)
+
+        statuses = ['OK'] * n
+        messages = [''] * n
+        for severity in reversed(SEVERITIES):
+            for i, found in enumerate(findings[severity]):
+                if found:
+                    statuses[i] = severity
+                    messages[i] = '; '.join(found)
+        return statuses, messages
+
+
+def load_reference_ids(sheet_data: list, column: str) -> Set[str]:
+    """Non-empty values of one column of a reference sheet (VENUES, EVENT_CATEGORIES)"""
+    if not sheet_data or len(sheet_data) < 2 or column not in sheet_data[0]:
+        return set()
+    idx = sheet_data[0].index(column)
+    return {str(row[idx]).strip() for row in sheet_data[1:] if idx < len(row) and str(row[idx]).strip()}
+
+
+def compile_rules(headers: list, rules: Sequence[Rule] = None, reference: Dict = None) -> CompiledRules:
+    """
+    Bind rules to a header layout
+
+    Args:
+        headers: STAGED_EVENTS header row
+        rules: Rules to apply (default: DEFAULT_RULES)
+        reference: Optional reference data: venue_ids / category_ids (sets)
+            enable the KnownValue rules, today (YYYY-MM-DD) fixes the date
+            FutureDate compares against
+
+    Returns:
+        CompiledRules for rows with this layout
+    """
+    col_map = {h: i for i, h in enumerate(headers)}
+    reference = reference or {}
+    checks = []
+    for rule in DEFAULT_RULES if rules is None else rules:
+        compiled = rule.compile(col_map, reference)
+        if compiled is not None:
+            idx, check = compiled
+            checks.append((idx, rule.severity, check))
+    return CompiledRules(checks)
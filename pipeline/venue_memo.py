@@ -0,0 +1,160 @@
+"""
+Persistent venue-resolution memo (Job 3)
+
+The same raw venue strings ("Wembley Stadium ", "O2 Arena London", ...) come
+back on every run. The memo maps each normalized raw venue string to the
+(VENUE_ID, tier, score) the matcher produced, so repeat runs skip typo
+correction and fuzzy matching for nearly every row.
+
+Invalidation: the file is stamped with a hash of the VENUES sheet data, the
+matcher version (VENUE_MATCHER_VERSION), VENUE_MATCH_THRESHOLD and
+VENUE_FUZZY_SCORER. If any of them changes, the matched entries are
+discarded on load and rebuilt lazily.
+Unmatched strings are remembered too (tier "none"); they are retried as soon
+as VENUES changes.
+
+Override feedback: VENUE_ID_OVERRIDE values are recorded per raw venue string
+with the EVENT_IDs that set them. Once VENUE_OVERRIDE_MIN_CONFIRMATIONS
+events agree on one VENUE_ID (and none disagree), rows with that venue string
+and no override of their own resolve to it (tier "override"). Overrides are
+kept across VENUES changes while their VENUE_ID still exists.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from pipeline.config import (
+    VENUE_MEMO_FILE, VENUE_MATCHER_VERSION, VENUE_MATCH_THRESHOLD, VENUE_FUZZY_SCORER,
+    VENUE_OVERRIDE_MIN_CONFIRMATIONS
+)
+from pipeline.utils import normalize_venue_name
+
+VENUE_MEMO_FORMAT = 1
+
+# EVENT_IDs remembered per (venue string, override VENUE_ID)
+MAX_OVERRIDE_EVENTS = 20
+
+
+def venues_fingerprint(venues_data: list) -> str:
+    """First 16 hex chars of the SHA-256 of the VENUES sheet data"""
+    payload = json.dumps(venues_data or [], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def memo_stamp(venues_data: list) -> Dict:
+    """Everything a memoized match depends on besides the venue string"""
+    return {
+        'venues_hash': venues_fingerprint(venues_data),
+        'matcher_version': VENUE_MATCHER_VERSION,
+        'threshold': VENUE_MATCH_THRESHOLD,
+        'scorer': VENUE_FUZZY_SCORER
+    }
+
+
+def memo_key(venue_name: str) -> str:
+    """Memo key for a raw venue string"""
+    return normalize_venue_name(str(venue_name or ""))
+
+
+def load_venue_memo(venues_data: list, path: str = VENUE_MEMO_FILE) -> Dict:
+    """
+    Load the memo, dropping matches made against other VENUES data or matcher
+
+    Returns:
+        Dict with format, stamp, updated, entries (key → [VENUE_ID, tier, score]),
+        overrides (key → {VENUE_ID: [EVENT_ID, ...]}) and stats (hits, misses,
+        invalidated = stored matches were discarded)
+    """
+    stamp = memo_stamp(venues_data)
+    memo = {'format': VENUE_MEMO_FORMAT, 'stamp': stamp, 'updated': '', 'entries': {}, 'overrides': {}}
+    invalidated = False
+
+    try:
+        with open(path, 'r') as f:
+            stored = json.load(f)
+        if stored.get('format') == VENUE_MEMO_FORMAT:
+            if stored.get('stamp') == stamp:
+                memo['entries'] = stored.get('entries', {})
+            else:
+                invalidated = bool(stored.get('entries'))
+            memo['overrides'] = stored.get('overrides', {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    # Overrides pointing at venues that no longer exist are dropped
+    known_ids = _venue_ids(venues_data)
+    if known_ids:
+        memo['overrides'] = {
+            key: {vid: events for vid, events in by_id.items() if vid in known_ids}
+            for key, by_id in memo['overrides'].items()
+        }
+        memo['overrides'] = {key: by_id for key, by_id in memo['overrides'].items() if by_id}
+
+    memo['stats'] = {'hits': 0, 'misses': 0, 'invalidated': invalidated}
+    return memo
+
+
+def _venue_ids(venues_data: list) -> set:
+    if not venues_data or len(venues_data) < 2 or 'VENUE_ID' not in venues_data[0]:
+        return set()
+    idx = venues_data[0].index('VENUE_ID')
+    return {row[idx] for row in venues_data[1:] if idx < len(row) and row[idx]}
+
+
+def lookup_venue(memo: Dict, venue_name: str) -> Optional[Tuple[str, str, float]]:
+    """
+    Memoized resolution of a raw venue string
+
+    Returns:
+        (VENUE_ID or "", tier, score), or None if the string must be matched
+    """
+    key = memo_key(venue_name)
+    by_id = memo['overrides'].get(key)
+    if by_id and len(by_id) == 1:
+        venue_id, events = next(iter(by_id.items()))
+        if len(events) >= VENUE_OVERRIDE_MIN_CONFIRMATIONS:
+            memo['stats']['hits'] += 1
+            return venue_id, 'override', 1.0
+
+    entry = memo['entries'].get(key)
+    if entry is None:
+        memo['stats']['misses'] += 1
+        return None
+    memo['stats']['hits'] += 1
+    return entry[0], entry[1], entry[2]
+
+
+def remember_venue(memo: Dict, venue_name: str, venue_id: Optional[str], tier: str, score: float):
+    """Store the matcher's result for a raw venue string"""
+    memo['entries'][memo_key(venue_name)] = [venue_id or "", tier, round(score, 4)]
+
+
+def remember_override(memo: Dict, venue_name: str, venue_id: str, event_id: str):
+    """Record that an event's VENUE_ID_OVERRIDE maps this raw venue string to venue_id"""
+    key = memo_key(venue_name)
+    if not key or not venue_id or not event_id:
+        return
+    by_id = memo['overrides'].setdefault(key, {})
+    # An event's latest override replaces any earlier one it made for this string
+    for other_id, events in list(by_id.items()):
+        if other_id != venue_id and event_id in events:
+            events.remove(event_id)
+            if not events:
+                del by_id[other_id]
+    events = by_id.setdefault(venue_id, [])
+    if event_id not in events:
+        events.append(event_id)
+        del events[:-MAX_OVERRIDE_EVENTS]
+
+
+def save_venue_memo(memo: Dict, path: str = VENUE_MEMO_FILE):
+    """Write the memo via a temp file + rename"""
+    memo['updated'] = datetime.now().isoformat(timespec='seconds')
+    stored = {k: v for k, v in memo.items() if k != 'stats'}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(stored, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
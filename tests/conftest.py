@@ -0,0 +1,110 @@
+"""
+Shared pytest fixtures
+
+local_site: a threaded http.server on 127.0.0.1 standing in for ticketing and
+image hosts, so the HTTP clients (og_image, check_links) run against real
+sockets without touching the network.
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add repository root to path (pipeline/ is imported as a package)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class LocalSite:
+    """
+    One local HTTP server with per-path handlers
+
+    Attributes:
+        base_url: "http://127.0.0.1:<port>"
+        routes: {path: handler(request)}; handler writes the whole response
+        requests: [(method, path, headers)] in arrival order
+        peak_in_flight: Most requests handled at the same time
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self):
+                with site._lock:
+                    site.requests.append((self.command, self.path, dict(self.headers)))
+                    site.in_flight += 1
+                    site.peak_in_flight = max(site.peak_in_flight, site.in_flight)
+                try:
+                    route = site.routes.get(self.path)
+                    if route is None:
+                        self.send_response(404)
+                        self.end_headers()
+                    else:
+                        route(self)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with site._lock:
+                        site.in_flight -= 1
+
+            do_GET = do_HEAD = _dispatch
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def hits(self, path: str) -> int:
+        return sum(1 for _, p, _ in self.requests if p == path)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def html_page(body: str, status: int = 200, headers: dict = None, delay: float = 0):
+    """Route handler answering every request with a fixed HTML document"""
+    def handler(request):
+        if delay:
+            time.sleep(delay)
+        payload = body.encode()
+        request.send_response(status)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        if request.command != 'HEAD':
+            request.wfile.write(payload)
+    return handler
+
+
+@pytest.fixture
+def local_site():
+    """Factory for LocalSite servers (each one is a distinct host:port)"""
+    sites = []
+
+    def make():
+        site = LocalSite()
+        sites.append(site)
+        return site
+
+    yield make
+    for site in sites:
+        site.close()
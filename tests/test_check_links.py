@@ -0,0 +1,75 @@
+"""Link checker (pipeline/check_links.py) against local HTTP servers"""
+
+import time
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from conftest import html_page
+from pipeline.check_links import check_staged_links
+from pipeline.config import LINK_CHECK_PER_HOST_CONCURRENCY
+
+
+def redirect_to(location: str):
+    def handler(request):
+        request.send_response(302)
+        request.send_header('Location', location)
+        request.send_header('Content-Length', '0')
+        request.end_headers()
+    return handler
+
+
+def test_statuses_and_redirect_chain(local_site, tmp_path):
+    site = local_site()
+    site.routes['/ok'] = html_page('ok')
+    site.routes['/gone'] = html_page('gone', status=404)
+    site.routes['/moved'] = redirect_to('/ok')
+    rows = [['EVENT_URL', 'IMAGE_URL'],
+            [site.url('/ok'), site.url('/gone')],
+            [site.url('/moved'), '']]
+
+    rows, summary = check_staged_links(rows, str(tmp_path / 'links.json'))
+
+    status = {h: i for i, h in enumerate(rows[0])}
+    assert rows[1][status['EVENT_URL_STATUS']] == 'OK'
+    assert rows[1][status['IMAGE_URL_STATUS']] == 'BROKEN 404'
+    assert rows[2][status['EVENT_URL_STATUS']] == f"REDIRECT 302 → {site.url('/ok')}"
+    assert rows[2][status['IMAGE_URL_STATUS']] == ''
+    assert summary['problem_urls'] == 1
+
+
+def test_redirect_hops_count_against_the_target_host(local_site, tmp_path):
+    origins, target = [local_site(), local_site()], local_site()
+    rows = [['EVENT_URL']]
+    for origin in origins:
+        for n in range(LINK_CHECK_PER_HOST_CONCURRENCY * 2):
+            target.routes[f'/event/{n}'] = html_page('ok', delay=0.1)
+            origin.routes[f'/go/{n}'] = redirect_to(target.url(f'/event/{n}'))
+            rows.append([origin.url(f'/go/{n}')])
+
+    rows, summary = check_staged_links(rows, str(tmp_path / 'links.json'))
+
+    assert all(row[1].startswith('REDIRECT 302') for row in rows[1:])
+    assert target.peak_in_flight <= LINK_CHECK_PER_HOST_CONCURRENCY
+
+
+def test_throughput_reaches_the_per_host_bound(local_site, tmp_path):
+    latency, per_host = 0.05, LINK_CHECK_PER_HOST_CONCURRENCY * 20
+    sites = [local_site(), local_site()]
+    rows = [['EVENT_URL']]
+    for site in sites:
+        for n in range(per_host):
+            site.routes[f'/event/{n}'] = html_page('ok', delay=latency)
+            rows.append([site.url(f'/event/{n}')])
+
+    start = time.perf_counter()
+    rows, summary = check_staged_links(rows, str(tmp_path / 'links.json'))
+    elapsed = time.perf_counter() - start
+
+    # Hosts are checked side by side, each with all of its slots busy
+    bound = per_host / LINK_CHECK_PER_HOST_CONCURRENCY * latency
+    assert summary['stats']['checked'] == len(rows) - 1
+    assert elapsed < bound * 1.8
+    for site in sites:
+        assert LINK_CHECK_PER_HOST_CONCURRENCY // 2 < site.peak_in_flight <= LINK_CHECK_PER_HOST_CONCURRENCY
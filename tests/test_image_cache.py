@@ -0,0 +1,60 @@
+"""Image downloader (pipeline/image_cache.py) against a local HTTP server"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from conftest import html_page
+from pipeline import image_cache
+from pipeline.config import HTTP_TOTAL_CONCURRENCY
+from pipeline.http_cache import JsonCache
+
+
+def fetch(urls, tmp_path, monkeypatch):
+    """Run the downloader with originals and the index kept under tmp_path"""
+    monkeypatch.setattr(image_cache, 'IMAGE_CACHE_DIR', str(tmp_path))
+    cache = JsonCache(str(tmp_path / 'index.json'), ttl_seconds=3600)
+    stats = {'cache_hits': 0, 'revalidated': 0, 'downloaded': 0, 'bytes': 0, 'failed': 0}
+    asyncio.run(image_cache._fetch_all(urls, cache, str(tmp_path / 'thumbs'), stats))
+    return cache, stats
+
+
+def test_download_is_content_hashed(local_site, tmp_path, monkeypatch):
+    site = local_site()
+    site.routes['/a.jpg'] = html_page('same bytes')
+    site.routes['/b.jpg'] = html_page('same bytes')
+    urls = [site.url('/a.jpg'), site.url('/b.jpg')]
+
+    cache, stats = fetch(urls, tmp_path, monkeypatch)
+
+    assert stats['downloaded'] == 2 and stats['failed'] == 0
+    image_hash = image_cache.content_hash(b'same bytes')
+    assert {cache.get(url)['hash'] for url in urls} == {image_hash}
+    assert os.path.exists(tmp_path / image_hash)
+
+
+def test_busy_host_does_not_starve_others(local_site, tmp_path, monkeypatch):
+    # Requests start in list order, so the busy host's are queued first
+    busy, quiet = local_site(), local_site()
+    urls = []
+    for n in range(HTTP_TOTAL_CONCURRENCY * 2):
+        busy.routes[f'/img/{n}.jpg'] = html_page(f'image {n}', delay=0.1)
+        urls.append(busy.url(f'/img/{n}.jpg'))
+
+    first_quiet_request = []
+
+    def quiet_image(request):
+        first_quiet_request.append(time.perf_counter())
+        html_page('quiet image')(request)
+
+    quiet.routes['/img/quiet.jpg'] = quiet_image
+    urls.append(quiet.url('/img/quiet.jpg'))
+
+    start = time.perf_counter()
+    fetch(urls, tmp_path, monkeypatch)
+
+    assert first_quiet_request[0] - start < 0.5
@@ -0,0 +1,127 @@
+"""og:image resolver (pipeline/og_image.py) and JsonCache against a local HTTP server"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from conftest import html_page
+from pipeline.config import HTTP_PER_HOST_CONCURRENCY, HTTP_TOTAL_CONCURRENCY
+from pipeline.http_cache import JsonCache
+from pipeline.og_image import resolve_og_images, resolve_og_images_async
+
+HEAD = '<html><head><meta property="og:image" content="/img/{name}.jpg"></head>'
+
+
+def etag_page(name: str, etag: str):
+    """200 with an ETag, or 304 when the client revalidates with that ETag"""
+    page = html_page(HEAD.format(name=name) + '<body>event</body></html>', headers={'ETag': etag})
+
+    def handler(request):
+        if request.headers.get('If-None-Match') == etag:
+            request.send_response(304)
+            request.send_header('ETag', etag)
+            request.end_headers()
+        else:
+            page(request)
+    return handler
+
+
+def test_fetch_then_cache_hit(local_site, tmp_path):
+    site = local_site()
+    site.routes['/event/1'] = etag_page('one', '"v1"')
+    url = site.url('/event/1')
+    cache_path = str(tmp_path / 'og.json')
+
+    images, stats = resolve_og_images([url, url], cache_path)
+    assert images == {url: site.url('/img/one.jpg')}
+    assert stats['fetched'] == 1 and stats['failed'] == 0
+
+    # A fresh entry is served from the saved cache without a request
+    images, stats = resolve_og_images([url], cache_path)
+    assert images[url] == site.url('/img/one.jpg')
+    assert stats['cache_hits'] == 1
+    assert site.hits('/event/1') == 1
+
+
+def test_stale_entry_revalidates_with_304(local_site, tmp_path):
+    site = local_site()
+    site.routes['/event/2'] = etag_page('two', '"v2"')
+    url = site.url('/event/2')
+    cache = JsonCache(str(tmp_path / 'og.json'), ttl_seconds=0)  # Every entry is stale at once
+
+    asyncio.run(resolve_og_images_async([url], cache))
+    images, stats = asyncio.run(resolve_og_images_async([url], cache))
+
+    assert stats['revalidated'] == 1 and stats['fetched'] == 0
+    assert images[url] == site.url('/img/two.jpg')
+    assert site.requests[-1][2].get('If-None-Match') == '"v2"'
+
+    cache.save()
+    assert JsonCache(cache.path, 0).get(url)['etag'] == '"v2"'
+
+
+def test_reads_only_the_head(local_site, tmp_path):
+    site = local_site()
+    body_seconds = 5
+
+    def slow_body(request):
+        request.send_response(200)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.end_headers()
+        request.wfile.write((HEAD.format(name='three') + '<body>').encode())
+        request.wfile.flush()
+        for _ in range(body_seconds * 10):
+            time.sleep(0.1)
+            request.wfile.write(b'<p>' + b'x' * 1024 + b'</p>')
+            request.wfile.flush()
+
+    site.routes['/event/3'] = slow_body
+    url = site.url('/event/3')
+
+    start = time.perf_counter()
+    images, stats = resolve_og_images([url], str(tmp_path / 'og.json'))
+    elapsed = time.perf_counter() - start
+
+    assert images[url] == site.url('/img/three.jpg')
+    assert elapsed < body_seconds / 2
+
+
+def test_per_host_limit(local_site, tmp_path):
+    busy, other = local_site(), local_site()
+    urls = []
+    for site in (busy, other):
+        for n in range(HTTP_PER_HOST_CONCURRENCY * 3):
+            site.routes[f'/event/{n}'] = html_page(HEAD.format(name=n), delay=0.2)
+            urls.append(site.url(f'/event/{n}'))
+
+    images, stats = resolve_og_images(urls, str(tmp_path / 'og.json'))
+
+    assert stats['fetched'] == len(urls)
+    for site in (busy, other):
+        assert 1 < site.peak_in_flight <= HTTP_PER_HOST_CONCURRENCY
+
+
+def test_busy_host_does_not_starve_others(local_site, tmp_path):
+    # URLs are resolved in sorted order, so the busy host's come first
+    busy, quiet = sorted([local_site(), local_site()], key=lambda site: site.base_url)
+    urls = []
+    for n in range(HTTP_TOTAL_CONCURRENCY * 2):
+        busy.routes[f'/event/{n}'] = html_page(HEAD.format(name=n), delay=0.1)
+        urls.append(busy.url(f'/event/{n}'))
+
+    first_quiet_request = []
+
+    def quiet_page(request):
+        first_quiet_request.append(time.perf_counter())
+        html_page(HEAD.format(name='quiet'))(request)
+
+    quiet.routes['/event/quiet'] = quiet_page
+    urls.append(quiet.url('/event/quiet'))
+
+    start = time.perf_counter()
+    resolve_og_images(urls, str(tmp_path / 'og.json'))
+
+    assert first_quiet_request[0] - start < 0.5
@@ -0,0 +1,207 @@
+"""Revision-aware Sheets read cache (pipeline/sheets_cache.py) against an in-memory fake"""
+
+import json
+from typing import Dict
+
+import pytest
+
+pytest.importorskip('pytz')  # export_pipeline_inputs reads monthly tabs via populate_ingest_from_monthly
+
+from pipeline.config import PI_WORK_FLOW_ID, SHEETS, SHEETS_CACHE_EXPORTS
+from pipeline.sheets_cache import SheetsReadCache, export_pipeline_inputs, sheet_range
+
+
+class FakeSheetsBackend:
+    """
+    In-memory double of the Drive files.get and Sheets get/batchGet calls
+
+    Ranges resolve to the whole named tab (cell bounds are ignored). Every
+    edit bumps the file's version, like Drive. calls counts API calls by name.
+
+    Example:
+        backend = FakeSheetsBackend({'sheet-1': {'VENUES': [['VENUE_ID'], ['o2']]}})
+        cache = SheetsReadCache(backend.sheets_service(), backend.drive_service(), cache_dir)
+        cache.read_range('sheet-1', "'VENUES'")
+        Returns: [['VENUE_ID'], ['o2']]
+    """
+
+    def __init__(self, spreadsheets: Dict[str, Dict[str, list]]):
+        self.spreadsheets = {sid: dict(tabs) for sid, tabs in spreadsheets.items()}
+        self.versions = {sid: 1 for sid in spreadsheets}
+        self.calls = {'files.get': 0, 'spreadsheets.get': 0, 'values.batchGet': 0}
+
+    def edit(self, spreadsheet_id: str, sheet_name: str, values: list):
+        """Replace a tab's values (bumps the version)"""
+        self.spreadsheets[spreadsheet_id][sheet_name] = values
+        self.versions[spreadsheet_id] += 1
+
+    def _value_range(self, spreadsheet_id: str, range_name: str) -> Dict:
+        if range_name.startswith("'"):
+            name = range_name[1:range_name.rindex("'")].replace("''", "'")
+        else:
+            name = range_name.split('!')[0]
+        values = self.spreadsheets[spreadsheet_id].get(name, [])
+        # Like the API, empty ranges have no 'values' key
+        return {'range': range_name, 'values': values} if values else {'range': range_name}
+
+    def sheets_service(self):
+        backend = self
+
+        class Request:
+            def __init__(self, result):
+                self.result = result
+
+            def execute(self):
+                return json.loads(json.dumps(self.result))
+
+        class Values:
+            def batchGet(self, spreadsheetId, ranges, **kwargs):
+                backend.calls['values.batchGet'] += 1
+                return Request({'spreadsheetId': spreadsheetId,
+                                'valueRanges': [backend._value_range(spreadsheetId, r) for r in ranges]})
+
+        class Spreadsheets:
+            def values(self):
+                return Values()
+
+            def get(self, spreadsheetId, **kwargs):
+                backend.calls['spreadsheets.get'] += 1
+                return Request({'sheets': [{'properties': {'title': title}}
+                                           for title in backend.spreadsheets[spreadsheetId]]})
+
+        class Service:
+            def spreadsheets(self):
+                return Spreadsheets()
+
+        return Service()
+
+    def drive_service(self):
+        backend = self
+
+        class Request:
+            def __init__(self, result):
+                self.result = result
+
+            def execute(self):
+                return dict(self.result)
+
+        class Files:
+            def get(self, fileId, **kwargs):
+                backend.calls['files.get'] += 1
+                return Request({'version': str(backend.versions[fileId]), 'modifiedTime': ''})
+
+        class Service:
+            def files(self):
+                return Files()
+
+        return Service()
+
+
+def self_test():
+    """Exercise the cache offline against FakeSheetsBackend"""
+    import tempfile
+
+    print("=" * 70)
+    print("🧪 SHEETS READ CACHE SELF-TEST (offline)")
+    print("=" * 70)
+
+    tabs = {SHEETS[key]: [[f"{key}_HEADER"], [f"{key}_row"]] for key in SHEETS_CACHE_EXPORTS.values()}
+    tabs['January 2026'] = [['DATE', 'EVENT'], ['01.01.26', 'New Year Gala']]
+    backend = FakeSheetsBackend({PI_WORK_FLOW_ID: tabs})
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cache_dir = os.path.join(workdir, 'cache')
+
+        def run():
+            cache = SheetsReadCache(backend.sheets_service(), backend.drive_service(), cache_dir)
+            before = dict(backend.calls)
+            written = export_pipeline_inputs(cache, PI_WORK_FLOW_ID, workdir)
+            calls = {name: backend.calls[name] - before[name] for name in before}
+            return cache.stats, calls, sorted(name for name, changed in written.items() if changed)
+
+        checks = []
+
+        stats, calls, written = run()
+        checks.append(("cold run fetches everything in one batchGet",
+                       calls['values.batchGet'] == 1 and stats['hits'] == 0 and len(written) == len(SHEETS_CACHE_EXPORTS) + 1))
+
+        stats, calls, written = run()
+        checks.append(("unchanged spreadsheet: only files.get, nothing rewritten",
+                       calls == {'files.get': 1, 'spreadsheets.get': 0, 'values.batchGet': 0} and not written))
+
+        backend.edit(PI_WORK_FLOW_ID, SHEETS['VENUES'], [['VENUE_ID'], ['o2-arena-london']])
+        stats, calls, written = run()
+        checks.append(("edit: one batchGet, only the edited sheet's file rewritten",
+                       calls['values.batchGet'] == 1 and written == ['venues-data.json']))
+
+        with open(os.path.join(workdir, 'venues-data.json')) as f:
+            checks.append(("edited values exported", json.load(f) == [['VENUE_ID'], ['o2-arena-london']]))
+
+        staged = [os.path.join(workdir, name) for name in ('staged-events-existing.json', 'staged-events-data.json')]
+        with open(staged[0]) as existing, open(staged[1]) as data:
+            checks.append(("STAGED_EVENTS exported for Job 2 and Jobs 3-5",
+                           json.load(existing) == json.load(data) == tabs[SHEETS['STAGED_EVENTS']]))
+
+        cache = SheetsReadCache(backend.sheets_service(), None, cache_dir)
+        cache.read_range(PI_WORK_FLOW_ID, sheet_range(SHEETS['VENUES']))
+        checks.append(("no Drive service: always fetches", cache.stats['misses'] == 1 and cache.stats['hits'] == 0))
+
+    for label, passed in checks:
+        print(f"   {'✅' if passed else '❌'} {label}")
+    if not all(passed for _, passed in checks):
+        sys.exit(1)
+
+
+@pytest.fixture
+def backend():
+    tabs = {SHEETS[key]: [[f"{key}_HEADER"], [f"{key}_row"]] for key in SHEETS_CACHE_EXPORTS.values()}
+    tabs['January 2026'] = [['DATE', 'EVENT'], ['01.01.26', 'New Year Gala']]
+    return FakeSheetsBackend({PI_WORK_FLOW_ID: tabs})
+
+
+@pytest.fixture
+def export(backend, tmp_path):
+    """Run one export; returns (cache stats, API calls made, files rewritten)"""
+    def run():
+        cache = SheetsReadCache(backend.sheets_service(), backend.drive_service(), str(tmp_path / 'cache'))
+        before = dict(backend.calls)
+        written = export_pipeline_inputs(cache, PI_WORK_FLOW_ID, str(tmp_path))
+        calls = {name: backend.calls[name] - before[name] for name in before}
+        return cache.stats, calls, sorted(name for name, changed in written.items() if changed)
+    return run
+
+
+def test_cold_run_fetches_everything_in_one_batch_get(export):
+    stats, calls, written = export()
+    assert calls['values.batchGet'] == 1 and stats['hits'] == 0
+    assert len(written) == len(SHEETS_CACHE_EXPORTS) + 1
+
+
+def test_unchanged_spreadsheet_costs_one_files_get(export):
+    export()
+    stats, calls, written = export()
+    assert calls == {'files.get': 1, 'spreadsheets.get': 0, 'values.batchGet': 0}
+    assert written == []
+
+
+def test_edit_rewrites_only_the_edited_sheet(backend, export, tmp_path):
+    export()
+    backend.edit(PI_WORK_FLOW_ID, SHEETS['VENUES'], [['VENUE_ID'], ['o2-arena-london']])
+    stats, calls, written = export()
+
+    assert calls['values.batchGet'] == 1 and written == ['venues-data.json']
+    assert json.loads((tmp_path / 'venues-data.json').read_text()) == [['VENUE_ID'], ['o2-arena-london']]
+
+
+def test_staged_events_exported_for_every_job(backend, export, tmp_path):
+    export()
+    existing = json.loads((tmp_path / 'staged-events-existing.json').read_text())  # Job 2
+    data = json.loads((tmp_path / 'staged-events-data.json').read_text())          # Jobs 3-5
+    assert existing == data == backend.spreadsheets[PI_WORK_FLOW_ID][SHEETS['STAGED_EVENTS']]
+
+
+def test_without_drive_every_read_fetches(backend, export, tmp_path):
+    export()
+    cache = SheetsReadCache(backend.sheets_service(), None, str(tmp_path / 'cache'))
+    cache.read_range(PI_WORK_FLOW_ID, sheet_range(SHEETS['VENUES']))
+    assert cache.stats['misses'] == 1 and cache.stats['hits'] == 0
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Venue Scraper Plugins
+Common interface for venue listing scrapers, plus a runner that scrapes every
+venue concurrently over one shared BrowserPool / HTTP session
+
+A plugin subclasses VenueScraper and implements:
+- fetch_listing_html()             Load the venue's full event listing
+- extract_events_from_html()       Turn the listing into event dicts
+- extract_date_from_detail_page()  Optional: date from an event's own page,
+                                   for cards listed without one
+
+Page leasing, per-host politeness, the concurrent detail-page fallback and
+the unified output schema (EVENT_FIELDS) come from the base class and
+run_venue_scrapers(). Plugins are registered in VENUE_SCRAPER_PLUGINS; the
+O2 scraper (o2-scraper-enhanced.py) is the first.
+
+Politeness:
+- At most HOST_CONCURRENCY requests in flight per host, across all plugins
+- Request starts to one host are at least HOST_MIN_INTERVAL_SECONDS apart
+
+Venues on different hosts never wait on each other, so adding a venue adds
+its own scrape time to the window only when the pool is saturated.
+
+Lean profile (default; lean=False restores full page loads):
+- Requests for LEAN_BLOCKED_RESOURCE_TYPES (images, media, fonts, ...) and
+  for hosts outside FIRST_PARTY_HOSTS (analytics, ads, tag managers) are
+  aborted through Playwright routing
+- Pages are loaded to DOMContentLoaded and then wait for READY_SELECTOR /
+  DETAIL_READY_SELECTOR instead of network idle
+- Every leased page reports requests, blocked requests, bytes transferred
+  and seconds as a 'page_metrics' progress event and in the run summary
+
+Usage:
+    python3 venue_scrapers.py              Scrape all venues → venue-events-all.json
+    python3 venue_scrapers.py o2           Scrape selected plugins by SCRAPER_ID
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Check if playwright is available
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+# Check if aiohttp is available (plugins that don't need a browser)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from o2_progress import noop_progress
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (script file, class name) - scraper scripts have hyphenated names, so they
+# are loaded by path rather than imported
+VENUE_SCRAPER_PLUGINS = [
+    ('o2-scraper-enhanced.py', 'O2EnhancedScraper'),
+]
+
+# Unified output schema: every scraped event has exactly these keys
+EVENT_FIELDS = (
+    'scraper', 'event_name', 'artist_name', 'venue_name', 'city', 'country',
+    'event_date', 'event_time', 'event_url', 'image_url', 'access_status',
+    'category', 'source', 'notes', 'added_date', 'change_status'
+)
+
+# Politeness limits, shared by every plugin in a run
+HOST_CONCURRENCY = 2
+HOST_MIN_INTERVAL_SECONDS = 0.5
+
+# Lean profile: resource types no scraper reads
+LEAN_BLOCKED_RESOURCE_TYPES = frozenset({
+    'image', 'media', 'font', 'texttrack', 'manifest', 'eventsource', 'websocket'
+})
+SELECTOR_TIMEOUT_MS = 15000
+
+HTTP_TIMEOUT_SECONDS = 30
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+OUTPUT_FILE = "venue-events-all.json"
+
+
+class HostLimiter:
+    """Per-host concurrency cap plus a minimum gap between request starts"""
+
+    def __init__(self, concurrency: int = HOST_CONCURRENCY, min_interval: float = HOST_MIN_INTERVAL_SECONDS):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """
+        Hold a request slot for url's host (must be used on one event loop)
+
+        Example:
+            async with limiter.slot(url):
+                await page.goto(url)
+        """
+        host = urlsplit(url).netloc.lower()
+        slots = self._slots.setdefault(host, asyncio.Semaphore(self.concurrency))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+
+        async with slots:
+            async with lock:
+                wait = self._next_start.get(host, 0) - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start[host] = time.monotonic() + self.min_interval
+            yield
+
+
+class PageMetrics:
+    """Requests, bytes and time for one leased page"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.url = ''
+        self.requests = 0
+        self.blocked = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    async def record(self, request):
+        """Add a finished request's transferred size (headers + body)"""
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.requests += 1
+        self.bytes += max(0, sizes.get('responseBodySize', 0)) + max(0, sizes.get('responseHeadersSize', 0))
+
+    def as_dict(self) -> Dict:
+        return {
+            'url': self.url,
+            'requests': self.requests,
+            'blocked': self.blocked,
+            'bytes': self.bytes,
+            'seconds': round(self.seconds, 2)
+        }
+
+
+class VenueScraper:
+    """
+    Base class for venue scraper plugins
+
+    Subclasses set SCRAPER_ID / VENUE_NAME / LISTING_URL and implement
+    fetch_listing_html() and extract_events_from_html().
+    """
+
+    SCRAPER_ID = ''    # Short id used in output and on the command line
+    VENUE_NAME = ''    # Display name for logs
+    LISTING_URL = ''   # Events listing page
+    # Lean profile: hosts (and their subdomains) allowed to load; () = LISTING_URL's domain
+    FIRST_PARTY_HOSTS = ()
+    READY_SELECTOR = ''         # Present once the listing has rendered its events
+    DETAIL_READY_SELECTOR = ''  # Present once a detail page carries its date
+
+    def __init__(self, progress=None, browser_pool=None, host_limiter=None, http_session=None, lean=True):
+        # progress(phase, **data) hook - see o2_progress.py
+        self.progress = progress or noop_progress
+        # Optional warm BrowserPool (o2_browser_pool.py); coroutines must then
+        # run on the pool's loop, e.g. pool.run(scraper.scrape_all_events())
+        self.browser_pool = browser_pool
+        # Shared across plugins by run_venue_scrapers so limits are per host, not per plugin
+        self.host_limiter = host_limiter or HostLimiter()
+        # Optional shared aiohttp session for fetch_text()
+        self.http_session = http_session
+        self.lean = lean
+        hosts = self.FIRST_PARTY_HOSTS or (urlsplit(self.LISTING_URL).hostname or '',)
+        self.first_party_hosts = tuple(h[4:] if h.startswith('www.') else h for h in hosts)
+        self.page_metrics: List[Dict] = []
+
+    def is_first_party(self, url: str) -> bool:
+        """True if url's host is (a subdomain of) one of the first-party hosts"""
+        host = (urlsplit(url).hostname or '').lower()
+        return any(host == h or host.endswith('.' + h) for h in self.first_party_hosts)
+
+    async def _route_lean(self, route, metrics: PageMetrics):
+        """Abort heavy resource types and third-party requests (navigations always pass)"""
+        request = route.request
+        if request.resource_type != 'document' and (
+                request.resource_type in LEAN_BLOCKED_RESOURCE_TYPES or not self.is_first_party(request.url)):
+            metrics.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @asynccontextmanager
+    async def _leased_page(self):
+        """Lease a page from the warm pool, or cold-launch Chromium when standalone"""
+        if self.browser_pool is not None:
+            async with self.browser_pool.page() as page:
+                yield page
+            return
+
+        async with async_playwright() as p:
+            args = ['--blink-settings=imagesEnabled=false'] if self.lean else []
+            browser = await p.chromium.launch(headless=True, args=args)
+            try:
+                yield await browser.new_page()
+            finally:
+                await browser.close()
+
+    @asynccontextmanager
+    async def open_page(self):
+        """Lease a page (lean routing when enabled) and record its PageMetrics"""
+        metrics = PageMetrics()
+        pending = []
+
+        async with self._leased_page() as page:
+            if self.lean:
+                await page.route('**/*', lambda route: self._route_lean(route, metrics))
+            page.on('requestfinished', lambda request: pending.append(asyncio.ensure_future(metrics.record(request))))
+            try:
+                yield page
+            finally:
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+                metrics.url = page.url
+                metrics.seconds = time.perf_counter() - metrics.started
+                self.page_metrics.append(metrics.as_dict())
+                self.progress('page_metrics', **metrics.as_dict())
+
+    async def goto(self, page, url: str, ready_selector: str = '', timeout: int = 30000):
+        """
+        Navigate: lean → DOMContentLoaded then wait for ready_selector (attached);
+        full → network idle
+        """
+        if not self.lean:
+            await page.goto(url, wait_until="networkidle", timeout=timeout)
+            return
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        if ready_selector:
+            try:
+                await page.wait_for_selector(ready_selector, state='attached', timeout=SELECTOR_TIMEOUT_MS)
+            except Exception as e:
+                print(f"⚠️  {ready_selector!r} not found on {url}: {e}")
+
+    def metrics_summary(self) -> Dict:
+        """Totals over every page this scraper leased"""
+        return {
+            'pages': len(self.page_metrics),
+            'requests': sum(m['requests'] for m in self.page_metrics),
+            'blocked': sum(m['blocked'] for m in self.page_metrics),
+            'bytes': sum(m['bytes'] for m in self.page_metrics),
+            'page_seconds': round(sum(m['seconds'] for m in self.page_metrics), 1)
+        }
+
+    def polite(self, url: str):
+        """Async context manager holding this host's politeness slot"""
+        return self.host_limiter.slot(url)
+
+    async def fetch_text(self, url: str) -> str:
+        """GET url over the shared HTTP session (for listings that need no browser)"""
+        if self.http_session is None:
+            raise RuntimeError("No HTTP session (run via run_venue_scrapers with aiohttp installed)")
+        async with self.polite(url):
+            async with self.http_session.get(url) as response:
+                response.raise_for_status()
+                return await response.text()
+
+    # --- Plugin interface -------------------------------------------------
+
+    async def fetch_listing_html(self) -> str:
+        """Full listing HTML with every event loaded"""
+        raise NotImplementedError
+
+    def extract_events_from_html(self, html: str) -> List[Dict]:
+        """Event dicts (EVENT_FIELDS keys) from the listing HTML"""
+        raise NotImplementedError
+
+    def extract_date_from_detail_page(self, html: str) -> Optional[str]:
+        """YYYY-MM-DD from an event's detail page (None disables the fallback)"""
+        return None
+
+    def finish_scrape(self, events: List[Dict]):
+        """Hook run after detail-page filling, e.g. to persist caches"""
+        return None
+
+    # --- Shared behaviour ---------------------------------------------------
+
+    async def fetch_event_detail_page(self, event_url: str) -> str:
+        """Fetch individual event detail page"""
+        try:
+            async with self.polite(event_url), self.open_page() as page:
+                await self.goto(page, event_url, self.DETAIL_READY_SELECTOR)
+                if not self.lean:
+                    await page.wait_for_timeout(1000)
+                return await page.content()
+        except Exception as e:
+            print(f"⚠️  Failed to fetch {event_url}: {e}")
+            return ""
+
+    async def fill_missing_dates(self, events: List[Dict]) -> tuple:
+        """
+        Fetch individual event pages for events missing dates, concurrently
+        within the host's politeness limits
+        Returns: (events_with_dates, events_without_dates, filled_count)
+        """
+        events_without_dates = [e for e in events if not e['event_date']]
+
+        if not events_without_dates:
+            self.progress('detail_pages_filled', filled=0, still_missing=0)
+            return events, [], 0
+
+        print(f"\n🔍 Fetching detail pages for {len(events_without_dates)} event(s) with missing dates...")
+        self.progress('detail_pages_started', pending=len(events_without_dates))
+
+        done = 0
+
+        async def fill_one(event):
+            nonlocal done
+            html = await self.fetch_event_detail_page(event['event_url'])
+            date = self.extract_date_from_detail_page(html)
+            if date:
+                event['event_date'] = date
+                print(f"   ✅ {event['event_name'][:50]}: {date}")
+            else:
+                print(f"   ❌ {event['event_name'][:50]}: no date found")
+
+            done += 1
+            self.progress(
+                'detail_page',
+                index=done,
+                pending=len(events_without_dates),
+                event_name=event['event_name'],
+                found=bool(date)
+            )
+            return bool(date)
+
+        found = await asyncio.gather(*[fill_one(e) for e in events_without_dates])
+        filled_count = sum(found)
+        still_missing = [e for e, ok in zip(events_without_dates, found) if not ok]
+
+        print(f"\n✅ Fallback complete: {filled_count} date(s) found, {len(still_missing)} still missing")
+        self.progress('detail_pages_filled', filled=filled_count, still_missing=len(still_missing))
+
+        return events, still_missing, filled_count
+
+    async def scrape_all_events(self) -> tuple:
+        """
+        Listing → cards → detail-page fallback
+        Returns: (events, events_without_dates, fallback_count)
+        """
+        html = await self.fetch_listing_html()
+        events = self.extract_events_from_html(html)
+
+        events, events_without_dates, fallback_count = await self.fill_missing_dates(events)
+        self.finish_scrape(events)
+
+        return events, events_without_dates, fallback_count
+
+    def to_unified(self, event: Dict) -> Dict:
+        """Event in the unified schema (missing keys → '', extra keys dropped)"""
+        unified = {field: event.get(field) or '' for field in EVENT_FIELDS}
+        unified['scraper'] = self.SCRAPER_ID
+        return unified
+
+
+def load_plugin_classes(selected: Optional[List[str]] = None) -> List[type]:
+    """
+    Load the VenueScraper subclasses listed in VENUE_SCRAPER_PLUGINS
+
+    Args:
+        selected: SCRAPER_IDs to keep (None = all)
+    """
+    classes = []
+    for filename, class_name in VENUE_SCRAPER_PLUGINS:
+        path = os.path.join(SCRIPT_DIR, filename)
+        module_name = os.path.splitext(filename)[0].replace('-', '_')
+        module = sys.modules.get(module_name)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+        cls = getattr(module, class_name)
+        if selected is None or cls.SCRAPER_ID in selected:
+            classes.append(cls)
+    return classes
+
+
+async def run_venue_scrapers(plugin_classes: List[type], browser_pool=None, progress=noop_progress,
+                             **plugin_kwargs) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    Run every plugin concurrently with one shared HostLimiter and HTTP session
+
+    Args:
+        plugin_classes: VenueScraper subclasses (from load_plugin_classes)
+        browser_pool: Optional BrowserPool; call via browser_pool.run(...)
+        progress: progress(phase, **data) hook; each event carries scraper=SCRAPER_ID
+        plugin_kwargs: Extra constructor kwargs, keyed by SCRAPER_ID
+
+    Returns:
+        Tuple of (unified events of all venues, {SCRAPER_ID: summary}).
+        A failing plugin is reported in its summary and doesn't stop the others.
+    """
+    host_limiter = HostLimiter()
+    session = None
+    if AIOHTTP_AVAILABLE:
+        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+                                        headers={'User-Agent': USER_AGENT})
+
+    async def run_one(cls):
+        scraper_id = cls.SCRAPER_ID
+
+        def venue_progress(phase, **data):
+            progress(phase, scraper=scraper_id, **data)
+
+        scraper = cls(progress=venue_progress, browser_pool=browser_pool, host_limiter=host_limiter,
+                      http_session=session, **plugin_kwargs.get(scraper_id, {}))
+        start = time.perf_counter()
+        try:
+            events, events_without_dates, fallback_count = await scraper.scrape_all_events()
+        except Exception as e:
+            print(f"❌ {cls.VENUE_NAME or scraper_id}: scrape failed: {e}")
+            return [], {'events': 0, 'error': str(e), 'seconds': round(time.perf_counter() - start, 1)}
+
+        summary = {
+            'events': len(events),
+            'without_dates': len(events_without_dates),
+            'fallback_dates': fallback_count,
+            'seconds': round(time.perf_counter() - start, 1),
+            **scraper.metrics_summary()
+        }
+        return [scraper.to_unified(e) for e in events], summary
+
+    try:
+        results = await asyncio.gather(*[run_one(cls) for cls in plugin_classes])
+    finally:
+        if session is not None:
+            await session.close()
+
+    all_events = [event for events, _ in results for event in events]
+    summaries = {cls.SCRAPER_ID: summary for cls, (_, summary) in zip(plugin_classes, results)}
+    return all_events, summaries
+
+
+def main():
+    """Scrape all (or the selected) venues and save unified events"""
+    print("=" * 70)
+    print("🏟️  VENUE SCRAPERS")
+    print("=" * 70)
+
+    if not PLAYWRIGHT_AVAILABLE:
+        print("\n❌ ERROR: Playwright is not installed")
+        print("  pip install playwright && playwright install chromium")
+        sys.exit(1)
+
+    from o2_browser_pool import BrowserPool, MAX_BROWSERS
+
+    plugin_classes = load_plugin_classes(sys.argv[1:] or None)
+    if not plugin_classes:
+        print(f"❌ No plugins match {sys.argv[1:]}")
+        sys.exit(1)
+
+    print(f"🔌 Plugins: {', '.join(cls.SCRAPER_ID for cls in plugin_classes)}")
+
+    # One lease slot per browser: size the pool so every venue gets a page at once
+    pool = BrowserPool(max_browsers=max(MAX_BROWSERS, len(plugin_classes)))
+    start = time.perf_counter()
+    try:
+        events, summaries = pool.run(run_venue_scrapers(plugin_classes, browser_pool=pool))
+    finally:
+        pool.close()
+
+    print("\n" + "=" * 70)
+    print(f"📊 SCRAPING COMPLETE ({time.perf_counter() - start:.1f}s wall clock)")
+    print("=" * 70)
+    for scraper_id, summary in summaries.items():
+        if summary.get('error'):
+            print(f"   ❌ {scraper_id}: {summary['error']}")
+        else:
+            print(f"   ✅ {scraper_id}: {summary['events']} events "
+                  f"({summary['without_dates']} without dates) in {summary['seconds']}s, "
+                  f"{summary['pages']} pages, {summary['bytes'] / 1024:.0f} KB, "
+                  f"{summary['blocked']} requests blocked")
+
+    with open(OUTPUT_FILE, 'w') as f:
+        json.dump({'venues': summaries, 'events': events}, f, indent=2)
+    print(f"\n💾 {len(events)} events saved to {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()